@@ -0,0 +1,273 @@
+# expense_tracker/api/v1/endpoints/admin.py
+import asyncio
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import FileResponse
+
+from expense_tracker.core.auth import require_admin
+from expense_tracker.core.cache import cache_registry
+from expense_tracker.core.exceptions import (
+    MemorySnapshotNotFoundError,
+    MemoryTracingNotStartedError,
+    ProfileNotFoundError,
+)
+from expense_tracker.core.loop_monitor import loop_monitor
+from expense_tracker.core.memory import GroupBy, memory_monitor
+from expense_tracker.core.profiling import profiler
+from expense_tracker.core.singleflight import flight_registry
+from expense_tracker.core.tracing import MemoryExporter, trace_exporter
+from expense_tracker.schemas.cache import CacheStats, SingleFlightStats
+from expense_tracker.schemas.diagnostics import (
+    AllocationDiff,
+    AllocationSite,
+    LoopStats,
+    MemorySnapshotInfo,
+    MemoryStats,
+    MemoryTracingRequest,
+)
+from expense_tracker.schemas.profiling import ProfileInfo, ProfileRule
+from expense_tracker.schemas.tracing import TraceRecord
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get(
+    "/caches",
+    response_model=List[CacheStats],
+    description="Hit rates and sizes of this worker's caches"
+)
+async def get_cache_stats() -> List[CacheStats]:
+    """
+    Counters of the process-local reference caches. Each worker process has
+    its own caches, so repeated calls may be answered by different workers.
+    """
+    return [cache.stats() for cache in cache_registry.values()]
+
+
+@router.get(
+    "/single-flight",
+    response_model=List[SingleFlightStats],
+    description="How many of this worker's reads were coalesced"
+)
+async def get_single_flight_stats() -> List[SingleFlightStats]:
+    """
+    Counters of the single-flight groups, per worker process. coalesced
+    counts calls that shared another call's query instead of running one.
+    """
+    return [flight.stats() for flight in flight_registry.values()]
+
+
+@router.get(
+    "/loop",
+    response_model=LoopStats,
+    description="Event loop lag of this worker and the code that blocked it"
+)
+async def get_loop_stats() -> LoopStats:
+    """
+    Lag is how late the loop ran a timer, so it bounds the extra latency
+    every request on this worker saw. Detections hold the stack of the
+    code that held the loop past LOOP_BLOCKED_THRESHOLD_SECONDS, e.g. a
+    synchronous call that should run in a thread.
+    """
+    return loop_monitor.stats()
+
+
+@router.get(
+    "/memory",
+    response_model=MemoryStats,
+    description="Memory usage of this worker"
+)
+async def get_memory_stats() -> MemoryStats:
+    """
+    RSS and live ORM instances per model, now and every
+    MEMORY_SAMPLE_SECONDS, and how many objects database sessions still
+    held when closed. A worker whose RSS keeps growing while its ORM counts
+    stay flat leaks something else; start tracing and diff two snapshots.
+    """
+    return memory_monitor.stats()
+
+
+@router.put(
+    "/memory/tracing",
+    response_model=MemoryStats,
+    description="Start tracing memory allocations"
+)
+async def start_memory_tracing(request: MemoryTracingRequest) -> MemoryStats:
+    """
+    Only memory allocated from now on is traced. Tracing slows down
+    allocations and uses memory per traced block, more so with more
+    frames, so stop it once the snapshots are taken.
+    """
+    memory_monitor.start_tracing(request.frames)
+    return memory_monitor.stats()
+
+
+@router.delete(
+    "/memory/tracing",
+    response_model=MemoryStats,
+    description="Stop tracing memory allocations"
+)
+async def stop_memory_tracing() -> MemoryStats:
+    memory_monitor.stop_tracing()
+    return memory_monitor.stats()
+
+
+@router.post(
+    "/memory/snapshots",
+    response_model=MemorySnapshotInfo,
+    status_code=status.HTTP_201_CREATED,
+    description="Snapshot the traced memory allocations"
+)
+async def take_memory_snapshot() -> MemorySnapshotInfo:
+    """
+    Only the newest MEMORY_MAX_SNAPSHOTS snapshots are kept. Taking one
+    walks every traced allocation, which can take a while on a large heap.
+    """
+    info = await asyncio.to_thread(memory_monitor.take_snapshot)
+    if info is None:
+        raise MemoryTracingNotStartedError("Start memory tracing before taking snapshots")
+    return info
+
+
+@router.delete(
+    "/memory/snapshots/{snapshot_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="Delete a memory snapshot"
+)
+async def delete_memory_snapshot(snapshot_id: int) -> None:
+    if not memory_monitor.delete_snapshot(snapshot_id):
+        raise MemorySnapshotNotFoundError(f"Memory snapshot {snapshot_id} not found")
+
+
+@router.get(
+    "/memory/snapshots/{snapshot_id}/top",
+    response_model=List[AllocationSite],
+    description="Where the memory of a snapshot was allocated"
+)
+async def get_memory_top(
+    snapshot_id: int,
+    group_by: GroupBy = Query("lineno"),
+    limit: int = Query(20, ge=1, le=500)
+) -> List[AllocationSite]:
+    """
+    Allocation sites holding the most memory, largest first. group_by
+    traceback needs tracing started with more than one frame to tell
+    callers apart.
+    """
+    if not memory_monitor.has_snapshot(snapshot_id):
+        raise MemorySnapshotNotFoundError(f"Memory snapshot {snapshot_id} not found")
+    return await asyncio.to_thread(memory_monitor.top, snapshot_id, group_by, limit)
+
+
+@router.get(
+    "/memory/snapshots/{snapshot_id}/diff/{base_id}",
+    response_model=List[AllocationDiff],
+    description="How allocations changed between two memory snapshots"
+)
+async def get_memory_diff(
+    snapshot_id: int,
+    base_id: int,
+    group_by: GroupBy = Query("lineno"),
+    limit: int = Query(20, ge=1, le=500)
+) -> List[AllocationDiff]:
+    """
+    Allocation sites of snapshot_id compared to base_id, largest change
+    first. Sites that keep growing across snapshots taken minutes apart
+    are where a leak is retained.
+    """
+    for checked_id in (snapshot_id, base_id):
+        if not memory_monitor.has_snapshot(checked_id):
+            raise MemorySnapshotNotFoundError(f"Memory snapshot {checked_id} not found")
+    return await asyncio.to_thread(memory_monitor.diff, snapshot_id, base_id, group_by, limit)
+
+
+@router.get(
+    "/traces",
+    response_model=List[TraceRecord],
+    description="The most recent request traces of this worker"
+)
+async def get_traces(limit: int = Query(20, ge=1, le=200)) -> List[TraceRecord]:
+    """
+    Spans of recently traced requests, newest first. Requires
+    TRACING_ENABLED; empty when traces are exported to a file instead.
+    """
+    if not isinstance(trace_exporter, MemoryExporter):
+        return []
+    return [TraceRecord.model_validate(trace) for trace in trace_exporter.recent(limit)]
+
+
+@router.get(
+    "/profiles",
+    response_model=List[ProfileInfo],
+    description="Request profiles stored by this worker"
+)
+async def list_profiles() -> List[ProfileInfo]:
+    """
+    Profiles are taken for requests sent with an `X-Profile` header holding
+    the admin token, and for every Nth request of routes with a profile
+    rule. The response of a profiled request names its profile in the
+    `X-Profile-Name` header. Newest first.
+    """
+    return profiler.list_profiles()
+
+
+@router.get(
+    "/profiles/{name}",
+    response_class=FileResponse,
+    description="Download a request profile as collapsed stacks"
+)
+async def get_profile(name: str) -> FileResponse:
+    """
+    One line per distinct stack with its sample count, the input format of
+    flamegraph.pl and speedscope. Samples ending in [awaiting] were taken
+    while the request waited, e.g. on the database.
+    """
+    path = profiler.profile_path(name)
+    if path is None:
+        raise ProfileNotFoundError(f"Profile {name} not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
+
+
+@router.delete(
+    "/profiles/{name}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="Delete a request profile"
+)
+async def delete_profile(name: str) -> None:
+    if not profiler.delete_profile(name):
+        raise ProfileNotFoundError(f"Profile {name} not found")
+
+
+@router.get(
+    "/profile-rules",
+    response_model=List[ProfileRule],
+    description="Routes of which every Nth request is profiled"
+)
+async def list_profile_rules() -> List[ProfileRule]:
+    return profiler.list_rules()
+
+
+@router.put(
+    "/profile-rules",
+    response_model=List[ProfileRule],
+    description="Profile every Nth request of a route"
+)
+async def set_profile_rule(rule: ProfileRule) -> List[ProfileRule]:
+    """
+    Route is the template as shown in /metrics, e.g. /api/v1/users/{user_id}.
+    Rules only apply to the worker handling this request and are lost on
+    restart.
+    """
+    profiler.rules[(rule.method, rule.route)] = rule.every
+    return profiler.list_rules()
+
+
+@router.delete(
+    "/profile-rules",
+    response_model=List[ProfileRule],
+    description="Stop profiling a route"
+)
+async def delete_profile_rule(method: str, route: str) -> List[ProfileRule]:
+    profiler.rules.pop((method, route), None)
+    return profiler.list_rules()
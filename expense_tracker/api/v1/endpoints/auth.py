@@ -0,0 +1,83 @@
+# expense_tracker/api/v1/endpoints/auth.py
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.auth import get_current_user, get_token_payload
+from expense_tracker.core.exceptions import InvalidCredentialsError
+from expense_tracker.db.session import get_session
+from expense_tracker.schemas.token import RefreshTokenRequest, Token, TokenPayload
+from expense_tracker.schemas.user import AuthenticatedUser
+from expense_tracker.services.token import TokenService
+from expense_tracker.services.user import UserService
+
+router = APIRouter()
+
+# Token responses must not be stored by caches or the idempotency store
+NO_STORE = {"Cache-Control": "no-store", "Pragma": "no-cache"}
+
+
+@router.post(
+    "/login",
+    response_model=Token,
+    description="Log in with email and password"
+)
+async def login(
+    form: Annotated[OAuth2PasswordRequestForm, Depends()],
+    response: Response,
+    db: AsyncSession = Depends(get_session)
+) -> Token:
+    """
+    OAuth2 password flow with the email as username. Returns an access
+    token and the first refresh token of a new family; refresh it at
+    /auth/refresh.
+    """
+    user_service = UserService(db)
+    user = await user_service.authenticate(form.username, form.password)
+    if user is None:
+        raise InvalidCredentialsError("Incorrect email or password")
+    response.headers.update(NO_STORE)
+    token_service = TokenService(db)
+    return await token_service.issue_tokens(user)
+
+
+@router.post(
+    "/refresh",
+    response_model=Token,
+    description="Exchange a refresh token for a new token pair"
+)
+async def refresh_token(
+    request: RefreshTokenRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_session)
+) -> Token:
+    """
+    Rotate a refresh token. The presented token can not be used again;
+    reusing it revokes every token issued from the same login.
+    """
+    response.headers.update(NO_STORE)
+    token_service = TokenService(db)
+    return await token_service.rotate_refresh_token(request.refresh_token)
+
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="Revoke the current access token"
+)
+async def logout(
+    token_data: Annotated[TokenPayload, Depends(get_token_payload)],
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    request: Optional[RefreshTokenRequest] = None,
+    db: AsyncSession = Depends(get_session)
+) -> None:
+    """
+    Revoke the access token used for this request and, if given, the
+    refresh token family it was issued with
+    """
+    token_service = TokenService(db)
+    await token_service.revoke_access_token(token_data)
+    if request is not None:
+        await token_service.revoke_refresh_family(request.refresh_token, current_user.id)
@@ -0,0 +1,94 @@
+# expense_tracker/api/v1/endpoints/balances.py
+import uuid
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.auth import get_current_active_user, require_admin
+from expense_tracker.db.session import get_session
+from expense_tracker.schemas.balance import (
+    BalanceResponse,
+    ReconciliationReport,
+    SettlementPlan,
+    SettlementRequest,
+)
+from expense_tracker.schemas.user import AuthenticatedUser
+from expense_tracker.services.ledger import LedgerService
+from expense_tracker.services.settlement import SettlementService
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    response_model=List[BalanceResponse],
+    description="List your net balances with other users"
+)
+async def list_balances(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> List[BalanceResponse]:
+    """
+    Net balances with every user you share expenses with. A positive amount
+    means the other user owes you.
+    """
+    ledger_service = LedgerService(db)
+    return await ledger_service.get_balances(current_user.id)
+
+
+@router.post(
+    "/settlement-plan",
+    response_model=SettlementPlan,
+    description="Plan the fewest transfers that settle a group of users"
+)
+async def plan_settlement(
+    request: SettlementRequest,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> SettlementPlan:
+    """
+    Compute transfers that clear your balances with the given users,
+    replacing pairwise settlement with at most one transfer per member.
+    You must be one of the users, and the others must have a balance with
+    you or share a group with you. Balances between the others are not
+    part of the plan.
+    """
+    settlement_service = SettlementService(db)
+    await settlement_service.check_counterparties(current_user.id, request.user_ids)
+    return await settlement_service.plan_for_users(current_user.id, request.user_ids)
+
+
+@router.post(
+    "/reconcile",
+    response_model=ReconciliationReport,
+    dependencies=[Depends(require_admin)],
+    description="Rebuild balances from shared expenses and report drift"
+)
+async def reconcile_balances(
+    fix: bool = False,
+    db: AsyncSession = Depends(get_session)
+) -> ReconciliationReport:
+    """
+    Compare the ledger with balances rebuilt from accepted shared expenses.
+    With fix=true drifted pairs are overwritten with the rebuilt values.
+    """
+    ledger_service = LedgerService(db)
+    return await ledger_service.reconcile(fix=fix)
+
+
+@router.get(
+    "/{other_user_id}",
+    response_model=BalanceResponse,
+    description="Get your net balance with another user"
+)
+async def get_balance(
+    other_user_id: uuid.UUID,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> BalanceResponse:
+    """
+    Net balance with one user. A positive amount means they owe you.
+    """
+    ledger_service = LedgerService(db)
+    return await ledger_service.get_balance(current_user.id, other_user_id)
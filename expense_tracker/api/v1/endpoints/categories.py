@@ -0,0 +1,102 @@
+# expense_tracker/api/v1/endpoints/categories.py
+import uuid
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.auth import get_current_active_user
+from expense_tracker.db.session import get_session
+from expense_tracker.schemas.category import CategoryCreate, CategoryResponse, CategoryUpdate
+from expense_tracker.schemas.user import AuthenticatedUser
+from expense_tracker.services.category import CategoryService
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    response_model=List[CategoryResponse],
+    description="List the system categories and your own"
+)
+async def list_categories(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> List[CategoryResponse]:
+    """
+    System categories (user_id is null) and your custom categories, by name.
+    """
+    service = CategoryService(db)
+    return await service.list_categories(current_user.id)
+
+
+@router.post(
+    "",
+    response_model=CategoryResponse,
+    status_code=status.HTTP_201_CREATED,
+    description="Create a custom category"
+)
+async def create_category(
+    category_data: CategoryCreate,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> CategoryResponse:
+    """
+    Create a category only you can see. Its name must differ from the
+    system categories and your other categories.
+    """
+    service = CategoryService(db)
+    return await service.create_category(current_user.id, category_data)
+
+
+@router.get(
+    "/{category_id}",
+    response_model=CategoryResponse,
+    description="Get a category"
+)
+async def get_category(
+    category_id: uuid.UUID,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> CategoryResponse:
+    """
+    A system category or one of your own.
+    """
+    service = CategoryService(db)
+    return await service.get_visible_category(current_user.id, category_id)
+
+
+@router.patch(
+    "/{category_id}",
+    response_model=CategoryResponse,
+    description="Rename a custom category"
+)
+async def update_category(
+    category_id: uuid.UUID,
+    category_data: CategoryUpdate,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> CategoryResponse:
+    """
+    Rename one of your categories. System categories can not be changed.
+    """
+    service = CategoryService(db)
+    return await service.update_category(current_user.id, category_id, category_data)
+
+
+@router.delete(
+    "/{category_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="Delete a custom category"
+)
+async def delete_category(
+    category_id: uuid.UUID,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> None:
+    """
+    Delete one of your categories. Categories with expenses can not be
+    deleted; synced clients see the deletion as a tombstone.
+    """
+    service = CategoryService(db)
+    await service.delete_category(current_user.id, category_id)
@@ -0,0 +1,61 @@
+# expense_tracker/api/v1/endpoints/events.py
+import asyncio
+from typing import Annotated, AsyncGenerator
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.auth import get_current_active_user
+from expense_tracker.core.events import EventClient, event_broker, format_event
+from expense_tracker.core.settings import settings
+from expense_tracker.db.session import get_session
+from expense_tracker.schemas.user import AuthenticatedUser
+
+router = APIRouter()
+
+# Tell EventSource clients how long to wait before reconnecting, in ms
+RECONNECT_DELAY_MS = 3000
+
+
+async def stream_events(client: EventClient) -> AsyncGenerator[str, None]:
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+        while True:
+            try:
+                message = await client.next(settings.EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                yield format_event("evicted", {})
+                return
+            yield message
+    finally:
+        event_broker.disconnect(client)
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    description="Stream changes to your expenses and shares"
+)
+async def stream(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> StreamingResponse:
+    """
+    Server-sent events for expenses and shared expenses that concern you:
+    - change: {"table", "id"} of a created, updated or deleted row
+    - resync: changes may have been missed, refetch what you display
+    - evicted: you fell too far behind and the stream ends; reconnect and refetch
+    """
+    # The stream can stay open for hours, don't hold a pooled connection meanwhile
+    await db.close()
+    client = event_broker.connect(current_user.id)
+    return StreamingResponse(
+        stream_events(client),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
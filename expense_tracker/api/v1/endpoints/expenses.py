@@ -0,0 +1,177 @@
+# expense_tracker/api/v1/endpoints/expenses.py
+import uuid
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.auth import get_current_active_user
+from expense_tracker.core.etag import etag_matches, make_etag, not_modified
+from expense_tracker.core.fields import parse_fields
+from expense_tracker.db.session import get_session
+from expense_tracker.schemas.expense import (
+    ExpenseBatchRequest,
+    ExpenseBatchResult,
+    ExpenseBulkDelete,
+    ExpenseBulkResult,
+    ExpenseBulkUpdate,
+    ExpensePage,
+    ExpenseResponse,
+)
+from expense_tracker.schemas.queries import ExpenseAnalytics, ExpenseFilter, ExpenseListQuery
+from expense_tracker.schemas.user import AuthenticatedUser
+from expense_tracker.services.expense import ExpenseService
+
+router = APIRouter()
+
+
+@router.post(
+    "/batch",
+    response_model=ExpenseBatchResult,
+    description="Create, update and delete expenses in one transaction"
+)
+async def batch_expenses(
+    batch: ExpenseBatchRequest,
+    response: Response,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> ExpenseBatchResult:
+    """
+    Apply up to 500 operations, each one of:
+    - {"op": "create", "data": {...}} with an optional client generated id
+    - {"op": "update", "id": ..., "data": {...}} with the fields to change
+    - {"op": "delete", "id": ...}
+
+    With atomic (the default) nothing is applied if any operation is
+    invalid and the response is a 422 listing the failures. Without it
+    valid operations are applied and invalid ones are reported per item.
+    Shares of updated or deleted expenses are adjusted in the same
+    transaction.
+    """
+    service = ExpenseService(db)
+    result = await service.apply_batch(current_user.id, batch)
+    if not result.committed:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return result
+
+
+@router.post(
+    "/bulk-update",
+    response_model=ExpenseBulkResult,
+    description="Change all your expenses matching a filter"
+)
+async def bulk_update_expenses(
+    request: ExpenseBulkUpdate,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> ExpenseBulkResult:
+    """
+    Apply the fields set in patch to every expense matching filter, e.g.
+    move last year's expenses of one category to another.
+    - dry_run only counts the matching expenses
+    - the request fails with 422 if more than max_rows (or the server
+      limit) expenses match, and nothing is changed
+    """
+    service = ExpenseService(db)
+    return await service.bulk_update(current_user.id, request)
+
+
+@router.post(
+    "/bulk-delete",
+    response_model=ExpenseBulkResult,
+    description="Delete all your expenses matching a filter"
+)
+async def bulk_delete_expenses(
+    request: ExpenseBulkDelete,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> ExpenseBulkResult:
+    """
+    Delete every expense matching filter together with its shares.
+    - dry_run only counts the matching expenses
+    - the request fails with 422 if more than max_rows (or the server
+      limit) expenses match, and nothing is deleted
+    """
+    service = ExpenseService(db)
+    return await service.bulk_delete(current_user.id, request)
+
+
+@router.get(
+    "",
+    response_model=ExpensePage,
+    description="List your expenses, optionally with only some fields"
+)
+async def list_expenses(
+    query: Annotated[ExpenseListQuery, Query()],
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> ExpensePage:
+    """
+    Expenses matching the filter, newest first. Pass next_cursor from the
+    previous page as cursor to continue.
+
+    fields picks the ExpenseResponse fields to return, comma separated,
+    with category.<field> and user.<field> for parts of the nested
+    objects. Only the columns behind them are read, and category and user
+    are not joined unless a field of theirs is picked.
+    """
+    selection = parse_fields(query.fields, ExpenseResponse)
+    service = ExpenseService(db)
+    return await service.list_expenses(current_user.id, query, selection, query.limit, query.cursor)
+
+
+@router.get(
+    "/analytics",
+    response_model=ExpenseAnalytics,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "No expense or category changed"}},
+    description="Totals of your expenses matching a filter"
+)
+async def get_expense_analytics(
+    expense_filter: Annotated[ExpenseFilter, Query()],
+    response: Response,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    db: AsyncSession = Depends(get_session)
+) -> ExpenseAnalytics:
+    """
+    Total and average amount, totals per category (largest first) and per
+    month. The ETag changes whenever any of your expenses or categories
+    does; with a matching If-None-Match the aggregates are not computed
+    and the response is a 304.
+    """
+    service = ExpenseService(db)
+    version = await service.get_collection_version(current_user.id, include_shares=bool(expense_filter.shared_only))
+    etag = make_etag(current_user.id, *version, expense_filter.model_dump_json())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return await service.get_analytics(current_user.id, expense_filter)
+
+
+@router.get(
+    "/{expense_id}",
+    response_model=ExpenseResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "The expense did not change"}},
+    description="Get one of your expenses"
+)
+async def get_expense(
+    expense_id: uuid.UUID,
+    response: Response,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    db: AsyncSession = Depends(get_session)
+) -> ExpenseResponse:
+    """
+    The expense with its category and user. The ETag covers all three, so
+    a 304 is only sent while none of them changed.
+    """
+    service = ExpenseService(db)
+    if if_none_match is not None:
+        etag = make_etag(expense_id, *await service.get_expense_version(current_user.id, expense_id))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    expense = await service.get_expense(current_user.id, expense_id)
+    response.headers["ETag"] = make_etag(
+        expense_id, expense.updated_at, expense.category.updated_at, expense.user.updated_at
+    )
+    return expense
@@ -0,0 +1,154 @@
+# expense_tracker/api/v1/endpoints/groups.py
+import uuid
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.auth import get_current_active_user
+from expense_tracker.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from expense_tracker.db.session import get_session
+from expense_tracker.schemas.group import (
+    GroupCreate,
+    GroupExpense,
+    GroupExpenseCreate,
+    GroupFeedPage,
+    GroupInDB,
+    GroupMemberAdd,
+    GroupResponse,
+)
+from expense_tracker.schemas.user import AuthenticatedUser
+from expense_tracker.services.group import GroupService
+
+router = APIRouter()
+
+
+@router.post(
+    "",
+    response_model=GroupResponse,
+    status_code=status.HTTP_201_CREATED,
+    description="Create a group"
+)
+async def create_group(
+    group_data: GroupCreate,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> GroupResponse:
+    """
+    Create a group with you and the given users as members. You manage the
+    group's members.
+    """
+    service = GroupService(db)
+    return await service.create_group(current_user.id, group_data)
+
+
+@router.get(
+    "",
+    response_model=List[GroupInDB],
+    description="List your groups"
+)
+async def list_groups(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> List[GroupInDB]:
+    """
+    Groups you are a member of, most recently joined first
+    """
+    service = GroupService(db)
+    return await service.list_groups(current_user.id)
+
+
+@router.get(
+    "/{group_id}",
+    response_model=GroupResponse,
+    description="Get a group with its members and balances"
+)
+async def get_group(
+    group_id: uuid.UUID,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> GroupResponse:
+    """
+    Retrieve a group you are a member of. Member balances are kept up to
+    date with every split change, positive when the group owes the member.
+    """
+    service = GroupService(db)
+    return await service.get_group(current_user.id, group_id)
+
+
+@router.post(
+    "/{group_id}/members",
+    response_model=GroupResponse,
+    status_code=status.HTTP_201_CREATED,
+    description="Add a member to a group"
+)
+async def add_group_member(
+    group_id: uuid.UUID,
+    member_data: GroupMemberAdd,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> GroupResponse:
+    """
+    Add a user to a group you created
+    """
+    service = GroupService(db)
+    return await service.add_member(current_user.id, group_id, member_data.user_id)
+
+
+@router.delete(
+    "/{group_id}/members/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="Remove a member from a group"
+)
+async def remove_group_member(
+    group_id: uuid.UUID,
+    user_id: uuid.UUID,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> None:
+    """
+    Leave a group, or remove a member from a group you created. Members
+    with an unsettled group balance can not be removed.
+    """
+    service = GroupService(db)
+    await service.remove_member(current_user.id, group_id, user_id)
+
+
+@router.get(
+    "/{group_id}/expenses",
+    response_model=GroupFeedPage,
+    description="List the expenses of a group"
+)
+async def get_group_feed(
+    group_id: uuid.UUID,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None
+) -> GroupFeedPage:
+    """
+    Expenses of a group with their shares, newest first. Pass next_cursor
+    from the previous page as cursor to continue.
+    """
+    service = GroupService(db)
+    return await service.get_feed(current_user.id, group_id, limit, cursor)
+
+
+@router.post(
+    "/{group_id}/expenses",
+    response_model=GroupExpense,
+    status_code=status.HTTP_201_CREATED,
+    description="Record an expense in a group"
+)
+async def create_group_expense(
+    group_id: uuid.UUID,
+    expense_data: GroupExpenseCreate,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> GroupExpense:
+    """
+    Record an expense you paid and split it equally among all members, or
+    among member_ids. The shares are accepted right away.
+    """
+    service = GroupService(db)
+    return await service.create_group_expense(current_user.id, group_id, expense_data)
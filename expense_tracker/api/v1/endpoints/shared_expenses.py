@@ -0,0 +1,176 @@
+# expense_tracker/api/v1/endpoints/shared_expenses.py
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.auth import get_current_active_user
+from expense_tracker.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from expense_tracker.db.session import get_session
+from expense_tracker.schemas.inbox import InboxCounts, InboxPage
+from expense_tracker.schemas.shared_expense import (
+    SharedExpenseBatchCreate,
+    SharedExpenseBatchResult,
+    SharedExpenseCreate,
+    SharedExpenseInDB,
+    SharedExpenseStatus,
+    SharedExpenseTransition,
+    SharedExpenseTransitionResult,
+    SharedExpenseUpdate,
+)
+from expense_tracker.schemas.user import AuthenticatedUser
+from expense_tracker.services.inbox import InboxService
+from expense_tracker.services.shared_expense import SharedExpenseService
+
+router = APIRouter()
+
+
+@router.post(
+    "",
+    response_model=SharedExpenseInDB,
+    status_code=status.HTTP_201_CREATED,
+    description="Share an expense with another user"
+)
+async def create_shared_expense(
+    share_data: SharedExpenseCreate,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> SharedExpenseInDB:
+    """
+    Share one of your expenses. The share starts as pending until the other
+    user accepts or rejects it.
+    """
+    service = SharedExpenseService(db)
+    return await service.create_shared_expense(current_user.id, share_data)
+
+
+@router.post(
+    "/batch",
+    response_model=SharedExpenseBatchResult,
+    description="Create the splits of one or many expenses at once"
+)
+async def create_shared_expenses_batch(
+    batch: SharedExpenseBatchCreate,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> SharedExpenseBatchResult:
+    """
+    Create many splits in one request. Each split gives either a
+    split_percentage or a weight; weighted splits share weighted_percentage
+    with rounding remainders allocated deterministically. Splits that are
+    invalid or would push an expense past 100% are reported in errors while
+    the rest are created.
+    """
+    service = SharedExpenseService(db)
+    return await service.create_shared_expenses_batch(current_user.id, batch)
+
+
+@router.post(
+    "/transition",
+    response_model=SharedExpenseTransitionResult,
+    description="Accept, reject or settle many shared expenses at once"
+)
+async def transition_shared_expenses(
+    transition: SharedExpenseTransition,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> SharedExpenseTransitionResult:
+    """
+    Change the status of every shared expense matching the filters in one
+    transaction, e.g. settle everything with a counterparty. Shares that are
+    not in a valid source status, or not at the version given in
+    expected_versions, are left untouched and reported in conflicts.
+    """
+    service = SharedExpenseService(db)
+    return await service.transition_shared_expenses(current_user.id, transition)
+
+
+@router.get(
+    "/inbox",
+    response_model=InboxPage,
+    description="List expenses shared with you"
+)
+async def get_inbox(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session),
+    status: SharedExpenseStatus = SharedExpenseStatus.PENDING,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None
+) -> InboxPage:
+    """
+    Expenses shared with you in one status, newest first. Pass next_cursor
+    from the previous page as cursor to continue.
+    """
+    service = InboxService(db)
+    return await service.get_inbox(current_user.id, status, limit, cursor)
+
+
+@router.get(
+    "/inbox/counts",
+    response_model=InboxCounts,
+    description="Count expenses shared with you by status"
+)
+async def get_inbox_counts(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> InboxCounts:
+    """
+    Number of expenses shared with you per status, e.g. for an inbox badge
+    """
+    service = InboxService(db)
+    return await service.get_counts(current_user.id)
+
+
+@router.get(
+    "/{shared_expense_id}",
+    response_model=SharedExpenseInDB,
+    description="Get a shared expense"
+)
+async def get_shared_expense(
+    shared_expense_id: uuid.UUID,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> SharedExpenseInDB:
+    """
+    Retrieve a shared expense you own or that is shared with you
+    """
+    service = SharedExpenseService(db)
+    return await service.get_shared_expense(current_user.id, shared_expense_id)
+
+
+@router.patch(
+    "/{shared_expense_id}",
+    response_model=SharedExpenseInDB,
+    description="Update the status or split of a shared expense"
+)
+async def update_shared_expense(
+    shared_expense_id: uuid.UUID,
+    share_data: SharedExpenseUpdate,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> SharedExpenseInDB:
+    """
+    Update a shared expense:
+    - status: accepted/rejected by the other user, settled by either party
+    - split_percentage: changed by the expense owner
+    """
+    service = SharedExpenseService(db)
+    return await service.update_shared_expense(current_user.id, shared_expense_id, share_data)
+
+
+@router.delete(
+    "/{shared_expense_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="Delete a shared expense"
+)
+async def delete_shared_expense(
+    shared_expense_id: uuid.UUID,
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session)
+) -> None:
+    """
+    Stop sharing an expense; only the expense owner can do this
+    """
+    service = SharedExpenseService(db)
+    await service.delete_shared_expense(current_user.id, shared_expense_id)
@@ -0,0 +1,42 @@
+# expense_tracker/api/v1/endpoints/sync.py
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.auth import get_current_active_user
+from expense_tracker.db.session import get_session
+from expense_tracker.schemas.sync import SyncPage
+from expense_tracker.schemas.user import AuthenticatedUser
+from expense_tracker.services.sync import SyncService
+
+router = APIRouter()
+
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+
+
+@router.get(
+    "",
+    response_model=SyncPage,
+    description="Get your categories, expenses and shares changed since a cursor"
+)
+async def sync(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_session),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_SYNC_LIMIT, ge=1, le=MAX_SYNC_LIMIT)
+) -> SyncPage:
+    """
+    Delta sync for offline clients:
+    - without a cursor everything is returned, page by page
+    - pass back cursor while has_more is true to get the next page
+    - store the last cursor and pass it on the next launch to get only
+      rows created, updated or deleted since
+
+    Rows may be returned more than once, so apply them as upserts by id.
+    A 410 response means the cursor is older than the deletion history;
+    sync again without a cursor.
+    """
+    service = SyncService(db)
+    return await service.sync(current_user.id, cursor, limit)
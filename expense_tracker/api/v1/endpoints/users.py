@@ -1,9 +1,10 @@
 # expense_tracker/api/v1/endpoints/users.py
-from typing import List
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from expense_tracker.core.etag import etag_matches, make_etag, not_modified
 from expense_tracker.core.exceptions import DuplicateEmailError, UserNotFoundError
 from expense_tracker.db.session import get_session
 from expense_tracker.schemas.user import UserCreate, UserResponse, UserUpdate
@@ -41,24 +42,34 @@ async def create_user(
 @router.get(
     "/{user_id}",
     response_model=UserResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "The user did not change"}},
     description="Get user by ID"
 )
 async def get_user(
     user_id: str,
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
     db: AsyncSession = Depends(get_session)
 ) -> UserResponse:
     """
-    Retrieve a user by their ID
+    Retrieve a user by their ID. The response carries an ETag; send it
+    back in If-None-Match to get a 304 without a body while the user is
+    unchanged.
     """
     user_service = UserService(db)
     try:
-        user = await user_service.get_user_by_id(user_id)
-        return user
+        if if_none_match is not None:
+            etag = make_etag(user_id, await user_service.get_user_version(user_id))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        user = await user_service.get_user(user_id)
     except UserNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    response.headers["ETag"] = make_etag(user_id, user.updated_at)
+    return user
 
 
 @router.put(
@@ -92,6 +103,29 @@ async def update_user(
         )
 
 
+@router.post(
+    "/{user_id}/deactivate",
+    response_model=UserResponse,
+    description="Deactivate a user"
+)
+async def deactivate_user(
+    user_id: str,
+    db: AsyncSession = Depends(get_session)
+) -> UserResponse:
+    """
+    Deactivate a user, invalidating all of their issued access tokens
+    """
+    user_service = UserService(db)
+    try:
+        user = await user_service.deactivate_user(user_id)
+        return user
+    except UserNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
 @router.delete(
     "/{user_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -0,0 +1,248 @@
+# expense_tracker/core/admission.py
+import math
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import AsyncGenerator, Callable, Optional
+
+from fastapi import Request
+from jose import JWTError, jwt
+
+from expense_tracker.core.exceptions import RateLimitExceededError, ServiceOverloadedError
+from expense_tracker.core.loop_monitor import loop_monitor
+from expense_tracker.core.metrics import format_labels, metric_family, register_collector, route_template
+from expense_tracker.core.security import ALGORITHM, SECRET_KEY
+from expense_tracker.core.settings import settings
+from expense_tracker.db.session import PoolWaitTracker, pool_wait
+
+LOW_PRIORITY = "low"
+NORMAL_PRIORITY = "normal"
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average and bursts of `burst`"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take a token; 0 when one was available, else seconds until one is"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+@dataclass(slots=True)
+class Ticket:
+    """An admitted request, handed back to `release` when it is done"""
+    route: str
+    client: str
+    priority: str
+
+
+class AdmissionController:
+    """
+    Decides which requests to serve before they queue for the database.
+
+    A request is refused instead of queued when its client exceeds its
+    rate or concurrency (429), or when its route, or all low priority
+    routes together, are at their concurrency limit (503). Under load,
+    measured as the average wait for a pooled connection and the event
+    loop lag, low priority requests are refused first and all requests
+    once either signal reaches twice its threshold. Refusing early keeps
+    latency flat for the requests that are admitted.
+    """
+
+    def __init__(
+        self,
+        *,
+        exempt_routes: list[str],
+        route_concurrency: int,
+        route_limits: dict[str, int],
+        low_priority_routes: list[str],
+        low_priority_concurrency: int,
+        user_concurrency: int,
+        user_rate: float,
+        user_burst: int,
+        max_tracked_clients: int,
+        pool_wait_threshold: float,
+        loop_lag_threshold: float,
+        retry_after: float,
+        pool_wait: PoolWaitTracker,
+        loop_lag: Callable[[], float],
+    ):
+        self.exempt_routes = exempt_routes
+        self.route_concurrency = route_concurrency
+        self.route_limits = route_limits
+        self.low_priority_routes = low_priority_routes
+        self.low_priority_concurrency = low_priority_concurrency
+        self.user_concurrency = user_concurrency
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.max_tracked_clients = max_tracked_clients
+        self.pool_wait_threshold = pool_wait_threshold
+        self.loop_lag_threshold = loop_lag_threshold
+        self.retry_after = retry_after
+        self.pool_wait = pool_wait
+        self.loop_lag = loop_lag
+        self.admitted: Counter = Counter()  # By priority
+        self.rejected: Counter = Counter()  # By reason
+        self._route_in_flight: Counter = Counter()
+        self._client_in_flight: Counter = Counter()
+        self._low_in_flight = 0
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._classes: dict[str, Optional[str]] = {}
+
+    def classify(self, route: str) -> Optional[str]:
+        """Priority of a "METHOD /route", None for exempt routes"""
+        if route not in self._classes:
+            if any(fnmatchcase(route, pattern) for pattern in self.exempt_routes):
+                self._classes[route] = None
+            elif any(fnmatchcase(route, pattern) for pattern in self.low_priority_routes):
+                self._classes[route] = LOW_PRIORITY
+            else:
+                self._classes[route] = NORMAL_PRIORITY
+        return self._classes[route]
+
+    def pressure(self) -> float:
+        """Load as a multiple of the thresholds; 1 sheds low priority, 2 everything"""
+        return max(
+            self.pool_wait.current() / self.pool_wait_threshold,
+            self.loop_lag() / self.loop_lag_threshold,
+        )
+
+    def admit(self, route: str, client: str) -> Optional[Ticket]:
+        """Admit a request or raise; None for exempt routes, which are not tracked"""
+        priority = self.classify(route)
+        if priority is None:
+            return None
+
+        pressure = self.pressure()
+        shed_at = 1.0 if priority == LOW_PRIORITY else 2.0
+        if pressure >= shed_at:
+            self._reject("overloaded")
+            raise ServiceOverloadedError("Server is overloaded", self._retry_after(self.retry_after * pressure))
+
+        wait = self._bucket(client).take(time.monotonic())
+        if wait > 0:
+            self._reject("rate")
+            raise RateLimitExceededError("Too many requests", self._retry_after(wait))
+        if self._client_in_flight[client] >= self.user_concurrency:
+            self._reject("client_concurrency")
+            raise RateLimitExceededError("Too many concurrent requests", self._retry_after(self.retry_after))
+        if self._route_in_flight[route] >= self.route_limits.get(route, self.route_concurrency):
+            self._reject("route_concurrency")
+            raise ServiceOverloadedError("Route is busy", self._retry_after(self.retry_after))
+        if priority == LOW_PRIORITY:
+            if self._low_in_flight >= self.low_priority_concurrency:
+                self._reject("low_priority_concurrency")
+                raise ServiceOverloadedError("Route is busy", self._retry_after(self.retry_after))
+            self._low_in_flight += 1
+
+        self._route_in_flight[route] += 1
+        self._client_in_flight[client] += 1
+        self.admitted[priority] += 1
+        return Ticket(route=route, client=client, priority=priority)
+
+    def release(self, ticket: Ticket) -> None:
+        self._route_in_flight[ticket.route] -= 1
+        self._client_in_flight[ticket.client] -= 1
+        if not self._client_in_flight[ticket.client]:
+            del self._client_in_flight[ticket.client]
+        if ticket.priority == LOW_PRIORITY:
+            self._low_in_flight -= 1
+
+    def render_metrics(self) -> list[str]:
+        return [
+            *metric_family("admission_admitted_total", "counter", "Requests admitted, by priority", [
+                f"admission_admitted_total{format_labels(priority=priority)} {count}"
+                for priority, count in sorted(self.admitted.items())
+            ]),
+            *metric_family("admission_rejected_total", "counter", "Requests refused, by reason", [
+                f"admission_rejected_total{format_labels(reason=reason)} {count}"
+                for reason, count in sorted(self.rejected.items())
+            ]),
+            *metric_family("admission_pressure", "gauge", "Load as a multiple of the shedding thresholds", [
+                f"admission_pressure {self.pressure():.3f}"
+            ]),
+            *metric_family("db_pool_wait_seconds", "gauge", "Moving average of the wait for a pooled connection", [
+                f"db_pool_wait_seconds {self.pool_wait.current():.6f}"
+            ]),
+        ]
+
+    def _bucket(self, client: str) -> TokenBucket:
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(self.user_rate, self.user_burst, time.monotonic())
+            while len(self._buckets) > self.max_tracked_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+        return bucket
+
+    def _reject(self, reason: str) -> None:
+        self.rejected[reason] += 1
+
+    @staticmethod
+    def _retry_after(seconds: float) -> int:
+        return max(1, math.ceil(seconds))
+
+
+admission = AdmissionController(
+    exempt_routes=settings.ADMISSION_EXEMPT_ROUTES,
+    route_concurrency=settings.ADMISSION_ROUTE_CONCURRENCY,
+    route_limits=settings.ADMISSION_ROUTE_LIMITS,
+    low_priority_routes=settings.ADMISSION_LOW_PRIORITY_ROUTES,
+    low_priority_concurrency=settings.ADMISSION_LOW_PRIORITY_CONCURRENCY,
+    user_concurrency=settings.ADMISSION_USER_CONCURRENCY,
+    user_rate=settings.ADMISSION_USER_RATE,
+    user_burst=settings.ADMISSION_USER_BURST,
+    max_tracked_clients=settings.ADMISSION_MAX_TRACKED_CLIENTS,
+    pool_wait_threshold=settings.ADMISSION_POOL_WAIT_SECONDS,
+    loop_lag_threshold=settings.ADMISSION_LOOP_LAG_SECONDS,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    pool_wait=pool_wait,
+    loop_lag=lambda: loop_monitor.last_lag,
+)
+register_collector(admission.render_metrics)
+
+
+def client_key(request: Request) -> str:
+    """The user of a valid bearer token, else the client address"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+        except JWTError:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    return f"address:{request.client.host if request.client else 'unknown'}"
+
+
+async def admit_request(request: Request) -> AsyncGenerator[None, None]:
+    """
+    App-wide dependency admitting or refusing a request.
+
+    Runs after routing, so limits apply per route template, and before the
+    route's own dependencies, so refused requests never take a connection.
+    The request counts against its limits until its response is sent.
+    """
+    route = f"{request.method} {route_template(request.scope)}"
+    if admission.classify(route) is None:
+        yield
+        return
+    ticket = admission.admit(route, client_key(request))
+    try:
+        yield
+    finally:
+        admission.release(ticket)
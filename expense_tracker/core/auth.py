@@ -1,48 +1,70 @@
 # expense_tracker/core/auth.py
-from typing import Annotated
+import secrets
+from typing import Annotated, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from expense_tracker.core.security import ALGORITHM, SECRET_KEY
+from expense_tracker.core.security import ALGORITHM, SECRET_KEY, get_user_for_token
+from expense_tracker.core.settings import settings
 from expense_tracker.db.session import get_session
-from expense_tracker.models.user import User
-from expense_tracker.schemas.token import TokenData
-from expense_tracker.services.user import user_service
+from expense_tracker.schemas.token import TokenPayload
+from expense_tracker.schemas.user import AuthenticatedUser
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[AsyncSession, Depends(get_session)]
-):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
 
+async def get_token_payload(
+    token: Annotated[str, Depends(oauth2_scheme)]
+) -> TokenPayload:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        token_data = TokenData(user_id=int(user_id))
-    except JWTError:
+        token_data = TokenPayload(**payload)
+    except (JWTError, ValidationError):
         raise credentials_exception
+    if token_data.sub is None:
+        raise credentials_exception
+    return token_data
+
 
-    user = await user_service.get(db, id=token_data.user_id)
+async def get_current_user(
+    token_data: Annotated[TokenPayload, Depends(get_token_payload)],
+    db: Annotated[AsyncSession, Depends(get_session)]
+) -> AuthenticatedUser:
+    try:
+        user = await get_user_for_token(db, token_data)
+    except ValueError:  # Subject is not a valid user id
+        raise credentials_exception
     if user is None:
         raise credentials_exception
     return user
 
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)]
-):
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]
+) -> AuthenticatedUser:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def require_admin(
+    x_admin_token: Annotated[Optional[str], Header()] = None
+) -> None:
+    """Guard operational endpoints with the static ADMIN_TOKEN"""
+    if not settings.ADMIN_TOKEN or x_admin_token is None \
+            or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required"
+        )
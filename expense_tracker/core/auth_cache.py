@@ -0,0 +1,79 @@
+# expense_tracker/core/auth_cache.py
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from expense_tracker.core.settings import settings
+from expense_tracker.schemas.user import AuthenticatedUser
+
+
+@dataclass(slots=True)
+class _Entry:
+    token_version: int
+    expires_at: float
+    user: AuthenticatedUser
+
+
+class AuthUserCache:
+    """
+    Process-local cache of users resolved from access tokens.
+
+    Entries are keyed by token subject and are only served for the token
+    version they were loaded with, so bumping `User.token_version` retires
+    them immediately. Writes through `UserService` invalidate explicitly and
+    the TTL bounds staleness for writes that bypass the service.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[uuid.UUID, _Entry] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, user_id: uuid.UUID, token_version: int) -> AuthenticatedUser | None:
+        """Return the cached user if present, fresh and of the same token version"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        if entry.token_version != token_version:
+            return None
+        self._entries.move_to_end(user_id)
+        return entry.user
+
+    def set(self, user: AuthenticatedUser) -> None:
+        """Cache a resolved user, evicting the least recently used entry if full"""
+        if not self.enabled:
+            return
+        self._entries[user.id] = _Entry(
+            token_version=user.token_version,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            user=user,
+        )
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID | str) -> None:
+        """Drop the entry for a user after it was updated, deactivated or deleted"""
+        if isinstance(user_id, str):
+            user_id = uuid.UUID(user_id)
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+auth_user_cache = AuthUserCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+)
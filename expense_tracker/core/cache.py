@@ -0,0 +1,161 @@
+# expense_tracker/core/cache.py
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+from expense_tracker.core.auth_cache import auth_user_cache
+from expense_tracker.core.invalidation import EntityChange, InvalidationBus
+from expense_tracker.core.settings import settings
+from expense_tracker.schemas.cache import CacheStats
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class _Entry(Generic[T]):
+    entity_id: uuid.UUID
+    expires_at: float
+    value: T
+
+
+class ReferenceCache(Generic[T]):
+    """
+    Process-local LRU cache of rarely changing reference entities.
+
+    An entity can be cached under several keys (e.g. by id and by email),
+    all of which are dropped together by `invalidate`. Invalidation also
+    bumps the cache generation: readers take `generation` before querying
+    the database and pass it to `set`, which discards values loaded before
+    a concurrent write so a stale row can never be cached after its
+    invalidation. Writes in other processes arrive through the invalidation
+    bus (see `subscribe_caches`), with the TTL as a backstop.
+
+    Values are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_size: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, _Entry[T]] = OrderedDict()
+        self._keys: dict[uuid.UUID, set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, key: Hashable) -> Optional[T]:
+        """Return the cached value if present and fresh"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, entity_id: uuid.UUID, keys: Iterable[Hashable], value: T, generation: int) -> None:
+        """Cache value under keys unless the cache was invalidated since generation"""
+        if not self.enabled or generation != self.generation:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        for key in keys:
+            self._drop(key)
+            self._entries[key] = _Entry(entity_id, expires_at, value)
+            self._keys.setdefault(entity_id, set()).add(key)
+        while len(self._entries) > self.max_size:
+            key, entry = self._entries.popitem(last=False)
+            self._forget(key, entry.entity_id)
+            self.evictions += 1
+
+    def invalidate(self, entity_id: uuid.UUID) -> None:
+        """Drop every key of an entity after it was written"""
+        self.generation += 1
+        self.invalidations += 1
+        for key in self._keys.pop(entity_id, ()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._keys.clear()
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.misses
+        return CacheStats(
+            name=self.name,
+            size=len(self._entries),
+            max_size=self.max_size,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / lookups if lookups else 0.0,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+        )
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._forget(key, entry.entity_id)
+
+    def _forget(self, key: Hashable, entity_id: uuid.UUID) -> None:
+        keys = self._keys.get(entity_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[entity_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+cache_registry: dict[str, ReferenceCache[Any]] = {}
+
+
+def register_cache(name: str) -> ReferenceCache[Any]:
+    """Create a reference cache with the configured limits and register it for stats"""
+    cache: ReferenceCache[Any] = ReferenceCache(
+        name,
+        ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS,
+        max_size=settings.REFERENCE_CACHE_MAX_SIZE,
+    )
+    cache_registry[name] = cache
+    return cache
+
+
+def _invalidator(invalidate: Callable[[uuid.UUID], None]) -> Callable[[list[EntityChange]], None]:
+    def on_change(changes: list[EntityChange]) -> None:
+        for change in changes:
+            invalidate(change.entity_id)
+    return on_change
+
+
+_subscribed_buses: "weakref.WeakSet[InvalidationBus]" = weakref.WeakSet()
+
+
+def subscribe_caches(bus: InvalidationBus) -> None:
+    """Invalidate this worker's caches on changes published by any worker"""
+    # The app lifespan can run more than once per process, e.g. in tests
+    if bus in _subscribed_buses:
+        return
+    _subscribed_buses.add(bus)
+    for name, cache in cache_registry.items():
+        # Reference caches are named after the table they cache
+        bus.subscribe(name, _invalidator(cache.invalidate), cache.clear)
+    bus.subscribe("user", _invalidator(auth_user_cache.invalidate), auth_user_cache.clear)
+
+
+user_cache = register_cache("user")
+category_cache = register_cache("category")
@@ -0,0 +1,31 @@
+# expense_tracker/core/etag.py
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*versions: Any, weak: bool = True) -> str:
+    """
+    Entity tag derived from the versions a representation is built from,
+    e.g. ids and updated_at columns, rather than from the serialized body.
+
+    Tags are weak by default: equal versions give an equivalent body, not
+    necessarily the same bytes, e.g. across releases.
+    """
+    digest = hashlib.blake2b("|".join(map(str, versions)).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag, by weak comparison"""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
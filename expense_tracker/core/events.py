@@ -0,0 +1,116 @@
+# expense_tracker/core/events.py
+import asyncio
+import json
+import uuid
+import weakref
+from typing import Optional
+
+from expense_tracker.core.invalidation import EntityChange, InvalidationBus
+from expense_tracker.core.settings import settings
+
+
+def format_event(event: str, data: dict) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventClient:
+    """One connected stream with a bounded buffer of pending events"""
+
+    def __init__(self, user_id: uuid.UUID, buffer_size: int):
+        self.user_id = user_id
+        self.evicted = False
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=buffer_size)
+
+    def push(self, message: str) -> bool:
+        """Queue a message, returning False if the buffer is full"""
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def evict(self) -> None:
+        """Stop the stream once the client catches up to its buffer"""
+        self.evicted = True
+        # The buffer is full, so make room for the end-of-stream marker
+        try:
+            self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        self._queue.put_nowait(None)
+
+    async def next(self, timeout: float) -> Optional[str]:
+        """Next message, None once evicted; raises TimeoutError when idle"""
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+
+class EventBroker:
+    """
+    Fans out change notifications to the streams of the users they concern.
+
+    Changes arrive through the worker's invalidation bus, so all streams of
+    a worker share its single LISTEN connection. Each stream has a bounded
+    buffer; a client that falls that far behind is disconnected rather than
+    slowing down or growing memory for everyone else, and is expected to
+    reconnect and refetch.
+    """
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self._clients: dict[uuid.UUID, set[EventClient]] = {}
+        self.evictions = 0
+
+    def connect(self, user_id: uuid.UUID) -> EventClient:
+        client = EventClient(user_id, self.buffer_size)
+        self._clients.setdefault(user_id, set()).add(client)
+        return client
+
+    def disconnect(self, client: EventClient) -> None:
+        clients = self._clients.get(client.user_id)
+        if clients is not None:
+            clients.discard(client)
+            if not clients:
+                del self._clients[client.user_id]
+
+    def publish(self, changes: list[EntityChange]) -> None:
+        for change in changes:
+            if change.user_id is None:
+                continue
+            message = format_event("change", {"table": change.table, "id": str(change.entity_id)})
+            for client in list(self._clients.get(change.user_id, ())):
+                self._deliver(client, message)
+
+    def resync(self) -> None:
+        """Changes may have been missed: tell every client to refetch"""
+        message = format_event("resync", {})
+        for clients in list(self._clients.values()):
+            for client in list(clients):
+                self._deliver(client, message)
+
+    def _deliver(self, client: EventClient, message: str) -> None:
+        if client.evicted:
+            return
+        if not client.push(message):
+            client.evict()
+            self.disconnect(client)
+            self.evictions += 1
+
+    @property
+    def client_count(self) -> int:
+        return sum(len(clients) for clients in self._clients.values())
+
+
+event_broker = EventBroker(buffer_size=settings.EVENTS_CLIENT_BUFFER_SIZE)
+
+_subscribed_buses: "weakref.WeakSet[InvalidationBus]" = weakref.WeakSet()
+
+
+def subscribe_events(bus: InvalidationBus) -> None:
+    """Stream changes published by any worker to this worker's clients"""
+    if bus in _subscribed_buses:
+        return
+    _subscribed_buses.add(bus)
+    bus.subscribe("expense", event_broker.publish, event_broker.resync)
+    # Clients are told to resync once per reconnect, through the subscription above
+    bus.subscribe("shared_expense", event_broker.publish, lambda: None)
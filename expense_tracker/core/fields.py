@@ -0,0 +1,67 @@
+# expense_tracker/core/fields.py
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import BaseModel, create_model
+
+from expense_tracker.core.exceptions import InvalidFieldsError
+from expense_tracker.schemas.base import BaseSchema
+
+# (field, subfields) pairs in schema order; subfields is None for plain fields
+FieldSelection = tuple[tuple[str, Optional[tuple[str, ...]]], ...]
+
+
+def nested_model(schema: type[BaseModel], name: str) -> Optional[type[BaseModel]]:
+    annotation = schema.model_fields[name].annotation
+    return annotation if isinstance(annotation, type) and issubclass(annotation, BaseModel) else None
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> FieldSelection:
+    """
+    Fields of schema named in a comma separated `fields` parameter, e.g.
+    "id,amount,date,category.name". A nested model is selected whole by its
+    name or in part by dotted names; without `fields` everything is.
+    """
+    if fields is None:
+        wanted = dict.fromkeys(schema.model_fields)
+    else:
+        wanted: dict[str, Optional[set[str]]] = {}
+        for item in filter(None, (item.strip() for item in fields.split(","))):
+            name, _, subfield = item.partition(".")
+            if name not in schema.model_fields:
+                raise InvalidFieldsError(f"Unknown field: {item}")
+            model = nested_model(schema, name)
+            if not subfield:
+                wanted[name] = None
+            elif model is None or subfield not in model.model_fields:
+                raise InvalidFieldsError(f"Unknown field: {item}")
+            elif name not in wanted:
+                wanted[name] = {subfield}
+            elif wanted[name] is not None:
+                wanted[name].add(subfield)
+        if not wanted:
+            raise InvalidFieldsError("No fields selected")
+
+    selection = []
+    for name in schema.model_fields:
+        if name not in wanted:
+            continue
+        model = nested_model(schema, name)
+        if model is None:
+            selection.append((name, None))
+        else:
+            subfields = wanted[name]
+            selection.append((name, tuple(sub for sub in model.model_fields if subfields is None or sub in subfields)))
+    return tuple(selection)
+
+
+@lru_cache(maxsize=128)
+def partial_model(schema: type[BaseModel], selection: FieldSelection) -> type[BaseModel]:
+    """Model with only the selected fields of schema, serializing like it"""
+    definitions = {}
+    for name, subfields in selection:
+        annotation = schema.model_fields[name].annotation
+        if subfields is not None:
+            annotation = partial_model(annotation, tuple((sub, None) for sub in subfields))
+        definitions[name] = (annotation, ...)
+    return create_model(f"Partial{schema.__name__}", __base__=BaseSchema, **definitions)
@@ -0,0 +1,399 @@
+# expense_tracker/core/idempotency.py
+import asyncio
+import hashlib
+import re
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from fnmatch import fnmatchcase
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from expense_tracker.core.admission import client_key
+from expense_tracker.core.exceptions import (
+    IdempotencyKeyInUseError,
+    IdempotencyKeyMismatchError,
+    InvalidIdempotencyKeyError,
+)
+from expense_tracker.core.metrics import format_labels, metric_family, register_collector
+from expense_tracker.core.settings import settings
+from expense_tracker.db.session import AsyncSessionLocal
+from expense_tracker.models.idempotency import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+# Set on responses replayed from the store
+REPLAYED_HEADER = "idempotent-replayed"
+KEY_PATTERN = re.compile(r"^[\x21-\x7e]{1,255}$")
+# Client errors a retry would get again; others (401, 403, 429, ...) may pass later
+STORED_CLIENT_ERRORS = frozenset({400, 404, 409, 422})
+
+
+@dataclass(slots=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+    expires_at: datetime
+
+
+def request_hash(method: str, path: str, query: bytes, body: bytes) -> str:
+    """Fingerprint telling a retry apart from another request reusing its key"""
+    digest = hashlib.sha256(f"{method} {path}?".encode())
+    digest.update(query)
+    digest.update(b"\n")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class DatabaseBackend:
+    """
+    Keys shared by all workers, in the idempotency_key table.
+
+    Inserting a key's row claims it; a worker that finds the row of a
+    running request refuses the retry rather than waiting on it. Rows left
+    behind by a worker that died mid-request are taken over after
+    `lock_timeout` seconds.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, lock_timeout: float):
+        self.session_factory = session_factory
+        self.lock_timeout = timedelta(seconds=lock_timeout)
+
+    async def claim(
+        self, owner: str, key: str, request_hash: str, expires_at: datetime
+    ) -> Optional[StoredResponse]:
+        """Claim a key for this request, or return the response stored for it"""
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            claimed = await db.execute(
+                insert(IdempotencyKey).values(
+                    id=uuid.uuid4(),
+                    owner=owner,
+                    key=key,
+                    request_hash=request_hash,
+                    expires_at=expires_at
+                ).on_conflict_do_nothing(constraint="uq_idempotency_key_owner_key").returning(IdempotencyKey.id)
+            )
+            if claimed.scalar_one_or_none() is None:
+                claimed = await db.execute(
+                    update(IdempotencyKey)
+                    .where(
+                        IdempotencyKey.owner == owner,
+                        IdempotencyKey.key == key,
+                        or_(
+                            IdempotencyKey.expires_at <= now,
+                            and_(
+                                IdempotencyKey.status_code.is_(None),
+                                IdempotencyKey.updated_at < now - self.lock_timeout
+                            )
+                        )
+                    )
+                    .values(request_hash=request_hash, status_code=None, headers=None, body=None,
+                            expires_at=expires_at)
+                    .returning(IdempotencyKey.id)
+                )
+            if claimed.scalar_one_or_none() is not None:
+                await db.commit()
+                return None
+
+            result = await db.execute(
+                select(IdempotencyKey).where(IdempotencyKey.owner == owner, IdempotencyKey.key == key)
+            )
+            row = result.scalar_one_or_none()
+
+        if row is None or row.status_code is None:
+            raise IdempotencyKeyInUseError("A request with this Idempotency-Key is still running")
+        return StoredResponse(
+            request_hash=row.request_hash,
+            status_code=row.status_code,
+            headers=[(name, value) for name, value in row.headers],
+            body=row.body,
+            expires_at=row.expires_at,
+        )
+
+    async def complete(self, owner: str, key: str, response: StoredResponse) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.owner == owner, IdempotencyKey.key == key)
+                .values(status_code=response.status_code, headers=response.headers, body=response.body)
+            )
+            await db.commit()
+
+    async def release(self, owner: str, key: str) -> None:
+        """Give up a claimed key so the request can be retried"""
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.owner == owner,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status_code.is_(None)
+                )
+            )
+            await db.commit()
+
+    @staticmethod
+    async def purge_expired(db: AsyncSession) -> int:
+        result = await db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.now(timezone.utc))
+        )
+        await db.commit()
+        return result.rowcount
+
+
+@dataclass(slots=True)
+class _KeyLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+class IdempotencyStore:
+    """
+    First responses to requests sent with an Idempotency-Key.
+
+    Responses are kept in a bounded in-process LRU and in the backend, which
+    answers for keys first used on another worker or before a restart.
+    Requests with the same key on one worker are serialized, so duplicates
+    arriving together wait for the first one's response.
+    """
+
+    def __init__(self, backend: DatabaseBackend, capacity: int, ttl: float):
+        self.backend = backend
+        self.capacity = capacity
+        self.ttl = timedelta(seconds=ttl)
+        self.outcomes: Counter = Counter()
+        self._responses: OrderedDict[tuple[str, str], StoredResponse] = OrderedDict()
+        self._locks: dict[tuple[str, str], _KeyLock] = {}
+
+    @asynccontextmanager
+    async def locked(self, owner: str, key: str) -> AsyncIterator[None]:
+        entry = self._locks.setdefault((owner, key), _KeyLock())
+        entry.users += 1
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            entry.users -= 1
+            if not entry.users:
+                del self._locks[(owner, key)]
+
+    async def begin(self, owner: str, key: str, request_hash: str) -> Optional[StoredResponse]:
+        """The stored response for a key, or None once the key is claimed for this request"""
+        stored = self._responses.get((owner, key))
+        if stored is not None and stored.expires_at <= datetime.now(timezone.utc):
+            del self._responses[(owner, key)]
+            stored = None
+        if stored is not None:
+            self._responses.move_to_end((owner, key))
+            return stored
+        stored = await self.backend.claim(owner, key, request_hash, datetime.now(timezone.utc) + self.ttl)
+        if stored is not None:
+            self._remember(owner, key, stored)
+        return stored
+
+    async def complete(
+        self, owner: str, key: str, request_hash: str, status_code: int, headers: list[tuple[str, str]], body: bytes
+    ) -> None:
+        stored = StoredResponse(
+            request_hash=request_hash,
+            status_code=status_code,
+            headers=headers,
+            body=body,
+            expires_at=datetime.now(timezone.utc) + self.ttl,
+        )
+        self._remember(owner, key, stored)
+        await self.backend.complete(owner, key, stored)
+
+    async def abandon(self, owner: str, key: str) -> None:
+        await self.backend.release(owner, key)
+
+    def render_metrics(self) -> list[str]:
+        return [
+            *metric_family("idempotency_requests_total", "counter", "Requests with an Idempotency-Key, by outcome", [
+                f"idempotency_requests_total{format_labels(outcome=outcome)} {count}"
+                for outcome, count in sorted(self.outcomes.items())
+            ]),
+        ]
+
+    def _remember(self, owner: str, key: str, stored: StoredResponse) -> None:
+        self._responses[(owner, key)] = stored
+        self._responses.move_to_end((owner, key))
+        while len(self._responses) > self.capacity:
+            self._responses.popitem(last=False)
+
+
+idempotency_store = IdempotencyStore(
+    backend=DatabaseBackend(AsyncSessionLocal, lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS),
+    capacity=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+)
+register_collector(idempotency_store.render_metrics)
+
+
+@dataclass(slots=True)
+class _Capture:
+    status_code: int = 0
+    headers: list[tuple[str, str]] = field(default_factory=list)
+    body: bytearray = field(default_factory=bytearray)
+    complete: bool = False
+    too_large: bool = False
+
+    @property
+    def private(self) -> bool:
+        """Whether the response carries credentials, marked by no-store or a cookie"""
+        for name, value in self.headers:
+            name = name.lower()
+            if name == "set-cookie" or (name == "cache-control" and "no-store" in value.lower()):
+                return True
+        return False
+
+
+class IdempotencyMiddleware:
+    """
+    Runs a POST request sent with an Idempotency-Key header at most once.
+
+    Retries with the same key, from the same user or client address, get
+    the first response replayed with an `Idempotent-Replayed: true` header.
+    A retry with a different body gets 422, one arriving while the first
+    is still running on another worker 409. Only 2xx responses and client
+    errors a retry would get again (STORED_CLIENT_ERRORS) are stored; other
+    statuses such as 429 or 5xx, bodies over IDEMPOTENCY_MAX_BODY_BYTES,
+    and responses marked
+    `Cache-Control: no-store` or setting a cookie are not stored, so the
+    request may run again. Requests to `excluded_paths` are passed through
+    as if they had no key.
+    """
+
+    def __init__(self, app, store: IdempotencyStore = idempotency_store,
+                 max_body_bytes: int = settings.IDEMPOTENCY_MAX_BODY_BYTES,
+                 excluded_paths: list[str] = settings.IDEMPOTENCY_EXCLUDED_PATHS):
+        self.app = app
+        self.store = store
+        self.max_body_bytes = max_body_bytes
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" \
+                or any(fnmatchcase(scope["path"], pattern) for pattern in self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+        key = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == IDEMPOTENCY_HEADER.encode()),
+            None
+        )
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not KEY_PATTERN.match(key):
+            await self._refuse(InvalidIdempotencyKeyError(
+                "Idempotency-Key must be 1-255 visible ASCII characters"
+            ), "invalid", scope, receive, send)
+            return
+
+        body, disconnected = await read_body(receive)
+        if disconnected:
+            return
+        owner = client_key(Request(scope))
+        fingerprint = request_hash(scope["method"], scope["path"], scope["query_string"], body)
+
+        async with self.store.locked(owner, key):
+            try:
+                stored = await self.store.begin(owner, key, fingerprint)
+            except IdempotencyKeyInUseError as e:
+                await self._refuse(e, "in_progress", scope, receive, send)
+                return
+            if stored is None:
+                self.store.outcomes["executed"] += 1
+                await self._run(scope, replay_receive(body, receive), send, owner, key, fingerprint)
+            elif stored.request_hash != fingerprint:
+                await self._refuse(IdempotencyKeyMismatchError(
+                    "Idempotency-Key was already used for a different request"
+                ), "mismatch", scope, receive, send)
+            else:
+                self.store.outcomes["replayed"] += 1
+                await replay(stored, send)
+
+    async def _refuse(self, error: HTTPException, outcome: str, scope, receive, send) -> None:
+        self.store.outcomes[outcome] += 1
+        response = JSONResponse({"detail": error.detail}, status_code=error.status_code, headers=error.headers)
+        await response(scope, receive, send)
+
+    async def _run(self, scope, receive, send, owner: str, key: str, fingerprint: str) -> None:
+        capture = _Capture()
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                capture.status_code = message["status"]
+                capture.headers = [
+                    (name.decode("latin-1"), value.decode("latin-1")) for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                if len(capture.body) + len(chunk) > self.max_body_bytes:
+                    capture.too_large = True
+                elif not capture.too_large:
+                    capture.body += chunk
+                capture.complete = not message.get("more_body", False)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_capture)
+        except BaseException:
+            await self.store.abandon(owner, key)
+            raise
+        if capture.complete and not capture.too_large and _is_final(capture.status_code) and not capture.private:
+            await self.store.complete(owner, key, fingerprint, capture.status_code, capture.headers, bytes(capture.body))
+        else:
+            await self.store.abandon(owner, key)
+
+
+async def read_body(receive) -> tuple[bytes, bool]:
+    """The whole request body, and whether the client went away first"""
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return bytes(body), True
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return bytes(body), False
+
+
+def replay_receive(body: bytes, receive):
+    """A receive channel handing the app the already read body"""
+    pending = True
+
+    async def receive_body():
+        nonlocal pending
+        if pending:
+            pending = False
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return receive_body
+
+
+async def replay(stored: StoredResponse, send) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": stored.status_code,
+        "headers": [
+            *((name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.headers),
+            (REPLAYED_HEADER.encode(), b"true"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+def _is_final(status_code: int) -> bool:
+    """Whether a retry with the same key should replay this status"""
+    return 200 <= status_code < 300 or status_code in STORED_CLIENT_ERRORS
@@ -0,0 +1,218 @@
+# expense_tracker/core/invalidation.py
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "entity_changes"
+# Base delay before reconnecting, doubled after every failed attempt
+RECONNECT_BASE_SECONDS = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class EntityChange:
+    """A row that was written: the table, its id and the user it belongs to"""
+    table: str
+    entity_id: uuid.UUID
+    user_id: Optional[uuid.UUID] = None
+
+    def to_payload(self) -> str:
+        return json.dumps({
+            "t": self.table,
+            "id": str(self.entity_id),
+            "u": str(self.user_id) if self.user_id else None,
+        })
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "EntityChange":
+        data = json.loads(payload)
+        return cls(
+            table=data["t"],
+            entity_id=uuid.UUID(data["id"]),
+            user_id=uuid.UUID(data["u"]) if data.get("u") else None,
+        )
+
+
+async def publish_changes(db: AsyncSession, changes: Iterable[EntityChange]) -> None:
+    """
+    Queue change notifications in the current transaction.
+
+    Postgres delivers them to every listening worker only when the
+    transaction commits, and drops them on rollback, so caches are never
+    invalidated for writes that did not happen. All notifications are sent
+    in a single statement.
+    """
+    payloads = [change.to_payload() for change in changes]
+    if not payloads:
+        return
+    statement = text(
+        "SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"
+    ).bindparams(channel=CHANNEL, payloads=payloads)
+    await db.execute(statement)
+
+
+@dataclass(slots=True)
+class _Subscriber:
+    on_change: Callable[[list[EntityChange]], None]
+    on_resync: Callable[[], None]
+
+
+class InvalidationBus:
+    """
+    Fans out entity changes published by any worker to this worker's caches.
+
+    Each worker keeps one dedicated LISTEN connection. Notifications are
+    collected for `coalesce_seconds` and deduplicated, so a burst of writes
+    to the same rows is delivered once per affected user. Notifications sent
+    while the connection is down are lost, so subscribers are told to
+    resync (drop everything) whenever the connection is lost or
+    re-established, with exponential backoff between reconnect attempts.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        coalesce_seconds: float,
+        reconnect_max_seconds: float,
+        healthcheck_seconds: float,
+        channel: str = CHANNEL,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.coalesce_seconds = coalesce_seconds
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self.healthcheck_seconds = healthcheck_seconds
+        self.connected = False
+
+        self._subscribers: dict[str, list[_Subscriber]] = defaultdict(list)
+        self._pending: dict[EntityChange, None] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(
+        self,
+        table: str,
+        on_change: Callable[[list[EntityChange]], None],
+        on_resync: Callable[[], None],
+    ) -> None:
+        """Register callbacks for changes to table and for lost notifications"""
+        self._subscribers[table].append(_Subscriber(on_change, on_resync))
+
+    def receive(self, payload: str) -> None:
+        """Queue one notification payload for the next flush"""
+        try:
+            change = EntityChange.from_payload(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed invalidation payload %r", payload)
+            return
+        self._pending[change] = None
+        self._wakeup.set()
+
+    def flush(self) -> None:
+        """Deliver queued changes to subscribers, grouped by table"""
+        pending, self._pending = self._pending, {}
+        by_table: dict[str, list[EntityChange]] = defaultdict(list)
+        for change in pending:
+            by_table[change.table].append(change)
+        for table, changes in by_table.items():
+            for subscriber in self._subscribers.get(table, ()):
+                try:
+                    subscriber.on_change(changes)
+                except Exception:
+                    # One broken subscriber must not stop the others or the bus
+                    logger.exception("Invalidation subscriber for %s failed", table)
+
+    def resync(self) -> None:
+        """Tell every subscriber that changes may have been missed"""
+        self._pending.clear()
+        for subscribers in self._subscribers.values():
+            for subscriber in subscribers:
+                try:
+                    subscriber.on_resync()
+                except Exception:
+                    logger.exception("Invalidation subscriber failed to resync")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="invalidation-bus")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        delay = RECONNECT_BASE_SECONDS
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Invalidation bus can not connect, retrying in %.1fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.reconnect_max_seconds)
+                continue
+
+            delay = RECONNECT_BASE_SECONDS
+            try:
+                await self._listen(connection)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning("Invalidation bus connection lost: %s", e)
+            else:
+                logger.warning("Invalidation bus connection terminated")
+            finally:
+                self.connected = False
+                self.resync()
+                if not connection.is_closed():
+                    connection.terminate()
+
+    async def _listen(self, connection: asyncpg.Connection) -> None:
+        lost = asyncio.Event()
+
+        def on_terminate(_connection: asyncpg.Connection) -> None:
+            lost.set()
+            self._wakeup.set()
+
+        connection.add_termination_listener(on_terminate)
+        await connection.add_listener(self.channel, lambda _conn, _pid, _channel, payload: self.receive(payload))
+        # Anything cached before this point may have missed notifications
+        self.resync()
+        self.connected = True
+        logger.info("Invalidation bus listening on %s", self.channel)
+
+        while not lost.is_set():
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.healthcheck_seconds)
+            except asyncio.TimeoutError:
+                # Quiet period: make sure the connection is still alive
+                await connection.execute("SELECT 1")
+                continue
+            if lost.is_set():
+                break
+            # Let the rest of a burst arrive before invalidating
+            await asyncio.sleep(self.coalesce_seconds)
+            self._wakeup.clear()
+            self.flush()
+
+
+invalidation_bus = InvalidationBus(
+    settings.sync_database_url,
+    coalesce_seconds=settings.INVALIDATION_COALESCE_SECONDS,
+    reconnect_max_seconds=settings.INVALIDATION_RECONNECT_MAX_SECONDS,
+    healthcheck_seconds=settings.INVALIDATION_HEALTHCHECK_SECONDS,
+)
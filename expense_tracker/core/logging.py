@@ -0,0 +1,209 @@
+# expense_tracker/core/logging.py
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import uuid
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from expense_tracker.core.metrics import metric_family, register_collector
+from expense_tracker.core.settings import settings
+
+# Header carrying the correlation id of a request, echoed in the response
+CORRELATION_HEADER = "x-request-id"
+CORRELATION_ID_PATTERN = re.compile(r"^[\w.:-]{1,128}$")
+SQL_LOGGER = "sqlalchemy.engine.Engine"
+
+correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed in `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Stamps records with the correlation id of the request logging them"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = correlation_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a share of the records below WARNING, per level.
+
+    Records of a request are kept or dropped together, decided by its
+    correlation id, so a sampled request's statements are all logged.
+    Levels without a rate are always kept.
+    """
+
+    def __init__(self, rates: dict[int, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno)
+        if rate is None or record.levelno >= logging.WARNING:
+            return True
+        key = correlation_id.get()
+        if key is None:
+            return random.random() < rate
+        return zlib.crc32(key.encode()) / 2 ** 32 < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with any `extra` fields included"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "correlation_id", None) is not None:
+            entry["correlation_id"] = record.correlation_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "correlation_id":
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the writer thread without formatting or waiting.
+
+    Only the message is rendered on the calling thread, since its arguments
+    may change or stop being usable once the call returns. Formatting,
+    tracebacks and I/O happen on the writer thread. When the queue is full
+    the record is dropped and counted instead of stalling the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingPipeline:
+    """Root logger handler and the background thread writing its records"""
+
+    def __init__(self, queue_size: int, formatter: logging.Formatter, stream=None):
+        self.handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.handler.addFilter(CorrelationIdFilter())
+        writer = logging.StreamHandler(stream or sys.stderr)
+        writer.setFormatter(formatter)
+        self.listener = logging.handlers.QueueListener(self.handler.queue, writer, respect_handler_level=True)
+        self._running = False
+
+    def start(self) -> None:
+        if not self._running:
+            self.listener.start()
+            self._running = True
+
+    def stop(self) -> None:
+        """Write out the queued records and stop the writer thread"""
+        if self._running:
+            self.listener.stop()
+            self._running = False
+
+    def render_metrics(self) -> list[str]:
+        return [
+            *metric_family("log_records_queued", "gauge", "Log records waiting for the writer thread", [
+                f"log_records_queued {self.handler.queue.qsize()}"
+            ]),
+            *metric_family("log_records_dropped_total", "counter", "Log records dropped on a full queue", [
+                f"log_records_dropped_total {self.handler.dropped}"
+            ]),
+        ]
+
+
+def new_formatter() -> logging.Formatter:
+    if settings.LOG_FORMAT == "json":
+        return JsonFormatter()
+    return logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(correlation_id)s] %(message)s")
+
+
+pipeline = LoggingPipeline(settings.LOG_QUEUE_SIZE, new_formatter())
+
+
+def configure_logging() -> None:
+    """
+    Route all logging through `pipeline` and set up SQL statement logging.
+
+    SQLAlchemy logs statements at INFO and result rows at DEBUG on
+    sqlalchemy.engine.Engine; below SQL_LOG_LEVEL it skips building them.
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(pipeline.handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    sql_logger = logging.getLogger(SQL_LOGGER)
+    sql_logger.setLevel(settings.SQL_LOG_LEVEL)
+    sql_logger.filters.clear()
+    sql_logger.addFilter(SamplingFilter({
+        logging.getLevelName(level): rate for level, rate in settings.SQL_LOG_SAMPLE_RATES.items()
+    }))
+    pipeline.start()
+    atexit.register(pipeline.stop)
+
+
+class CorrelationIdMiddleware:
+    """Sets the correlation id of each request from X-Request-ID or a new one"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope["headers"]:
+            if name == CORRELATION_HEADER.encode():
+                incoming = value.decode("latin-1")
+                break
+        request_id = incoming if incoming and CORRELATION_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+        token = correlation_id.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (CORRELATION_HEADER.encode(), request_id.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            correlation_id.reset(token)
+
+
+register_collector(pipeline.render_metrics)
@@ -0,0 +1,137 @@
+# expense_tracker/core/loop_monitor.py
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from expense_tracker.core.metrics import Histogram, histogram_samples, metric_family, register_collector
+from expense_tracker.core.settings import settings
+from expense_tracker.schemas.diagnostics import BlockingDetection, LoopStats
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+# Stack frames kept per detection, innermost last
+MAX_STACK_FRAMES = 40
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag and catches code blocking the loop.
+
+    A task on the loop sleeps `interval` seconds at a time and records how
+    late it wakes up. A watchdog thread checks the task's heartbeat: once
+    the loop has not run it for `threshold` seconds, the loop thread's
+    stack is captured, since whatever is on it is holding the loop. The
+    stall's duration is filled in when the loop gets going again.
+    """
+
+    def __init__(self, interval: float, threshold: float, max_detections: int = 50):
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = Histogram(LAG_BUCKETS)
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.blocked_count = 0
+        self.detections: deque[BlockingDetection] = deque(maxlen=max_detections)
+        self._heartbeat = time.monotonic()
+        self._open: Optional[BlockingDetection] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._tick(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def record(self, lag: float) -> None:
+        """Record one wake-up that came `lag` seconds late"""
+        lag = max(0.0, lag)
+        self.lag.observe(lag)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+
+    def stats(self) -> LoopStats:
+        return LoopStats(
+            interval=self.interval,
+            threshold=self.threshold,
+            last_lag=self.last_lag,
+            max_lag=self.max_lag,
+            blocked_count=self.blocked_count,
+            detections=list(reversed(self.detections)),
+        )
+
+    def render_metrics(self) -> list[str]:
+        return [
+            *metric_family(
+                "event_loop_lag_seconds", "histogram", "How late the event loop ran a timer",
+                histogram_samples("event_loop_lag_seconds", self.lag)
+            ),
+            *metric_family(
+                "event_loop_blocked_total", "counter", "Times the event loop was held past the threshold",
+                [f"event_loop_blocked_total {self.blocked_count}"]
+            ),
+        ]
+
+    async def _tick(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.record(now - expected)
+            self._heartbeat = now
+            detection = self._open
+            if detection is not None:
+                self._open = None
+                detection.duration = now - expected
+                logger.warning(
+                    "Event loop was blocked for %.3fs in:\n%s", detection.duration, "".join(detection.stack)
+                )
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.threshold / 2):
+            stalled = time.monotonic() - self._heartbeat
+            if self._open is None and stalled > self.threshold + self.interval:
+                self._capture()
+
+    def _capture(self) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        detection = BlockingDetection(
+            detected_at=datetime.now(timezone.utc),
+            stack=traceback.format_stack(frame, limit=MAX_STACK_FRAMES),
+        )
+        self.blocked_count += 1
+        self.detections.append(detection)
+        self._open = detection
+
+
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    threshold=settings.LOOP_BLOCKED_THRESHOLD_SECONDS,
+)
+register_collector(loop_monitor.render_metrics)
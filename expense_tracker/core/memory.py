@@ -0,0 +1,273 @@
+# expense_tracker/core/memory.py
+import asyncio
+import os
+import threading
+import tracemalloc
+import weakref
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+from sqlalchemy import event
+
+from expense_tracker.core.metrics import format_labels, metric_family, register_collector
+from expense_tracker.core.settings import settings
+from expense_tracker.db.session import IdentityMapWatch, identity_map_watch
+from expense_tracker.models.base import Base
+from expense_tracker.schemas.diagnostics import (
+    AllocationDiff,
+    AllocationSite,
+    MemorySample,
+    MemorySnapshotInfo,
+    MemoryStats,
+)
+
+GroupBy = Literal["lineno", "filename", "traceback"]
+
+# Allocations made by tracemalloc itself and the import machinery are noise
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def traced_bytes() -> Optional[int]:
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+
+
+def format_traceback(traceback: tracemalloc.Traceback, group_by: GroupBy) -> list[str]:
+    if group_by == "filename":
+        return [frame.filename for frame in traceback]
+    return [f"{frame.filename}:{frame.lineno}" for frame in traceback]
+
+
+class InstanceCounter:
+    """
+    Live ORM instances per model.
+
+    Instances are counted when constructed or loaded and uncounted when
+    garbage collected, so the count includes objects that outlived their
+    session, which the identity map no longer sees. Counting costs a
+    finalizer and a lock per instance, so it is only installed with
+    MEMORY_COUNT_INSTANCES.
+    """
+
+    def __init__(self):
+        self.live: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def track(self, instance) -> None:
+        name = type(instance).__name__
+        with self._lock:
+            self.live[name] += 1
+        finalizer = weakref.finalize(instance, self._collected, name)
+        finalizer.atexit = False
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            return {name: count for name, count in sorted(self.live.items()) if count}
+
+    def install(self, base: type) -> None:
+        event.listen(base, "init", self._on_init, propagate=True)
+        event.listen(base, "load", self._on_load, propagate=True)
+
+    def uninstall(self, base: type) -> None:
+        event.remove(base, "init", self._on_init)
+        event.remove(base, "load", self._on_load)
+
+    def _on_init(self, target, args, kwargs) -> None:
+        self.track(target)
+
+    def _on_load(self, target, context) -> None:
+        self.track(target)
+
+    def _collected(self, name: str) -> None:
+        # Runs wherever the garbage collector does, possibly another thread
+        with self._lock:
+            self.live[name] -= 1
+
+
+@dataclass(slots=True)
+class StoredSnapshot:
+    info: MemorySnapshotInfo
+    snapshot: tracemalloc.Snapshot
+
+
+class MemoryMonitor:
+    """
+    Memory usage of this worker.
+
+    Every `interval` seconds the RSS and live ORM instance counts are
+    sampled into a bounded history, so growth shows up without anyone
+    watching. To find where memory goes, allocation tracing can be switched
+    on and snapshots taken and compared; tracing slows down every
+    allocation, so it is off until started.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        history_size: int,
+        max_snapshots: int,
+        instances: InstanceCounter,
+        sessions: IdentityMapWatch,
+    ):
+        self.interval = interval
+        self.max_snapshots = max_snapshots
+        self.instances = instances
+        self.sessions = sessions
+        self.history: deque[MemorySample] = deque(maxlen=history_size)
+        self._snapshots: OrderedDict[int, StoredSnapshot] = OrderedDict()
+        self._next_id = 1
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._run(), name="memory-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def sample(self) -> MemorySample:
+        return MemorySample(
+            taken_at=datetime.now(timezone.utc),
+            rss_bytes=rss_bytes(),
+            traced_bytes=traced_bytes(),
+            orm_instances=self.instances.counts(),
+        )
+
+    def stats(self) -> MemoryStats:
+        return MemoryStats(
+            tracing=tracemalloc.is_tracing(),
+            current=self.sample(),
+            history=list(reversed(self.history)),
+            snapshots=[stored.info for stored in reversed(self._snapshots.values())],
+            sessions_closed=self.sessions.closed,
+            sessions_flagged=self.sessions.flagged,
+            largest_identity_map=self.sessions.largest,
+        )
+
+    def start_tracing(self, frames: int) -> None:
+        """(Re)start allocation tracing; memory allocated before is not traced"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        tracemalloc.start(frames)
+
+    def stop_tracing(self) -> None:
+        """Stop tracing and free its memory; stored snapshots are kept"""
+        tracemalloc.stop()
+
+    def take_snapshot(self) -> Optional[MemorySnapshotInfo]:
+        """Snapshot the traced allocations, None while tracing is off; blocking"""
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        info = MemorySnapshotInfo(
+            id=self._next_id,
+            taken_at=datetime.now(timezone.utc),
+            traced_bytes=tracemalloc.get_traced_memory()[0],
+            frames=snapshot.traceback_limit,
+        )
+        self._next_id += 1
+        self._snapshots[info.id] = StoredSnapshot(info, snapshot)
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+        return info
+
+    def has_snapshot(self, snapshot_id: int) -> bool:
+        return snapshot_id in self._snapshots
+
+    def delete_snapshot(self, snapshot_id: int) -> bool:
+        return self._snapshots.pop(snapshot_id, None) is not None
+
+    def top(self, snapshot_id: int, group_by: GroupBy, limit: int) -> list[AllocationSite]:
+        """Largest allocation sites of a snapshot; blocking"""
+        statistics = self._snapshots[snapshot_id].snapshot.statistics(group_by)
+        return [
+            AllocationSite(
+                traceback=format_traceback(stat.traceback, group_by),
+                size=stat.size,
+                count=stat.count,
+            )
+            for stat in statistics[:limit]
+        ]
+
+    def diff(self, snapshot_id: int, base_id: int, group_by: GroupBy, limit: int) -> list[AllocationDiff]:
+        """Allocation sites that grew or shrank most since the base snapshot; blocking"""
+        snapshot = self._snapshots[snapshot_id].snapshot
+        base = self._snapshots[base_id].snapshot
+        return [
+            AllocationDiff(
+                traceback=format_traceback(stat.traceback, group_by),
+                size=stat.size,
+                count=stat.count,
+                size_diff=stat.size_diff,
+                count_diff=stat.count_diff,
+            )
+            for stat in snapshot.compare_to(base, group_by)[:limit]
+        ]
+
+    def render_metrics(self) -> list[str]:
+        rss = rss_bytes()
+        traced = traced_bytes()
+        return [
+            *metric_family("process_resident_memory_bytes", "gauge", "Resident set size of this worker", [
+                f"process_resident_memory_bytes {rss}"
+            ] if rss is not None else []),
+            *metric_family("tracemalloc_traced_bytes", "gauge", "Memory allocated since tracing started", [
+                f"tracemalloc_traced_bytes {traced}"
+            ] if traced is not None else []),
+            *metric_family("orm_instances", "gauge", "Live ORM instances, by model", [
+                f"orm_instances{format_labels(model=name)} {count}"
+                for name, count in self.instances.counts().items()
+            ]),
+            *metric_family("db_sessions_closed_total", "counter", "Database sessions closed", [
+                f"db_sessions_closed_total {self.sessions.closed}"
+            ]),
+            *metric_family(
+                "db_sessions_flagged_total", "counter", "Sessions closed holding more objects than the threshold",
+                [f"db_sessions_flagged_total {self.sessions.flagged}"]
+            ),
+            *metric_family(
+                "db_session_identity_map_max", "gauge", "Most objects a session held when closed",
+                [f"db_session_identity_map_max {self.sessions.largest}"]
+            ),
+        ]
+
+    async def _run(self) -> None:
+        while True:
+            self.history.append(self.sample())
+            await asyncio.sleep(self.interval)
+
+
+orm_instances = InstanceCounter()
+if settings.MEMORY_COUNT_INSTANCES:
+    orm_instances.install(Base)
+
+memory_monitor = MemoryMonitor(
+    interval=settings.MEMORY_SAMPLE_SECONDS,
+    history_size=settings.MEMORY_HISTORY_SIZE,
+    max_snapshots=settings.MEMORY_MAX_SNAPSHOTS,
+    instances=orm_instances,
+    sessions=identity_map_watch,
+)
+register_collector(memory_monitor.render_metrics)
@@ -0,0 +1,287 @@
+# expense_tracker/core/metrics.py
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from expense_tracker.core.cache import cache_registry
+from expense_tracker.core.events import event_broker
+from expense_tracker.core.security import password_executor
+from expense_tracker.core.singleflight import flight_registry
+from expense_tracker.db.session import engine
+
+# Upper bounds in seconds; a final +Inf bucket is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label for requests that did not match a route, so unknown paths can not
+# grow the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+
+    Observing only increments preallocated counters. All recording happens
+    on the event loop thread, so no locks are needed.
+    """
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(le, count) pairs as exposed by Prometheus, ending with +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+class RouteMetrics:
+    """Request counters of one (method, route template) pair"""
+    __slots__ = ("latency", "db_time", "db_statements", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.db_time = Histogram()
+        self.db_statements = 0
+        self.statuses: dict[int, int] = {}
+
+
+class RequestTiming:
+    """Time spent in the database by the current request"""
+    __slots__ = ("db_time", "db_statements")
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.db_statements = 0
+
+
+current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("current_timing", default=None)
+
+
+class MetricsRegistry:
+    """Per-route request metrics of this worker process"""
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+
+    def record(
+        self, method: str, route: str, status: int, duration: float, timing: RequestTiming
+    ) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.latency.observe(duration)
+        metrics.db_time.observe(timing.db_time)
+        metrics.db_statements += timing.db_statements
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+
+metrics_registry = MetricsRegistry()
+
+
+def route_template(scope) -> str:
+    """The path template of the route that handled a request"""
+    # Newer FastAPI versions keep included routers nested, so scope["route"]
+    # only carries the path relative to its router
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    path = getattr(context, "path_format", None)
+    if path is not None:
+        return path
+    return getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and DB time per route.
+
+    Requests are labelled with the route template (e.g.
+    `/api/v1/users/{user_id}`) rather than the raw path. Streaming
+    responses are timed until their last chunk is sent.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.in_flight -= 1
+            current_timing.reset(token)
+            self.registry.record(
+                scope["method"],
+                route_template(scope),
+                status,
+                time.perf_counter() - start,
+                timing
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = current_timing.get()
+    if timing is not None:
+        timing.db_time += time.perf_counter() - context._metrics_start
+        timing.db_statements += 1
+
+
+def record_db_time(engine: AsyncEngine) -> None:
+    """Attribute the time of every statement run on engine to the current request"""
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def metric_family(name: str, kind: str, help_text: str, samples: Iterable[str]) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *samples]
+
+
+def histogram_samples(name: str, histogram: Histogram, **labels) -> list[str]:
+    samples = [
+        f"{name}_bucket{format_labels(**labels, le=le)} {count}"
+        for le, count in histogram.cumulative()
+    ]
+    samples.append(f"{name}_sum{format_labels(**labels)} {histogram.sum}")
+    samples.append(f"{name}_count{format_labels(**labels)} {histogram.count}")
+    return samples
+
+
+def render_request_metrics(registry: MetricsRegistry) -> list[str]:
+    routes = sorted(registry.routes.items())
+    return [
+        *metric_family("http_requests_in_flight", "gauge", "Requests being handled", [
+            f"http_requests_in_flight {registry.in_flight}"
+        ]),
+        *metric_family("http_requests_total", "counter", "Requests handled, by status", [
+            f"http_requests_total{format_labels(method=method, route=route, status=status)} {count}"
+            for (method, route), metrics in routes
+            for status, count in sorted(metrics.statuses.items())
+        ]),
+        *metric_family("http_request_duration_seconds", "histogram", "Request latency", [
+            sample
+            for (method, route), metrics in routes
+            for sample in histogram_samples(
+                "http_request_duration_seconds", metrics.latency, method=method, route=route)
+        ]),
+        *metric_family("http_request_db_seconds", "histogram", "Time spent in the database per request", [
+            sample
+            for (method, route), metrics in routes
+            for sample in histogram_samples(
+                "http_request_db_seconds", metrics.db_time, method=method, route=route)
+        ]),
+        *metric_family("http_request_db_statements_total", "counter", "SQL statements run by requests", [
+            f"http_request_db_statements_total{format_labels(method=method, route=route)} {metrics.db_statements}"
+            for (method, route), metrics in routes
+        ]),
+    ]
+
+
+# Functions rendering the metrics of other subsystems, e.g. the loop monitor
+_collectors: list[Callable[[], list[str]]] = []
+
+
+def register_collector(collector: Callable[[], list[str]]) -> None:
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    """All metrics of this worker in the Prometheus text format"""
+    pool = engine.pool
+    caches = [cache.stats() for cache in cache_registry.values()]
+    flights = [flight.stats() for flight in flight_registry.values()]
+    lines = [
+        *render_request_metrics(metrics_registry),
+        *metric_family("db_pool_connections", "gauge", "Database pool connections, by state", [
+            f"db_pool_connections{format_labels(state='checked_out')} {pool.checkedout()}",
+            f"db_pool_connections{format_labels(state='checked_in')} {pool.checkedin()}",
+            f"db_pool_connections{format_labels(state='overflow')} {max(0, pool.overflow())}",
+        ] if hasattr(pool, "checkedout") else []),
+        *metric_family("db_pool_size", "gauge", "Configured database pool size", [
+            f"db_pool_size {pool.size()}"
+        ] if hasattr(pool, "size") else []),
+        *metric_family("cache_lookups_total", "counter", "Reference cache lookups, by result", [
+            sample
+            for stats in caches
+            for sample in (
+                f"cache_lookups_total{format_labels(cache=stats.name, result='hit')} {stats.hits}",
+                f"cache_lookups_total{format_labels(cache=stats.name, result='miss')} {stats.misses}",
+            )
+        ]),
+        *metric_family("cache_entries", "gauge", "Reference cache size", [
+            f"cache_entries{format_labels(cache=stats.name)} {stats.size}" for stats in caches
+        ]),
+        *metric_family("cache_evictions_total", "counter", "Reference cache LRU evictions", [
+            f"cache_evictions_total{format_labels(cache=stats.name)} {stats.evictions}" for stats in caches
+        ]),
+        *metric_family("single_flight_calls_total", "counter", "Single-flight calls, by outcome", [
+            sample
+            for stats in flights
+            for sample in (
+                f"single_flight_calls_total{format_labels(flight=stats.name, outcome='executed')} {stats.executions}",
+                f"single_flight_calls_total{format_labels(flight=stats.name, outcome='coalesced')} {stats.coalesced}",
+            )
+        ]),
+        *metric_family("password_hash_in_flight", "gauge", "bcrypt calls running or queued", [
+            f"password_hash_in_flight {password_executor.in_flight}"
+        ]),
+        *metric_family("password_hash_queue_depth", "gauge", "bcrypt calls waiting for a thread", [
+            f"password_hash_queue_depth {password_executor.queue_depth}"
+        ]),
+        *metric_family("event_stream_clients", "gauge", "Connected server-sent event clients", [
+            f"event_stream_clients {event_broker.client_count}"
+        ]),
+        *metric_family("event_stream_evictions_total", "counter", "Event clients dropped for falling behind", [
+            f"event_stream_evictions_total {event_broker.evictions}"
+        ]),
+    ]
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,45 @@
+# expense_tracker/core/money.py
+from decimal import ROUND_HALF_UP, Decimal
+
+CENT = Decimal("0.01")
+
+
+def share_amount(amount: Decimal, split_percentage: Decimal) -> Decimal:
+    """
+    Amount owed for a split of an expense, rounded half up to cents.
+
+    Matches `round(amount * split_percentage / 100, 2)` in PostgreSQL so
+    ledger updates and reconciliation agree to the cent.
+    """
+    return (Decimal(amount) * Decimal(split_percentage) / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def to_minor_units(amount: Decimal) -> int:
+    """Convert an amount to an exact integer number of cents"""
+    return int((Decimal(amount) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_minor_units(units: int) -> Decimal:
+    """Convert an integer number of cents back to an amount"""
+    return (Decimal(units) / 100).quantize(CENT)
+
+
+def allocate_largest_remainder(total: int, weights: list[int]) -> list[int]:
+    """
+    Split an integer total proportionally to weights without losing units.
+
+    Every part gets the floor of its exact share, then the units left over
+    go one each to the parts with the largest fractional remainders. Ties go
+    to the earlier weight, so the allocation is deterministic.
+    """
+    if not weights or any(weight < 0 for weight in weights) or sum(weights) == 0:
+        raise ValueError("Weights must be non-negative and not all zero")
+
+    weight_sum = sum(weights)
+    parts = [total * weight // weight_sum for weight in weights]
+    remainders = [total * weight % weight_sum for weight in weights]
+    leftover = total - sum(parts)
+    by_remainder = sorted(range(len(weights)), key=lambda i: (-remainders[i], i))
+    for i in by_remainder[:leftover]:
+        parts[i] += 1
+    return parts
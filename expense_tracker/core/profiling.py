@@ -0,0 +1,247 @@
+# expense_tracker/core/profiling.py
+import asyncio
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request
+
+from expense_tracker.core.metrics import route_template
+from expense_tracker.core.settings import settings
+from expense_tracker.schemas.profiling import ProfileInfo, ProfileRule
+
+# Header that profiles a single request; its value must be the ADMIN_TOKEN
+PROFILE_HEADER = "x-profile"
+# Leaf frame of samples taken while the request was waiting on I/O or another thread
+WAITING_FRAME = "[awaiting]"
+PROFILE_SUFFIX = ".folded"
+PROFILE_NAME_PATTERN = re.compile(r"^[\w.-]+\.folded$")
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def await_chain(task: asyncio.Task) -> list:
+    """Frames of a suspended task, outermost first, following what each coroutine awaits"""
+    frames = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    return frames
+
+
+@dataclass(slots=True)
+class ProfileSession:
+    """Samples of one request, in collapsed-stack form"""
+    name: str
+    task: asyncio.Task
+    loop: asyncio.AbstractEventLoop
+    thread_id: int
+    deadline: float
+    samples: Counter = field(default_factory=Counter)
+
+    def sample(self, frames: dict) -> None:
+        if asyncio.current_task(self.loop) is self.task:
+            stack = []
+            frame = frames.get(self.thread_id)
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+        else:
+            stack = [frame_label(frame) for frame in await_chain(self.task)]
+            stack.append(WAITING_FRAME)
+        if stack:
+            self.samples[";".join(stack)] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for individual requests.
+
+    A single background thread samples every `interval` seconds while any
+    request is being profiled. When the request's task is running, the
+    event loop thread's stack is recorded; while it is suspended, the
+    task's await chain is recorded under `[awaiting]`, so time spent on
+    the database or in executor threads shows up too. Profiles are written
+    as collapsed stacks, the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, directory: str, interval: float, max_seconds: float, max_files: int):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.max_files = max_files
+        self.rules: dict[tuple[str, str], int] = {}
+        self._requests: Counter = Counter()
+        self._sessions: dict[asyncio.Task, ProfileSession] = {}
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, label: str) -> ProfileSession:
+        """Profile the current task until `stop` is called"""
+        task = asyncio.current_task()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        slug = re.sub(r"[^\w]+", "-", label).strip("-")[:80]
+        session = ProfileSession(
+            name=f"{stamp}-{slug}-{secrets.token_hex(4)}{PROFILE_SUFFIX}",
+            task=task,
+            loop=asyncio.get_running_loop(),
+            thread_id=threading.get_ident(),
+            deadline=time.monotonic() + self.max_seconds,
+        )
+        self._sessions[task] = session
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+            self._thread.start()
+        self._wakeup.set()
+        return session
+
+    def stop(self, session: ProfileSession) -> None:
+        self._sessions.pop(session.task, None)
+
+    def should_sample(self, method: str, route: str) -> bool:
+        """Whether this request is the Nth of its route since the last profiled one"""
+        every = self.rules.get((method, route))
+        if not every:
+            return False
+        self._requests[(method, route)] += 1
+        return self._requests[(method, route)] % every == 0
+
+    def save(self, session: ProfileSession) -> None:
+        """Write a profile and drop the oldest ones beyond max_files; blocking"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / session.name).write_text(session.collapsed())
+        profiles = sorted(self.directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda path: path.stat().st_mtime)
+        for path in profiles[:-self.max_files]:
+            path.unlink(missing_ok=True)
+
+    def list_profiles(self) -> list[ProfileInfo]:
+        if not self.directory.is_dir():
+            return []
+        profiles = []
+        for path in self.directory.glob(f"*{PROFILE_SUFFIX}"):
+            stat = path.stat()
+            profiles.append(ProfileInfo(
+                name=path.name,
+                size=stat.st_size,
+                created_at=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            ))
+        return sorted(profiles, key=lambda profile: profile.created_at, reverse=True)
+
+    def profile_path(self, name: str) -> Optional[Path]:
+        """Path of a stored profile, None for unknown or malformed names"""
+        if not PROFILE_NAME_PATTERN.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+    def delete_profile(self, name: str) -> bool:
+        path = self.profile_path(name)
+        if path is None:
+            return False
+        path.unlink(missing_ok=True)
+        return True
+
+    def list_rules(self) -> list[ProfileRule]:
+        return [
+            ProfileRule(method=method, route=route, every=every)
+            for (method, route), every in sorted(self.rules.items())
+        ]
+
+    def _run(self) -> None:
+        while True:
+            if not self._sessions:
+                self._wakeup.clear()
+                self._wakeup.wait()
+                continue
+            frames = sys._current_frames()
+            now = time.monotonic()
+            for session in list(self._sessions.values()):
+                if now < session.deadline:
+                    session.sample(frames)
+            del frames
+            time.sleep(self.interval)
+
+
+profiler = SamplingProfiler(
+    directory=settings.PROFILE_DIR,
+    interval=settings.PROFILE_INTERVAL_SECONDS,
+    max_seconds=settings.PROFILE_MAX_SECONDS,
+    max_files=settings.PROFILE_MAX_FILES,
+)
+
+
+@dataclass(slots=True)
+class _Slot:
+    session: Optional[ProfileSession] = None
+
+
+_current_slot: ContextVar[Optional[_Slot]] = ContextVar("current_profile_slot", default=None)
+
+
+async def profile_request(request: Request) -> None:
+    """
+    App-wide dependency deciding whether to profile a request.
+
+    Runs after routing, so sampling rules can match on the route template.
+    Profiling stops in `ProfilingMiddleware` once the response is sent.
+    """
+    slot = _current_slot.get()
+    if slot is None or slot.session is not None:
+        return
+    method, route = request.method, route_template(request.scope)
+    token = request.headers.get(PROFILE_HEADER)
+    requested = token is not None and settings.ADMIN_TOKEN is not None \
+        and secrets.compare_digest(token, settings.ADMIN_TOKEN)
+    if requested or profiler.should_sample(method, route):
+        slot.session = profiler.start(f"{method} {route}")
+
+
+class ProfilingMiddleware:
+    """Stops and stores profiles started by `profile_request`"""
+
+    def __init__(self, app, profiler: SamplingProfiler = profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        slot = _Slot()
+        token = _current_slot.set(slot)
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start" and slot.session is not None:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-name", slot.session.name.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current_slot.reset(token)
+            if slot.session is not None:
+                self.profiler.stop(slot.session)
+                await asyncio.to_thread(self.profiler.save, slot.session)
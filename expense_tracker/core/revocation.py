@@ -0,0 +1,104 @@
+# expense_tracker/core/revocation.py
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.bloom import BloomFilter
+from expense_tracker.core.settings import settings
+from expense_tracker.models.token import RevokedToken
+
+# Re-read rows revoked slightly before the watermark so revocations from
+# transactions that committed late are not missed. Re-adding is harmless.
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationFilter:
+    """
+    Per-worker Bloom filter over the revoked token table.
+
+    A miss answers "definitely not revoked" without I/O. Only possible hits
+    fall through to the authoritative `revoked_token` table. The filter is
+    topped up incrementally from the table every `sync_interval` seconds and
+    rebuilt from scratch every `rebuild_interval` seconds (or when it fills
+    up) to drop expired rows, since Bloom filters cannot delete.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+        rebuild_interval: float,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._watermark: datetime | None = None
+        self._last_sync = float("-inf")
+        self._last_rebuild = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def add(self, jti: str) -> None:
+        """Record a revocation made by this worker without waiting for a sync"""
+        self._bloom.add(jti)
+
+    async def is_revoked(self, db: AsyncSession, jti: str) -> bool:
+        await self.sync(db)
+        if jti not in self._bloom:
+            return False
+        result = await db.execute(
+            select(exists().where(RevokedToken.jti == jti))
+        )
+        return bool(result.scalar())
+
+    async def sync(self, db: AsyncSession, *, force: bool = False) -> None:
+        """Load revocations newer than the watermark, rebuilding when due"""
+        if not force and time.monotonic() - self._last_sync < self.sync_interval:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_sync < self.sync_interval:
+                return
+
+            rebuild = (
+                self._watermark is None
+                or self._bloom.is_saturated
+                or now - self._last_rebuild >= self.rebuild_interval
+            )
+            query = select(RevokedToken.jti, RevokedToken.created_at).where(
+                RevokedToken.expires_at > datetime.now(timezone.utc)
+            )
+            if not rebuild:
+                query = query.where(
+                    RevokedToken.created_at >= self._watermark - WATERMARK_OVERLAP
+                )
+            rows = (await db.execute(query)).all()
+
+            bloom = BloomFilter(max(self.capacity, len(rows) * 2), self.error_rate) \
+                if rebuild else self._bloom
+            for jti, created_at in rows:
+                bloom.add(jti)
+                if self._watermark is None or created_at > self._watermark:
+                    self._watermark = created_at
+
+            if rebuild:
+                self._bloom = bloom
+                self._last_rebuild = now
+                if self._watermark is None:
+                    self._watermark = datetime.now(timezone.utc)
+            self._last_sync = now
+
+
+revocation_filter = RevocationFilter(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    sync_interval=settings.REVOCATION_SYNC_SECONDS,
+    rebuild_interval=settings.REVOCATION_REBUILD_SECONDS,
+)
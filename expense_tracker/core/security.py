@@ -1,6 +1,10 @@
 # expense_tracker/core/security.py
+import asyncio
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Annotated, Any
+from typing import Annotated, Any, Callable, TypeVar
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -9,16 +13,22 @@ from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from expense_tracker.core.auth_cache import auth_user_cache
+from expense_tracker.core.revocation import revocation_filter
 from expense_tracker.core.settings import settings
 from expense_tracker.db.session import get_session
 from expense_tracker.models.user import User
 from expense_tracker.schemas.token import TokenPayload
+from expense_tracker.schemas.user import AuthenticatedUser
+
+logger = logging.getLogger(__name__)
 
 # to get a string like this run:
 # openssl rand -hex 32
 SECRET_KEY = "your-secret-key-here"  # Change this!
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = 14
 
 # Configure password hashing
 pwd_context = CryptContext(
@@ -27,6 +37,39 @@ pwd_context = CryptContext(
     bcrypt__rounds=12  # You can adjust this for security vs. speed
 )
 
+T = TypeVar("T")
+
+
+class PasswordHashExecutor:
+    """
+    Thread pool for bcrypt, which would otherwise block the event loop.
+
+    Work is counted on the event loop thread only, so the counters need no
+    locks. Calls beyond `max_workers` wait in the pool's queue.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.in_flight = 0
+        self.completed = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls submitted but not yet picked up by a worker thread"""
+        return max(0, self.in_flight - self.max_workers)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+
+password_executor = PasswordHashExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
@@ -37,7 +80,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         return pwd_context.verify(plain_password, hashed_password)
     except Exception as e:
-        print(f"Error verifying password: {str(e)}")
+        logger.error("Error verifying password: %s", e)
         return False
 
 
@@ -45,16 +88,38 @@ def get_password_hash(password: str) -> str:
     """Generate a password hash."""
     try:
         return pwd_context.hash(password)
-    except Exception as e:
-        print(f"Error hashing password: {str(e)}")
+    except Exception:
+        logger.exception("Error hashing password")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error processing password"
         )
 
 
+async def verify_password_async(plain_password: str, hashed_password: str | None) -> bool:
+    """
+    Verify a password against a hash without blocking the event loop.
+
+    Without a hash a dummy one is checked and False returned, taking as
+    long as a real check, so responses do not reveal which accounts exist.
+    """
+    if hashed_password is None:
+        await password_executor.run(pwd_context.dummy_verify)
+        return False
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate a password hash without blocking the event loop."""
+    return await password_executor.run(get_password_hash, password)
+
+
 def create_access_token(
-    subject: str | Any, expires_delta: timedelta | None = None
+    subject: str | Any,
+    expires_delta: timedelta | None = None,
+    *,
+    token_version: int = 0,
+    extra_claims: dict[str, Any] | None = None
 ) -> str:
     """Create a JWT access token."""
     if expires_delta:
@@ -62,22 +127,97 @@ def create_access_token(
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {
+        **(extra_claims or {}),
+        "exp": expire,
+        "sub": str(subject),
+        "ver": token_version,
+        "jti": uuid.uuid4().hex,
+        "typ": "access",
+    }
     try:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
-    except Exception as e:
-        print(f"Error creating access token: {str(e)}")
+    except Exception:
+        logger.exception("Error creating access token")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error creating access token"
         )
 
 
+def create_refresh_token(
+    subject: str | Any, jti: str, family_id: uuid.UUID, expire: datetime
+) -> str:
+    """Create a JWT refresh token belonging to a rotation family."""
+    to_encode = {
+        "exp": expire,
+        "sub": str(subject),
+        "jti": jti,
+        "fam": str(family_id),
+        "typ": "refresh",
+    }
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def create_user_access_token(user: User, expires_delta: timedelta | None = None) -> str:
+    """Create an access token for a user, signing identity claims if they are trusted."""
+    extra_claims = None
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        extra_claims = {"email": user.email, "username": user.username}
+    return create_access_token(
+        user.id,
+        expires_delta,
+        token_version=user.token_version,
+        extra_claims=extra_claims
+    )
+
+
+async def get_user_for_token(
+    db: AsyncSession, token_data: TokenPayload
+) -> AuthenticatedUser | None:
+    """
+    Resolve the user a validated token belongs to.
+
+    Revoked tokens are rejected first; the revocation filter only touches
+    the database for possible hits. Signed identity claims are then used
+    as-is when trusted, otherwise the auth cache is consulted before falling
+    back to a single primary key lookup. Returns None when the token is not
+    an access token, was revoked, or its user is gone or has a newer token
+    version.
+    """
+    user_id = uuid.UUID(token_data.sub)
+    if token_data.typ != "access":
+        return None
+    if token_data.jti and await revocation_filter.is_revoked(db, token_data.jti):
+        return None
+
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and token_data.email and token_data.username:
+        return AuthenticatedUser(
+            id=user_id,
+            email=token_data.email,
+            username=token_data.username,
+            token_version=token_data.ver
+        )
+
+    cached = auth_user_cache.get(user_id, token_data.ver)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is None or user.token_version != token_data.ver:
+        return None
+
+    authenticated = AuthenticatedUser.model_validate(user)
+    auth_user_cache.set(authenticated)
+    return authenticated
+
+
 async def get_current_user(
     db: Annotated[AsyncSession, Depends(get_session)],
     token: Annotated[str, Depends(oauth2_scheme)]
-) -> User:
+) -> AuthenticatedUser:
     """Get the current user from the JWT token."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -91,20 +231,17 @@ async def get_current_user(
         if token_data.sub is None:
             raise credentials_exception
     except JWTError as e:
-        print(f"JWT Error: {str(e)}")
+        logger.info("Rejected token: %s", e)
         raise credentials_exception
     except Exception as e:
-        print(f"Unexpected error in token validation: {str(e)}")
+        logger.warning("Unexpected error in token validation: %s", e)
         raise credentials_exception
 
     try:
-        result = await db.execute(
-            select(User).where(User.id == int(token_data.sub))
-        )
-        user = result.scalar_one_or_none()
-        if user is None:
-            raise credentials_exception
-        return user
-    except Exception as e:
-        print(f"Database error in get_current_user: {str(e)}")
+        user = await get_user_for_token(db, token_data)
+    except Exception:
+        logger.exception("Database error in get_current_user")
+        raise credentials_exception
+    if user is None:
         raise credentials_exception
+    return user
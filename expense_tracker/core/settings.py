@@ -1,5 +1,5 @@
 # expense_tracker/core/settings.py
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -23,6 +23,124 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = Field(default="expense_tracker")
     DATABASE_URL: Optional[str] = None
 
+    # Auth settings
+    AUTH_CACHE_TTL_SECONDS: float = Field(default=30.0)  # 0 disables the cache
+    AUTH_CACHE_MAX_SIZE: int = Field(default=10_000)
+    # Trust identity claims signed into the token and skip the user lookup.
+    # Deactivation then only takes effect once outstanding tokens expire.
+    AUTH_TRUST_TOKEN_CLAIMS: bool = Field(default=False)
+    PASSWORD_HASH_WORKERS: int = Field(default=4)  # Threads running bcrypt
+    # Static token for operational endpoints, disabled when unset
+    ADMIN_TOKEN: Optional[str] = None
+
+    # Token revocation settings
+    REVOCATION_BLOOM_CAPACITY: int = Field(default=100_000)
+    REVOCATION_BLOOM_ERROR_RATE: float = Field(default=0.001)
+    REVOCATION_SYNC_SECONDS: float = Field(default=5.0)
+    REVOCATION_REBUILD_SECONDS: float = Field(default=3600.0)
+
+    # Reference data (user, category) cache settings
+    REFERENCE_CACHE_TTL_SECONDS: float = Field(default=300.0)  # 0 disables the cache
+    REFERENCE_CACHE_MAX_SIZE: int = Field(default=10_000)
+
+    # Filter-based bulk expense updates and deletes refuse to touch more rows
+    EXPENSE_BULK_MAX_ROWS: int = Field(default=5_000)
+
+    # POST requests sent with an Idempotency-Key header run once; retries
+    # with the same key get the stored response
+    IDEMPOTENCY_ENABLED: bool = Field(default=True)
+    IDEMPOTENCY_TTL_SECONDS: float = Field(default=86_400.0)  # How long a key is remembered
+    IDEMPOTENCY_CACHE_SIZE: int = Field(default=1_000)  # Responses kept in memory per worker
+    IDEMPOTENCY_MAX_BODY_BYTES: int = Field(default=65_536)  # Larger responses are not stored
+    # A key whose request has not finished after this long is considered abandoned
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: float = Field(default=60.0)
+    # Paths (fnmatch patterns) that ignore the header; their responses carry credentials
+    IDEMPOTENCY_EXCLUDED_PATHS: list[str] = Field(default=["/api/v1/auth/*"])
+
+    # Prometheus metrics served at /metrics
+    METRICS_ENABLED: bool = Field(default=True)
+
+    # Request tracing, reported in the Server-Timing header and exported
+    # to memory (GET /api/v1/admin/traces) or a JSON lines file
+    TRACING_ENABLED: bool = Field(default=False)
+    TRACING_EXPORTER: Literal["memory", "file"] = Field(default="memory")
+    TRACING_FILE: str = Field(default="traces.jsonl")
+    TRACING_BUFFER_SIZE: int = Field(default=200)  # Traces kept in memory
+
+    # On-demand request profiling, see GET /api/v1/admin/profiles
+    PROFILING_ENABLED: bool = Field(default=True)
+    PROFILE_DIR: str = Field(default="profiles")
+    PROFILE_INTERVAL_SECONDS: float = Field(default=0.005)
+    PROFILE_MAX_SECONDS: float = Field(default=30.0)  # Longer requests are only sampled this long
+    PROFILE_MAX_FILES: int = Field(default=100)  # Older profiles are deleted
+
+    # Event loop lag monitor; stacks of code holding the loop longer than
+    # the threshold are logged and listed at GET /api/v1/admin/loop
+    LOOP_MONITOR_ENABLED: bool = Field(default=True)
+    LOOP_MONITOR_INTERVAL_SECONDS: float = Field(default=0.05)
+    LOOP_BLOCKED_THRESHOLD_SECONDS: float = Field(default=0.1)
+
+    # Admission control. Requests past a per-client limit are refused with
+    # 429, requests the server has no room for with 503, both with Retry-After.
+    # Routes are matched as "METHOD /route" with fnmatch patterns.
+    ADMISSION_ENABLED: bool = Field(default=True)
+    ADMISSION_EXEMPT_ROUTES: list[str] = Field(default=["* /api/v1/admin/*", "GET /metrics", "GET /health"])
+    ADMISSION_ROUTE_CONCURRENCY: int = Field(default=64)  # In-flight requests per route
+    ADMISSION_ROUTE_LIMITS: dict[str, int] = Field(default={"GET /api/v1/events/stream": 1000})
+    # Expensive routes, shed first and limited together
+    ADMISSION_LOW_PRIORITY_ROUTES: list[str] = Field(default=[
+        "POST /api/v1/expenses/batch",
+        "POST /api/v1/expenses/bulk-*",
+        "POST /api/v1/balances/reconcile",
+        "POST /api/v1/balances/settlement-plan",
+        "* */analytics*",
+        "* */export*",
+    ])
+    ADMISSION_LOW_PRIORITY_CONCURRENCY: int = Field(default=4)
+    # Per user, or per client address for anonymous requests
+    ADMISSION_USER_CONCURRENCY: int = Field(default=16)
+    ADMISSION_USER_RATE: float = Field(default=20.0)  # Requests per second
+    ADMISSION_USER_BURST: int = Field(default=40)
+    ADMISSION_MAX_TRACKED_CLIENTS: int = Field(default=10_000)  # Least recently seen are forgotten
+    # Low priority requests are shed once the average pool wait or the loop
+    # lag passes its threshold, all requests at twice the threshold
+    ADMISSION_POOL_WAIT_SECONDS: float = Field(default=0.1)
+    ADMISSION_LOOP_LAG_SECONDS: float = Field(default=0.2)
+    ADMISSION_RETRY_AFTER_SECONDS: float = Field(default=1.0)
+
+    # Logging; records are written by a background thread
+    LOG_LEVEL: str = Field(default="INFO")
+    LOG_FORMAT: Literal["json", "text"] = Field(default="json")
+    LOG_QUEUE_SIZE: int = Field(default=10_000)  # Records beyond this are dropped, not waited for
+    # SQL statements are logged at INFO, result rows at DEBUG. Each rate is
+    # the share of requests whose records of that level are kept.
+    SQL_LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING"] = Field(default="WARNING")
+    SQL_LOG_SAMPLE_RATES: dict[str, float] = Field(default={"INFO": 0.01, "DEBUG": 0.001})
+
+    # Memory introspection, see GET /api/v1/admin/memory
+    MEMORY_SAMPLE_SECONDS: float = Field(default=60.0)  # RSS and ORM instance counts; 0 disables
+    # Count live ORM instances per model; adds a weakref finalizer to every instance
+    MEMORY_COUNT_INSTANCES: bool = Field(default=False)
+    MEMORY_HISTORY_SIZE: int = Field(default=180)  # Samples kept
+    MEMORY_MAX_SNAPSHOTS: int = Field(default=10)  # Older tracemalloc snapshots are dropped
+    # Sessions still holding more ORM objects than this when closed are logged
+    IDENTITY_MAP_WARN_SIZE: int = Field(default=10_000)
+
+    # Cross-worker cache invalidation over LISTEN/NOTIFY
+    INVALIDATION_BUS_ENABLED: bool = Field(default=True)
+    INVALIDATION_COALESCE_SECONDS: float = Field(default=0.05)  # Batch bursts of changes
+    INVALIDATION_RECONNECT_MAX_SECONDS: float = Field(default=30.0)
+    INVALIDATION_HEALTHCHECK_SECONDS: float = Field(default=10.0)
+
+    # Server-sent change events
+    EVENTS_CLIENT_BUFFER_SIZE: int = Field(default=100)  # Slower clients are disconnected
+    EVENTS_KEEPALIVE_SECONDS: float = Field(default=15.0)
+
+    # Delta sync settings
+    # Rows committed by transactions running longer than this can be missed
+    SYNC_SAFETY_LAG_SECONDS: float = Field(default=5.0)
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = Field(default=30)
+
     @property
     def sync_database_url(self) -> str:
         if self.DATABASE_URL:
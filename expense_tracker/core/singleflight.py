@@ -0,0 +1,99 @@
+# expense_tracker/core/singleflight.py
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+from expense_tracker.schemas.cache import SingleFlightStats
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class _Call(Generic[T]):
+    task: "asyncio.Task[T]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces identical concurrent reads into one execution.
+
+    While a call for a key is in flight, further calls with the same key
+    wait for its result instead of running their own. The shared work runs
+    in its own task: a caller that times out or is cancelled only stops
+    waiting, and the work is cancelled once nobody waits for it anymore.
+    Results and exceptions are shared between all callers, so results must
+    be treated as read-only. Functions must not use a caller's request
+    scoped resources (e.g. its DB session), since that caller may leave
+    before the work is done.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, _Call[T]] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.cancellations = 0
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[T]], *, timeout: Optional[float] = None
+    ) -> T:
+        """Return fn(), sharing the execution with concurrent calls for key"""
+        self.calls += 1
+        call = self._calls.get(key)
+        if call is None:
+            self.executions += 1
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(call.task), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except asyncio.CancelledError:
+            if not call.task.cancelled():
+                self.cancellations += 1
+            raise
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is interested in the result anymore
+                call.task.cancel()
+                self._forget(key, call)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(
+            name=self.name,
+            in_flight=self.in_flight,
+            calls=self.calls,
+            executions=self.executions,
+            coalesced=self.coalesced,
+            timeouts=self.timeouts,
+            cancellations=self.cancellations,
+        )
+
+    def _forget(self, key: Hashable, call: _Call[T]) -> None:
+        # A newer call may already have replaced a cancelled one
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+flight_registry: dict[str, SingleFlight[Any]] = {}
+
+
+def register_flight(name: str) -> SingleFlight[Any]:
+    """Create a single-flight group and register it for stats"""
+    flight: SingleFlight[Any] = SingleFlight(name)
+    flight_registry[name] = flight
+    return flight
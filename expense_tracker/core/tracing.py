@@ -0,0 +1,282 @@
+# expense_tracker/core/tracing.py
+import functools
+import inspect
+import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional, Protocol
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from expense_tracker.core.metrics import route_template
+from expense_tracker.core.settings import settings
+
+# W3C trace context: version-trace_id-parent_id-flags
+TRACEPARENT_PATTERN = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# Statement text kept on DB spans
+MAX_STATEMENT_LENGTH = 500
+# Spans beyond this are counted but not kept, e.g. for very large batches
+MAX_SPANS_PER_TRACE = 1000
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    kind: str  # "http", "service" or "db"
+    trace: "Trace"
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    end: Optional[float] = None
+    attributes: Optional[dict[str, Any]] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+@dataclass(slots=True)
+class Trace:
+    """The spans of one request, in the order they were opened"""
+    trace_id: str
+    started_at: float  # Wall clock, for exporters
+    spans: list[Span] = field(default_factory=list)
+    dropped: int = 0
+    finished: bool = False
+
+    def open(
+        self, name: str, kind: str, parent: Optional[Span], attributes: Optional[dict[str, Any]] = None
+    ) -> Span:
+        span = Span(
+            name=name,
+            kind=kind,
+            trace=self,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent is not None else None,
+            start=time.perf_counter(),
+            attributes=attributes,
+        )
+        if not self.finished:  # Spans of tasks outliving the request are not kept
+            if len(self.spans) < MAX_SPANS_PER_TRACE:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+        return span
+
+    def to_record(self) -> dict:
+        origin = self.spans[0].start if self.spans else 0.0
+        return {
+            "trace_id": self.trace_id,
+            "started_at": self.started_at,
+            "dropped": self.dropped,
+            "spans": [
+                {
+                    "name": span.name,
+                    "kind": span.kind,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "start_ms": round((span.start - origin) * 1000, 3),
+                    "duration_ms": round(span.duration * 1000, 3),
+                    "attributes": span.attributes or {},
+                }
+                for span in self.spans
+            ],
+        }
+
+
+# The innermost open span; asyncio tasks inherit it from the task creating them
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(name: str, kind: str = "service", **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time a block as a child of the current span; a no-op outside a traced request"""
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.trace.open(name, kind, parent, attributes or None)
+    token = current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.end = time.perf_counter()
+        current_span.reset(token)
+
+
+def traced(cls):
+    """Class decorator opening a span around each public coroutine method"""
+    for attribute, method in list(vars(cls).items()):
+        if attribute.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, attribute, _traced_method(f"{cls.__name__}.{attribute}", method))
+    return cls
+
+
+def _traced_method(name: str, method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if current_span.get() is None:
+            return await method(*args, **kwargs)
+        with span(name):
+            return await method(*args, **kwargs)
+    return wrapper
+
+
+def server_timing(trace: Trace) -> str:
+    """
+    Summary of a trace for the Server-Timing header.
+
+    Service time only counts outermost service calls so nested calls are
+    not counted twice. Whatever total leaves unexplained went to routing,
+    validation, dependencies and serialization.
+    """
+    root = trace.spans[0]
+    kinds = {s.span_id: s.kind for s in trace.spans}
+    service = sum(
+        s.duration for s in trace.spans
+        if s.kind == "service" and kinds.get(s.parent_id) != "service"
+    )
+    db_spans = [s for s in trace.spans if s.kind == "db"]
+    db = sum(s.duration for s in db_spans)
+    return (
+        f'total;dur={root.duration * 1000:.1f}, '
+        f'service;dur={service * 1000:.1f}, '
+        f'db;dur={db * 1000:.1f};desc="{len(db_spans)} queries"'
+    )
+
+
+class SpanExporter(Protocol):
+    def export(self, trace: Trace) -> None: ...
+
+
+class MemoryExporter:
+    """Keeps the most recent traces for the admin endpoint"""
+
+    def __init__(self, max_traces: int):
+        self.traces: deque[dict] = deque(maxlen=max_traces)
+
+    def export(self, trace: Trace) -> None:
+        self.traces.append(trace.to_record())
+
+    def recent(self, limit: int) -> list[dict]:
+        return list(self.traces)[-limit:][::-1]
+
+
+class FileExporter:
+    """Appends traces as JSON lines to a file, from a background thread"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: queue.SimpleQueue[dict] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        self._queue.put(trace.to_record())
+
+    def _write(self) -> None:
+        with open(self.path, "a", buffering=1) as file:
+            while True:
+                file.write(json.dumps(self._queue.get()) + "\n")
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a root span per request.
+
+    Continues the trace of an incoming `traceparent` header, adds a
+    `Server-Timing` header to the response and hands finished traces to
+    the exporter.
+    """
+
+    def __init__(self, app, exporter: SpanExporter, server_timing_header: bool = True):
+        self.app = app
+        self.exporter = exporter
+        self.server_timing_header = server_timing_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_id = None, None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                match = TRACEPARENT_PATTERN.match(value.decode("latin-1"))
+                if match:
+                    trace_id, parent_id = match.groups()
+                break
+        trace = Trace(trace_id=trace_id or os.urandom(16).hex(), started_at=time.time())
+        root = trace.open(f"{scope['method']} {scope['path']}", "http", None)
+        root.parent_id = parent_id
+        token = current_span.set(root)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and self.server_timing_header:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", server_timing(trace).encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            root.end = time.perf_counter()
+            root.name = f"{scope['method']} {route_template(scope)}"
+            trace.finished = True
+            current_span.reset(token)
+            self.exporter.export(trace)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span.get()
+    if parent is not None:
+        context._trace_span = parent.trace.open(
+            f"db {statement.split(None, 1)[0].upper() if statement else ''}".rstrip(),
+            "db",
+            parent,
+            {"statement": statement[:MAX_STATEMENT_LENGTH], "executemany": executemany},
+        )
+
+
+def _end_db_span(context) -> None:
+    db_span = getattr(context, "_trace_span", None)
+    if db_span is not None:
+        db_span.end = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _end_db_span(context)
+
+
+def _handle_error(exception_context):
+    if exception_context.execution_context is not None:
+        _end_db_span(exception_context.execution_context)
+
+
+def trace_statements(engine: AsyncEngine) -> None:
+    """Open a span for every statement run on engine within a traced request"""
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def create_exporter() -> SpanExporter:
+    if settings.TRACING_ENABLED and settings.TRACING_EXPORTER == "file":
+        return FileExporter(settings.TRACING_FILE)
+    return MemoryExporter(settings.TRACING_BUFFER_SIZE)
+
+
+trace_exporter = create_exporter()
@@ -1,18 +1,106 @@
 # expense_tracker/db/session.py
-from typing import AsyncGenerator
+import logging
+import time
+from collections import Counter
+from typing import AsyncGenerator, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from expense_tracker.core.settings import settings
 
-engine = create_async_engine(
-    settings.async_database_url,
-    echo=True
-)
+logger = logging.getLogger(__name__)
+
+
+class IdentityMapWatch:
+    """
+    Flags sessions that still hold many ORM objects when they are closed.
+
+    The identity map only keeps objects that are referenced elsewhere, so
+    a large one at close means a request kept that many rows alive at once,
+    e.g. a list endpoint materialising a whole table.
+    """
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.closed = 0
+        self.flagged = 0
+        self.largest = 0
+
+    def check(self, session: Session) -> None:
+        size = len(session.identity_map)
+        self.closed += 1
+        self.largest = max(self.largest, size)
+        if size > self.threshold:
+            self.flagged += 1
+            classes = Counter(type(instance).__name__ for instance in session.identity_map.values())
+            logger.warning(
+                "Session closed holding %d objects: %s",
+                size, ", ".join(f"{name}={count}" for name, count in classes.most_common())
+            )
+
+
+identity_map_watch = IdentityMapWatch(settings.IDENTITY_MAP_WARN_SIZE)
+
+
+class WatchedSession(Session):
+    """Session reporting its identity map size to `identity_map_watch` on close"""
+
+    def close(self) -> None:
+        identity_map_watch.check(self)
+        super().close()
+
+
+class PoolWaitTracker:
+    """
+    How long getting a pooled connection took, as a moving average.
+
+    The average decays towards zero by half every `half_life` seconds
+    without checkouts, so it recovers once load is shed.
+    """
+
+    def __init__(self, half_life: float, weight: float = 0.2):
+        self.half_life = half_life
+        self.weight = weight
+        self.count = 0
+        self.total = 0.0
+        self._average = 0.0
+        self._updated = time.monotonic()
+
+    def observe(self, seconds: float) -> None:
+        now = time.monotonic()
+        average = self.current(now)
+        self._average = average + (seconds - average) * self.weight
+        self._updated = now
+        self.count += 1
+        self.total += seconds
+
+    def current(self, now: Optional[float] = None) -> float:
+        elapsed = (now or time.monotonic()) - self._updated
+        return self._average * 0.5 ** (elapsed / self.half_life)
+
+
+pool_wait = PoolWaitTracker(half_life=5.0)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool recording the time of each checkout in `pool_wait`"""
+
+    def _do_get(self):
+        started = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.observe(time.monotonic() - started)
+
+
+# Statements are logged through the sqlalchemy.engine logger, see core/logging.py
+engine = create_async_engine(settings.async_database_url, poolclass=TimedQueuePool)
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=WatchedSession,
     autocommit=False,
     autoflush=False,
     expire_on_commit=False
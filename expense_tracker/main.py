@@ -1,16 +1,70 @@
 # expense_tracker/main.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from expense_tracker.api.v1.endpoints import users
+from expense_tracker.api.v1.endpoints import (
+    admin,
+    auth,
+    balances,
+    categories,
+    events,
+    expenses,
+    groups,
+    shared_expenses,
+    sync,
+    users,
+)
+from expense_tracker.core.admission import admit_request
+from expense_tracker.core.cache import subscribe_caches
+from expense_tracker.core.events import subscribe_events
+from expense_tracker.core.idempotency import IdempotencyMiddleware
+from expense_tracker.core.invalidation import invalidation_bus
+from expense_tracker.core.logging import CorrelationIdMiddleware, configure_logging
+from expense_tracker.core.loop_monitor import loop_monitor
+from expense_tracker.core.memory import memory_monitor
+from expense_tracker.core.metrics import MetricsMiddleware, record_db_time, render_metrics
+from expense_tracker.core.profiling import ProfilingMiddleware, profile_request
 from expense_tracker.core.settings import settings
+from expense_tracker.core.tracing import TracingMiddleware, trace_exporter, trace_statements
+from expense_tracker.db.session import engine
+
+configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep this worker's caches and event streams in step with writes made by any worker
+    if settings.INVALIDATION_BUS_ENABLED:
+        subscribe_caches(invalidation_bus)
+        subscribe_events(invalidation_bus)
+        await invalidation_bus.start()
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    memory_monitor.start()
+    yield
+    await memory_monitor.stop()
+    await loop_monitor.stop()
+    await invalidation_bus.stop()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="API for tracking personal and shared expenses",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
+    # Admission runs first, so refused requests are neither profiled nor given a session
+    dependencies=[
+        *([Depends(admit_request)] if settings.ADMISSION_ENABLED else []),
+        *([Depends(profile_request)] if settings.PROFILING_ENABLED else []),
+    ]
 )
 
+if settings.IDEMPOTENCY_ENABLED:
+    # Innermost, so replayed responses still pass through CORS
+    app.add_middleware(IdempotencyMiddleware)
 # CORS middleware configuration
 app.add_middleware(
     CORSMiddleware,
@@ -19,13 +73,68 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware, exporter=trace_exporter)
+    trace_statements(engine)
+app.add_middleware(CorrelationIdMiddleware)
+if settings.METRICS_ENABLED:
+    # Outermost, so time spent in other middleware is counted too
+    app.add_middleware(MetricsMiddleware)
+    record_db_time(engine)
 
 # Include routers
+app.include_router(
+    auth.router,
+    prefix=f"{settings.API_V1_STR}/auth",
+    tags=["auth"]
+)
 app.include_router(
     users.router,
     prefix=f"{settings.API_V1_STR}/users",
     tags=["users"]
 )
+app.include_router(
+    categories.router,
+    prefix=f"{settings.API_V1_STR}/categories",
+    tags=["categories"]
+)
+app.include_router(
+    expenses.router,
+    prefix=f"{settings.API_V1_STR}/expenses",
+    tags=["expenses"]
+)
+app.include_router(
+    shared_expenses.router,
+    prefix=f"{settings.API_V1_STR}/shared-expenses",
+    tags=["shared-expenses"]
+)
+app.include_router(
+    balances.router,
+    prefix=f"{settings.API_V1_STR}/balances",
+    tags=["balances"]
+)
+app.include_router(
+    groups.router,
+    prefix=f"{settings.API_V1_STR}/groups",
+    tags=["groups"]
+)
+app.include_router(
+    sync.router,
+    prefix=f"{settings.API_V1_STR}/sync",
+    tags=["sync"]
+)
+app.include_router(
+    events.router,
+    prefix=f"{settings.API_V1_STR}/events",
+    tags=["events"]
+)
+app.include_router(
+    admin.router,
+    prefix=f"{settings.API_V1_STR}/admin",
+    tags=["admin"]
+)
 
 
 @app.get("/health")
@@ -33,6 +142,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Request, database pool, cache and executor metrics of this worker, for Prometheus"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Expense Tracker API"}
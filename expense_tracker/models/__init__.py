@@ -1,7 +1,13 @@
 # expense_tracker/models/__init__.py
+from .balance import UserBalance
 from .category import Category
 from .expense import Expense
+from .group import Group, GroupMember
+from .idempotency import IdempotencyKey
+from .inbox import InboxCounter
 from .shared_expense import SharedExpense, SharedExpenseStatus
+from .token import RefreshToken, RevokedToken
+from .tombstone import Tombstone
 from .user import User
 
 __all__ = [
@@ -9,5 +15,13 @@ __all__ = [
     "Category",
     "Expense",
     "SharedExpense",
-    "SharedExpenseStatus"
+    "SharedExpenseStatus",
+    "RevokedToken",
+    "RefreshToken",
+    "UserBalance",
+    "InboxCounter",
+    "Group",
+    "GroupMember",
+    "Tombstone",
+    "IdempotencyKey",
 ]
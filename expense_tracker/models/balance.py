@@ -0,0 +1,62 @@
+# expense_tracker/models/balance.py
+import uuid
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import CheckConstraint, ForeignKey, Index, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base, TimestampMixin
+
+if TYPE_CHECKING:
+    # Import only for type checking to avoid circular dependencies
+    from .user import User
+
+
+class UserBalance(Base, TimestampMixin):
+    """
+    UserBalance model, the ledger of net balances between pairs of users.
+
+    Each pair is stored once with user_a_id < user_b_id. A positive amount
+    means user_b owes user_a, a negative amount means user_a owes user_b.
+    Rows are maintained by the shared expense service in the same transaction
+    as the shared expense change and can be rebuilt from source with
+    `LedgerService.reconcile`.
+
+    Columns:
+        id (UUID): Primary key
+        user_a_id (UUID): The lower user id of the pair
+        user_b_id (UUID): The higher user id of the pair
+        amount (Decimal): Net amount user_b owes user_a
+        created_at (datetime): When the pair was first recorded
+        updated_at (datetime): When the balance last changed
+
+    Relationships:
+        user_a: The lower user of the pair
+        user_b: The higher user of the pair
+    """
+    __tablename__ = "user_balance"
+    __table_args__ = (
+        UniqueConstraint("user_a_id", "user_b_id", name="uq_user_balance_pair"),
+        CheckConstraint("user_a_id < user_b_id", name="ck_user_balance_ordered_pair"),
+        # Lookups of all balances of one user hit either side of the pair
+        Index("ix_user_balance_user_b_id", "user_b_id"),
+    )
+
+    user_a_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    user_b_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    amount: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=Decimal("0.00")
+    )
+
+    # Relationships
+    user_a: Mapped["User"] = relationship(foreign_keys=[user_a_id])
+    user_b: Mapped["User"] = relationship(foreign_keys=[user_b_id])
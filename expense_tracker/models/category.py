@@ -2,7 +2,7 @@
 import uuid
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -31,6 +31,10 @@ class Category(Base, TimestampMixin):
         user: The user who created this category (if any)
         expenses: All expenses in this category
     """
+    __table_args__ = (
+        # Serves delta sync: the changes of one user (or system categories) since a watermark
+        Index("ix_category_user_id_updated_at", "user_id", "updated_at", "id"),
+    )
 
     name: Mapped[str] = mapped_column(
         String(50),
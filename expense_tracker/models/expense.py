@@ -2,9 +2,9 @@
 import uuid
 from datetime import date as dt_date  # Pylance workaround
 from decimal import Decimal
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Date, ForeignKey, Numeric, String
+from sqlalchemy import Date, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -12,6 +12,7 @@ from .base import Base, TimestampMixin
 if TYPE_CHECKING:
     # Import only for type checking to avoid circular dependencies
     from .category import Category
+    from .group import Group
     from .shared_expense import SharedExpense
     from .user import User
 
@@ -24,6 +25,7 @@ class Expense(Base, TimestampMixin):
         id (UUID): Primary key
         user_id (UUID): Who created this expense
         category_id (UUID): Which category this expense belongs to
+        group_id (UUID, optional): The group the expense was recorded in, if any
         amount (Decimal): How much money was spent
         description (str): What the expense was for
         date (date): When the expense occurred
@@ -33,8 +35,15 @@ class Expense(Base, TimestampMixin):
     Relationships:
         user: Who created this expense
         category: What category this belongs to
+        group: The group the expense was recorded in
         shared_expenses: Records of how this expense is shared with others
     """
+    __table_args__ = (
+        # Serves the group expense feed: newest first, keyset paginated
+        Index("ix_expense_group_feed", "group_id", "created_at", "id"),
+        # Serves delta sync: the changes of one user since a watermark
+        Index("ix_expense_user_id_updated_at", "user_id", "updated_at", "id"),
+    )
 
     # Required fields
     amount: Mapped[Decimal] = mapped_column(
@@ -60,6 +69,11 @@ class Expense(Base, TimestampMixin):
         ForeignKey("category.id", ondelete="RESTRICT"),
         nullable=False
     )
+    group_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        # Expenses outlive their group as personal expenses
+        ForeignKey("group.id", ondelete="SET NULL"),
+        nullable=True
+    )
 
     # Relationships
     user: Mapped["User"] = relationship(
@@ -68,6 +82,9 @@ class Expense(Base, TimestampMixin):
     category: Mapped["Category"] = relationship(
         back_populates="expenses"
     )
+    group: Mapped[Optional["Group"]] = relationship(
+        back_populates="expenses"
+    )
     shared_expenses: Mapped[List["SharedExpense"]] = relationship(
         back_populates="expense",
         cascade="all, delete-orphan"
@@ -0,0 +1,102 @@
+# expense_tracker/models/group.py
+import uuid
+from decimal import Decimal
+from typing import TYPE_CHECKING, List
+
+from sqlalchemy import ForeignKey, Index, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base, TimestampMixin
+
+if TYPE_CHECKING:
+    # Import only for type checking to avoid circular dependencies
+    from .expense import Expense
+    from .user import User
+
+
+class Group(Base, TimestampMixin):
+    """
+    Group model, a set of users sharing expenses with each other.
+
+    Columns:
+        id (UUID): Primary key
+        name (str): Display name of the group
+        created_by_id (UUID): Who created the group and manages its members
+        created_at (datetime): When the group was created
+        updated_at (datetime): When the group was last updated
+
+    Relationships:
+        created_by: Who created the group
+        members: Memberships of the group, with cached balances
+        expenses: Expenses recorded in the group
+    """
+
+    name: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False
+    )
+    created_by_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # Relationships
+    created_by: Mapped["User"] = relationship()
+    members: Mapped[List["GroupMember"]] = relationship(
+        back_populates="group",
+        cascade="all, delete-orphan",
+        order_by="GroupMember.created_at"
+    )
+    expenses: Mapped[List["Expense"]] = relationship(
+        back_populates="group"
+    )
+
+
+class GroupMember(Base, TimestampMixin):
+    """
+    GroupMember model, a user's membership of a group.
+
+    The balance is the member's net position across the group's accepted
+    shares: positive when the rest of the group owes them, negative when
+    they owe the group. It is maintained by the shared expense service in
+    the same transaction as every share change, so a group page reads
+    balances without aggregating the group's expenses.
+
+    Columns:
+        id (UUID): Primary key
+        group_id (UUID): The group
+        user_id (UUID): The member
+        balance (Decimal): Net amount the member is owed within the group
+        created_at (datetime): When the user joined
+        updated_at (datetime): When the membership or balance last changed
+
+    Relationships:
+        group: The group
+        user: The member
+    """
+    __tablename__ = "group_member"
+    __table_args__ = (
+        UniqueConstraint("group_id", "user_id", name="uq_group_member"),
+        # Lists the groups of one user
+        Index("ix_group_member_user_id", "user_id"),
+    )
+
+    group_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("group.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    balance: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=Decimal("0.00")
+    )
+
+    # Relationships
+    group: Mapped["Group"] = relationship(
+        back_populates="members"
+    )
+    user: Mapped["User"] = relationship()
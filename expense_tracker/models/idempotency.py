@@ -0,0 +1,66 @@
+# expense_tracker/models/idempotency.py
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, DateTime, Index, Integer, LargeBinary, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class IdempotencyKey(Base, TimestampMixin):
+    """
+    IdempotencyKey model, the first response to a request sent with an
+    Idempotency-Key header.
+
+    The row is inserted before the request runs, which claims the key for
+    one worker; until the response is stored, retries with the same key
+    are refused. Rows can be purged once expired.
+
+    Columns:
+        id (UUID): Primary key
+        owner (str): Who sent the request, a user or a client address
+        key (str): The Idempotency-Key header
+        request_hash (str): SHA-256 of method, path and body
+        status_code (int, optional): Status of the response, NULL while running
+        headers (list, optional): Headers of the response
+        body (bytes, optional): Body of the response
+        expires_at (datetime): When the key can be reused
+        created_at (datetime): When the first request arrived
+        updated_at (datetime): When the response was stored
+    """
+    __tablename__ = "idempotency_key"
+    __table_args__ = (
+        UniqueConstraint("owner", "key", name="uq_idempotency_key_owner_key"),
+        # Purging of expired keys
+        Index("ix_idempotency_key_expires_at", "expires_at"),
+    )
+
+    owner: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False
+    )
+    key: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False
+    )
+    request_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False
+    )
+    status_code: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True
+    )
+    headers: Mapped[Optional[list]] = mapped_column(
+        JSON,
+        nullable=True
+    )
+    body: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary,
+        nullable=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False
+    )
@@ -0,0 +1,49 @@
+# expense_tracker/models/inbox.py
+import uuid
+from typing import TYPE_CHECKING
+
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base, TimestampMixin
+
+if TYPE_CHECKING:
+    # Import only for type checking to avoid circular dependencies
+    from .user import User
+
+
+class InboxCounter(Base, TimestampMixin):
+    """
+    InboxCounter model, per-status counts of the expenses shared with a user.
+
+    One row per user, maintained by the shared expense service in the same
+    transaction as the shared expense change so badge counts are a single
+    row read. Rows can be rebuilt from source with `InboxService.rebuild`.
+
+    Columns:
+        id (UUID): Primary key
+        user_id (UUID): The user the counted expenses are shared with
+        pending (int): Shares waiting to be accepted or rejected
+        accepted (int): Accepted shares not settled yet
+        rejected (int): Rejected shares
+        settled (int): Settled shares
+        created_at (datetime): When the counter was created
+        updated_at (datetime): When a count last changed
+
+    Relationships:
+        user: The user the counts belong to
+    """
+    __tablename__ = "inbox_counter"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False
+    )
+    pending: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    accepted: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rejected: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    settled: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Relationships
+    user: Mapped["User"] = relationship()
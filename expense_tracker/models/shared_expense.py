@@ -5,7 +5,7 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, Numeric
+from sqlalchemy import ForeignKey, Index, Integer, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -34,6 +34,7 @@ class SharedExpense(Base, TimestampMixin):
         shared_with_user_id (UUID): The user this expense is shared with
         split_percentage (Decimal): What percentage of the expense this user should pay
         status (SharedExpenseStatus): Current status of this shared expense
+        version (int): Row version for optimistic concurrency, bumped on every update
         created_at (datetime): When the sharing was created
         updated_at (datetime): When the sharing was last updated
 
@@ -42,6 +43,14 @@ class SharedExpense(Base, TimestampMixin):
         shared_with_user: The user this expense is shared with
     """
     __tablename__ = "shared_expense"
+    __table_args__ = (
+        # Serves the shared-with-me inbox: one status, newest first, keyset paginated
+        Index("ix_shared_expense_inbox", "shared_with_user_id", "status", "created_at", "id"),
+        # Serve delta sync for both parties: shares of the user's expenses
+        # and shares with the user, changed since a watermark
+        Index("ix_shared_expense_expense_id_updated_at", "expense_id", "updated_at", "id"),
+        Index("ix_shared_expense_shared_with_user_id_updated_at", "shared_with_user_id", "updated_at", "id"),
+    )
 
     # Foreign keys
     expense_id: Mapped[uuid.UUID] = mapped_column(
@@ -63,6 +72,12 @@ class SharedExpense(Base, TimestampMixin):
         nullable=False,
         default=SharedExpenseStatus.PENDING
     )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1"
+    )
 
     # Relationships
     expense: Mapped["Expense"] = relationship(
@@ -71,3 +86,6 @@ class SharedExpense(Base, TimestampMixin):
     shared_with_user: Mapped["User"] = relationship(
         back_populates="shared_with_me"
     )
+
+    # The ORM checks and increments version on every flush of an update
+    __mapper_args__ = {"version_id_col": version}
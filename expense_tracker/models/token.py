@@ -0,0 +1,99 @@
+# expense_tracker/models/token.py
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class RevokedToken(Base, TimestampMixin):
+    """
+    RevokedToken model, the authoritative revocation list for access tokens.
+
+    Rows are only needed until the token would have expired anyway, after
+    which they can be purged.
+
+    Columns:
+        id (UUID): Primary key
+        jti (str): Unique identifier of the revoked token
+        user_id (UUID, optional): The user the token was issued to
+        expires_at (datetime): When the revoked token expires
+        reason (str, optional): Why the token was revoked
+        created_at (datetime): When the token was revoked
+        updated_at (datetime): When the record was last updated
+    """
+    __tablename__ = "revoked_token"
+    __table_args__ = (
+        # Incremental loading of the per-worker revocation filter
+        Index("ix_revoked_token_created_at", "created_at"),
+    )
+
+    jti: Mapped[str] = mapped_column(
+        String(64),
+        unique=True,
+        nullable=False
+    )
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False
+    )
+    reason: Mapped[Optional[str]] = mapped_column(
+        String(50),
+        nullable=True
+    )
+
+
+class RefreshToken(Base, TimestampMixin):
+    """
+    RefreshToken model tracking issued refresh tokens for rotation.
+
+    Every refresh token belongs to a family started at login. Using a refresh
+    token marks it as used and issues its successor in the same family;
+    presenting an already used token is treated as theft and revokes the
+    whole family.
+
+    Columns:
+        id (UUID): Primary key
+        jti (str): Unique identifier of the refresh token
+        user_id (UUID): The user the token was issued to
+        family_id (UUID): The rotation chain this token belongs to
+        expires_at (datetime): When the token expires
+        used_at (datetime, optional): When the token was rotated
+        revoked_at (datetime, optional): When the token was revoked
+        created_at (datetime): When the token was issued
+        updated_at (datetime): When the record was last updated
+    """
+    __tablename__ = "refresh_token"
+
+    jti: Mapped[str] = mapped_column(
+        String(64),
+        unique=True,
+        nullable=False
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    family_id: Mapped[uuid.UUID] = mapped_column(
+        nullable=False,
+        index=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False
+    )
+    used_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
@@ -0,0 +1,42 @@
+# expense_tracker/models/tombstone.py
+import uuid
+
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class Tombstone(Base, TimestampMixin):
+    """
+    Tombstone model, a record of a deleted row for delta sync clients.
+
+    One tombstone is written per user who could see the deleted row, in the
+    transaction that deletes it. Tombstones are kept for
+    `SYNC_TOMBSTONE_RETENTION_DAYS`; clients that last synced before that
+    must download everything again.
+
+    Columns:
+        id (UUID): Primary key
+        table_name (str): Table of the deleted row, e.g. "expense"
+        entity_id (UUID): Primary key of the deleted row
+        user_id (UUID): The user who should learn about the deletion
+        created_at (datetime): When the row was deleted
+        updated_at (datetime): Same as created_at, used as the sync watermark
+    """
+    __table_args__ = (
+        # Serves delta sync: the deletions of one user since a watermark
+        Index("ix_tombstone_user_id_updated_at", "user_id", "updated_at", "id"),
+        # Purging of expired tombstones
+        Index("ix_tombstone_created_at", "created_at"),
+    )
+
+    table_name: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False
+    )
+    entity_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False
+    )
@@ -1,7 +1,7 @@
 # expense_tracker/models/user.py
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import String
+from sqlalchemy import Boolean, Integer, String, true
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from expense_tracker.models.base import Base, TimestampMixin
@@ -21,6 +21,9 @@ class User(Base, TimestampMixin):
         id (UUID): Primary key, automatically generated
         email (str): User's email address, must be unique
         username (str): User's username
+        hashed_password (str, optional): bcrypt hash; users without one can not log in
+        is_active (bool): Whether the user may authenticate
+        token_version (int): Bumped to invalidate all previously issued tokens
         created_at (datetime): When the user was created
         updated_at (datetime): When the user was last updated
 
@@ -38,6 +41,22 @@ class User(Base, TimestampMixin):
         String(100),
         nullable=False
     )
+    hashed_password: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        nullable=True
+    )
+    is_active: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=True,
+        server_default=true()
+    )
+    token_version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
 
     # Relationships
     expenses: Mapped[List["Expense"]] = relationship(
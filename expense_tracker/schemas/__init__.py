@@ -1,21 +1,82 @@
 # expense_tracker/schemas/__init__.py
+from .balance import (
+    BalanceDrift,
+    BalanceResponse,
+    ReconciliationReport,
+    SettlementPlan,
+    SettlementRequest,
+    SettlementTransfer,
+)
+from .cache import CacheStats, SingleFlightStats
 from .category import CategoryCreate, CategoryInDB, CategoryResponse, CategoryUpdate
-from .expense import ExpenseCreate, ExpenseInDB, ExpenseResponse, ExpenseUpdate
-from .queries import ExpenseAnalytics, ExpenseFilter
+from .diagnostics import (
+    AllocationDiff,
+    AllocationSite,
+    BlockingDetection,
+    LoopStats,
+    MemorySample,
+    MemorySnapshotInfo,
+    MemoryStats,
+    MemoryTracingRequest,
+)
+from .expense import (
+    ExpenseBatchCreate,
+    ExpenseBatchDelete,
+    ExpenseBatchItemResult,
+    ExpenseBatchOperation,
+    ExpenseBatchRequest,
+    ExpenseBatchResult,
+    ExpenseBatchUpdate,
+    ExpenseBulkDelete,
+    ExpenseBulkResult,
+    ExpenseBulkUpdate,
+    ExpenseCreate,
+    ExpenseInDB,
+    ExpensePage,
+    ExpenseResponse,
+    ExpenseUpdate,
+)
+from .group import (
+    GroupCreate,
+    GroupExpense,
+    GroupExpenseCreate,
+    GroupFeedPage,
+    GroupInDB,
+    GroupMemberAdd,
+    GroupMemberResponse,
+    GroupResponse,
+)
+from .inbox import InboxCounts, InboxItem, InboxPage
+from .profiling import ProfileInfo, ProfileRule
+from .queries import ExpenseAnalytics, ExpenseFilter, ExpenseListQuery
 from .shared_expense import (
+    SharedExpenseBatchCreate,
+    SharedExpenseBatchError,
+    SharedExpenseBatchItem,
+    SharedExpenseBatchResult,
     SharedExpenseCreate,
     SharedExpenseInDB,
     SharedExpenseResponse,
+    SharedExpenseSplit,
     SharedExpenseStatus,
+    SharedExpenseTransition,
+    SharedExpenseTransitionResult,
     SharedExpenseUpdate,
+    SharedExpenseVersion,
 )
-from .user import UserCreate, UserInDB, UserResponse, UserUpdate
+from .token import RefreshTokenRequest, Token, TokenPayload
+from .tracing import SpanRecord, TraceRecord
+from .user import AuthenticatedUser, UserCreate, UserInDB, UserResponse, UserUpdate
 
 __all__ = [
     "UserCreate",
     "UserUpdate",
     "UserResponse",
     "UserInDB",
+    "AuthenticatedUser",
+    "Token",
+    "RefreshTokenRequest",
+    "TokenPayload",
     "CategoryCreate",
     "CategoryUpdate",
     "CategoryResponse",
@@ -24,11 +85,62 @@ __all__ = [
     "ExpenseUpdate",
     "ExpenseResponse",
     "ExpenseInDB",
+    "ExpensePage",
+    "ExpenseBatchCreate",
+    "ExpenseBatchUpdate",
+    "ExpenseBatchDelete",
+    "ExpenseBatchOperation",
+    "ExpenseBatchRequest",
+    "ExpenseBatchItemResult",
+    "ExpenseBatchResult",
+    "ExpenseBulkUpdate",
+    "ExpenseBulkDelete",
+    "ExpenseBulkResult",
     "SharedExpenseCreate",
     "SharedExpenseUpdate",
     "SharedExpenseResponse",
     "SharedExpenseInDB",
     "SharedExpenseStatus",
+    "SharedExpenseSplit",
+    "SharedExpenseBatchItem",
+    "SharedExpenseBatchCreate",
+    "SharedExpenseBatchError",
+    "SharedExpenseBatchResult",
+    "SharedExpenseTransition",
+    "SharedExpenseVersion",
+    "SharedExpenseTransitionResult",
+    "InboxItem",
+    "InboxPage",
+    "InboxCounts",
+    "GroupCreate",
+    "GroupInDB",
+    "GroupMemberAdd",
+    "GroupMemberResponse",
+    "GroupResponse",
+    "GroupExpenseCreate",
+    "GroupExpense",
+    "GroupFeedPage",
     "ExpenseFilter",
+    "ExpenseListQuery",
     "ExpenseAnalytics",
+    "BalanceResponse",
+    "BalanceDrift",
+    "ReconciliationReport",
+    "SettlementRequest",
+    "SettlementTransfer",
+    "SettlementPlan",
+    "CacheStats",
+    "SingleFlightStats",
+    "SpanRecord",
+    "TraceRecord",
+    "ProfileInfo",
+    "ProfileRule",
+    "BlockingDetection",
+    "LoopStats",
+    "MemoryTracingRequest",
+    "MemorySample",
+    "MemorySnapshotInfo",
+    "MemoryStats",
+    "AllocationSite",
+    "AllocationDiff",
 ]
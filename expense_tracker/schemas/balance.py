@@ -0,0 +1,49 @@
+# expense_tracker/schemas/balance.py
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class BalanceResponse(BaseSchema):
+    """Schema for the net balance with another user, seen by the current user"""
+    user_id: uuid.UUID  # The other user
+    amount: Decimal  # Positive: they owe you, negative: you owe them
+    updated_at: Optional[datetime] = None  # None if the users never shared expenses
+
+
+class BalanceDrift(BaseSchema):
+    """Schema for a ledger pair that disagrees with its source shared expenses"""
+    user_a_id: uuid.UUID
+    user_b_id: uuid.UUID
+    ledger_amount: Decimal
+    expected_amount: Decimal
+
+
+class ReconciliationReport(BaseSchema):
+    """Schema for the result of rebuilding the ledger from source"""
+    pairs_checked: int
+    drift: List[BalanceDrift]
+    fixed: bool
+
+
+class SettlementRequest(BaseSchema):
+    """Schema for planning the settlement of a group of users"""
+    user_ids: List[uuid.UUID] = Field(..., min_length=2, max_length=10_000)
+
+
+class SettlementTransfer(BaseSchema):
+    """Schema for one payment of a settlement plan"""
+    from_user_id: uuid.UUID
+    to_user_id: uuid.UUID
+    amount: Decimal
+
+
+class SettlementPlan(BaseSchema):
+    """Schema for the transfers that clear all balances within a group"""
+    pairwise_balances: int  # Non-zero balances the plan replaces
+    transfers: List[SettlementTransfer]
@@ -0,0 +1,25 @@
+# expense_tracker/schemas/cache.py
+from .base import BaseSchema
+
+
+class CacheStats(BaseSchema):
+    """Schema for the counters of one process-local cache"""
+    name: str
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    hit_rate: float  # hits / lookups, 0 before the first lookup
+    evictions: int
+    invalidations: int
+
+
+class SingleFlightStats(BaseSchema):
+    """Schema for the counters of one single-flight group"""
+    name: str
+    in_flight: int
+    calls: int
+    executions: int  # Calls that ran the function
+    coalesced: int  # Calls that shared another call's execution
+    timeouts: int
+    cancellations: int
@@ -0,0 +1,69 @@
+# expense_tracker/schemas/diagnostics.py
+import datetime
+from typing import Dict, List, Optional
+
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class BlockingDetection(BaseSchema):
+    """Schema for one time the event loop was held past the threshold"""
+    detected_at: datetime.datetime
+    duration: Optional[float] = None  # Seconds; None while the loop is still blocked
+    stack: List[str]  # The loop thread's stack when detected, innermost last
+
+
+class LoopStats(BaseSchema):
+    """Schema for the event loop lag of one worker"""
+    interval: float
+    threshold: float
+    last_lag: float
+    max_lag: float
+    blocked_count: int
+    detections: List[BlockingDetection]  # Most recent first
+
+
+class MemoryTracingRequest(BaseSchema):
+    """Schema for starting allocation tracing"""
+    frames: int = Field(default=1, ge=1, le=100)  # Stack frames kept per allocation
+
+
+class MemorySample(BaseSchema):
+    """Schema for one periodic memory reading"""
+    taken_at: datetime.datetime
+    rss_bytes: Optional[int] = None  # None where /proc is unavailable
+    traced_bytes: Optional[int] = None  # None while allocation tracing is off
+    orm_instances: Dict[str, int]  # Live instances per model
+
+
+class MemorySnapshotInfo(BaseSchema):
+    """Schema for a stored tracemalloc snapshot"""
+    id: int
+    taken_at: datetime.datetime
+    traced_bytes: int
+    frames: int
+
+
+class MemoryStats(BaseSchema):
+    """Schema for the memory usage of one worker"""
+    tracing: bool
+    current: MemorySample
+    history: List[MemorySample]  # Most recent first
+    snapshots: List[MemorySnapshotInfo]
+    sessions_closed: int
+    sessions_flagged: int  # Closed holding more than IDENTITY_MAP_WARN_SIZE objects
+    largest_identity_map: int
+
+
+class AllocationSite(BaseSchema):
+    """Schema for the memory allocated at one place"""
+    traceback: List[str]  # "file:line", innermost last
+    size: int  # Bytes
+    count: int  # Memory blocks
+
+
+class AllocationDiff(AllocationSite):
+    """Schema for how an allocation site changed between two snapshots"""
+    size_diff: int
+    count_diff: int
@@ -2,12 +2,13 @@
 import datetime
 import uuid
 from decimal import Decimal
-from typing import Optional
+from typing import Annotated, Any, List, Literal, Optional, Union
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from .base import BaseSchema
 from .category import CategoryResponse
+from .queries import ExpenseFilter
 from .user import UserResponse
 
 
@@ -37,6 +38,7 @@ class ExpenseInDB(ExpenseBase):
     """Schema for expense data from database"""
     id: uuid.UUID
     user_id: uuid.UUID
+    group_id: Optional[uuid.UUID] = None
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
@@ -45,3 +47,84 @@ class ExpenseResponse(ExpenseInDB):
     """Schema for expense response with related data"""
     category: CategoryResponse
     user: UserResponse
+
+
+class ExpensePage(BaseSchema):
+    """Schema for one page of expenses with the requested fields"""
+    items: List[dict[str, Any]]  # ExpenseResponse trimmed to the selected fields
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class ExpenseBatchCreate(BaseSchema):
+    """Schema for a create operation of an expense batch"""
+    op: Literal["create"]
+    id: Optional[uuid.UUID] = None  # Client generated id, e.g. from an offline client
+    data: ExpenseCreate
+
+
+class ExpenseBatchUpdate(BaseSchema):
+    """Schema for an update operation of an expense batch"""
+    op: Literal["update"]
+    id: uuid.UUID
+    data: ExpenseUpdate
+
+
+class ExpenseBatchDelete(BaseSchema):
+    """Schema for a delete operation of an expense batch"""
+    op: Literal["delete"]
+    id: uuid.UUID
+
+
+ExpenseBatchOperation = Annotated[
+    Union[ExpenseBatchCreate, ExpenseBatchUpdate, ExpenseBatchDelete],
+    Field(discriminator="op")
+]
+
+
+class ExpenseBatchRequest(BaseSchema):
+    """Schema for a batch of expense operations applied in one transaction"""
+    operations: List[ExpenseBatchOperation] = Field(..., min_length=1, max_length=500)
+    # All-or-nothing by default; otherwise invalid operations are skipped
+    atomic: bool = True
+
+
+class ExpenseBatchItemResult(BaseSchema):
+    """Schema for the outcome of one batch operation, in request order"""
+    index: int
+    op: Literal["create", "update", "delete"]
+    id: Optional[uuid.UUID] = None
+    ok: bool
+    detail: Optional[str] = None  # Why the operation failed or was not applied
+    expense: Optional[ExpenseInDB] = None  # The created or updated expense
+
+
+class ExpenseBatchResult(BaseSchema):
+    """Schema for the outcome of an expense batch"""
+    committed: bool  # False if an atomic batch was rolled back
+    results: List[ExpenseBatchItemResult]
+
+
+class ExpenseBulkDelete(BaseSchema):
+    """Schema for deleting all expenses matching a filter"""
+    filter: ExpenseFilter
+    dry_run: bool = False  # Only count the matching expenses
+    # Refuse to touch more expenses than this; capped by the server limit
+    max_rows: Optional[int] = Field(None, ge=1)
+
+
+class ExpenseBulkUpdate(ExpenseBulkDelete):
+    """Schema for applying the same changes to all expenses matching a filter"""
+    patch: ExpenseUpdate
+
+    @model_validator(mode="after")
+    def check_patch_not_empty(self) -> "ExpenseBulkUpdate":
+        if not any(value is not None for value in self.patch.model_dump().values()):
+            raise ValueError("patch must change at least one field")
+        return self
+
+
+class ExpenseBulkResult(BaseSchema):
+    """Schema for the outcome of a bulk update or delete"""
+    matched: int
+    affected: int  # 0 for a dry run
+    dry_run: bool
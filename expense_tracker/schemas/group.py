@@ -0,0 +1,60 @@
+# expense_tracker/schemas/group.py
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import Field
+
+from .base import BaseSchema
+from .expense import ExpenseCreate, ExpenseInDB
+from .shared_expense import SharedExpenseInDB
+
+
+class GroupCreate(BaseSchema):
+    """Schema for creating a group; the creator always becomes a member"""
+    name: str = Field(..., min_length=1, max_length=50)
+    member_ids: List[uuid.UUID] = Field(default_factory=list, max_length=100)
+
+
+class GroupInDB(BaseSchema):
+    """Schema for group data from database"""
+    id: uuid.UUID
+    name: str
+    created_by_id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+
+
+class GroupMemberAdd(BaseSchema):
+    """Schema for adding a member to a group"""
+    user_id: uuid.UUID
+
+
+class GroupMemberResponse(BaseSchema):
+    """Schema for a group member and their cached balance"""
+    user_id: uuid.UUID
+    balance: Decimal  # Positive: the group owes them, negative: they owe the group
+    created_at: datetime  # When they joined
+
+
+class GroupResponse(GroupInDB):
+    """Schema for a group with its members"""
+    members: List[GroupMemberResponse]
+
+
+class GroupExpenseCreate(ExpenseCreate):
+    """Schema for recording an expense in a group, split equally among participants"""
+    # Members splitting the expense, including the payer; all members if omitted
+    member_ids: Optional[List[uuid.UUID]] = Field(None, min_length=1, max_length=100)
+
+
+class GroupExpense(ExpenseInDB):
+    """Schema for a group expense and its shares"""
+    shared_expenses: List[SharedExpenseInDB]
+
+
+class GroupFeedPage(BaseSchema):
+    """Schema for one page of a group's expense feed"""
+    items: List[GroupExpense]
+    next_cursor: Optional[str] = None  # None on the last page
@@ -0,0 +1,27 @@
+# expense_tracker/schemas/inbox.py
+from datetime import datetime
+from typing import List, Optional
+
+from .base import BaseSchema
+from .expense import ExpenseInDB
+from .shared_expense import SharedExpenseInDB
+
+
+class InboxItem(SharedExpenseInDB):
+    """Schema for an expense shared with the current user"""
+    expense: ExpenseInDB
+
+
+class InboxPage(BaseSchema):
+    """Schema for one page of the shared-with-me inbox"""
+    items: List[InboxItem]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class InboxCounts(BaseSchema):
+    """Schema for the per-status counts of the shared-with-me inbox"""
+    pending: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    settled: int = 0
+    updated_at: Optional[datetime] = None  # None if nothing was ever shared with the user
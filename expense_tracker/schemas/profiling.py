@@ -0,0 +1,20 @@
+# expense_tracker/schemas/profiling.py
+import datetime
+
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class ProfileInfo(BaseSchema):
+    """Schema for a stored request profile"""
+    name: str
+    size: int  # Bytes
+    created_at: datetime.datetime
+
+
+class ProfileRule(BaseSchema):
+    """Schema for profiling every Nth request of a route"""
+    method: str = Field(..., pattern=r"^[A-Z]+$")
+    route: str = Field(..., min_length=1)  # Route template, e.g. /api/v1/users/{user_id}
+    every: int = Field(..., ge=1)
@@ -6,6 +6,8 @@ from typing import List, Optional
 
 from pydantic import Field
 
+from expense_tracker.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
 from .base import BaseSchema
 
 
@@ -20,6 +22,13 @@ class ExpenseFilter(BaseSchema):
     shared_only: Optional[bool] = False
 
 
+class ExpenseListQuery(ExpenseFilter):
+    """Schema for the query of an expense list page"""
+    limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    fields: Optional[str] = Field(None, examples=["id,amount,date,category.name"])  # All fields when None
+
+
 class ExpenseAnalytics(BaseSchema):
     """Schema for expense analytics response"""
     total_amount: Decimal
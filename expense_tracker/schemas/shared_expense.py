@@ -3,9 +3,9 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from .base import BaseSchema
 from .expense import ExpenseResponse
@@ -33,6 +33,7 @@ class SharedExpenseBase(BaseSchema):
 
 class SharedExpenseCreate(BaseSchema):
     """Schema for creating a new shared expense"""
+    expense_id: uuid.UUID
     shared_with_user_id: uuid.UUID
     split_percentage: Decimal = Field(ge=0, le=100, decimal_places=2)
 
@@ -42,11 +43,13 @@ class SharedExpenseUpdate(BaseSchema):
     status: Optional[SharedExpenseStatus] = None
     split_percentage: Optional[Decimal] = Field(
         None, ge=0, le=100, decimal_places=2)
+    version: Optional[int] = None  # Rejects the update if the share changed since
 
 
 class SharedExpenseInDB(SharedExpenseBase):
     """Schema for shared expense data from database"""
     id: uuid.UUID
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -55,3 +58,66 @@ class SharedExpenseResponse(SharedExpenseInDB):
     """Schema for shared expense response with related data"""
     expense: ExpenseResponse
     shared_with_user: UserResponse
+
+
+class SharedExpenseSplit(BaseSchema):
+    """Schema for one split of a batch, by explicit percentage or relative weight"""
+    shared_with_user_id: uuid.UUID
+    split_percentage: Optional[Decimal] = Field(None, gt=0, le=100, decimal_places=2)
+    weight: Optional[int] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def check_percentage_or_weight(self) -> "SharedExpenseSplit":
+        if (self.split_percentage is None) == (self.weight is None):
+            raise ValueError("Provide exactly one of split_percentage or weight")
+        return self
+
+
+class SharedExpenseBatchItem(BaseSchema):
+    """Schema for all splits of one expense in a batch"""
+    expense_id: uuid.UUID
+    splits: List[SharedExpenseSplit] = Field(..., min_length=1, max_length=100)
+    # Percentage divided among weighted splits; the owner takes owner_weight of it
+    weighted_percentage: Decimal = Field(Decimal(100), gt=0, le=100, decimal_places=2)
+    owner_weight: int = Field(0, ge=0)
+
+
+class SharedExpenseBatchCreate(BaseSchema):
+    """Schema for creating the splits of one or many expenses at once"""
+    items: List[SharedExpenseBatchItem] = Field(..., min_length=1, max_length=1000)
+
+
+class SharedExpenseBatchError(BaseSchema):
+    """Schema for a split that could not be created"""
+    expense_id: uuid.UUID
+    shared_with_user_id: Optional[uuid.UUID] = None
+    detail: str
+
+
+class SharedExpenseBatchResult(BaseSchema):
+    """Schema for the outcome of a batch; valid splits are created even if others fail"""
+    created: List[SharedExpenseInDB]
+    errors: List[SharedExpenseBatchError]
+
+
+class SharedExpenseTransition(BaseSchema):
+    """Schema for moving every matching shared expense to a new status"""
+    status: SharedExpenseStatus
+    shared_expense_ids: Optional[List[uuid.UUID]] = Field(None, max_length=10_000)
+    expense_ids: Optional[List[uuid.UUID]] = Field(None, max_length=10_000)
+    counterparty_user_id: Optional[uuid.UUID] = None  # The other party of the shares
+    # Only update shares still at these versions, reporting the rest as conflicts
+    expected_versions: Optional[dict[uuid.UUID, int]] = Field(None, max_length=10_000)
+
+
+class SharedExpenseVersion(BaseSchema):
+    """Schema for the new version of a shared expense"""
+    id: uuid.UUID
+    version: int
+
+
+class SharedExpenseTransitionResult(BaseSchema):
+    """Schema for the outcome of a bulk status transition"""
+    status: SharedExpenseStatus
+    updated: List[SharedExpenseVersion]
+    conflicts: List[uuid.UUID]  # Requested shares that were changed concurrently or can not transition
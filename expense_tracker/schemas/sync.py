@@ -0,0 +1,26 @@
+# expense_tracker/schemas/sync.py
+import uuid
+from datetime import datetime
+from typing import List
+
+from .base import BaseSchema
+from .category import CategoryInDB
+from .expense import ExpenseInDB
+from .shared_expense import SharedExpenseInDB
+
+
+class SyncDeletion(BaseSchema):
+    """Schema for a row deleted since the last sync"""
+    table_name: str  # "category", "expense" or "shared_expense"
+    entity_id: uuid.UUID
+    updated_at: datetime  # When it was deleted
+
+
+class SyncPage(BaseSchema):
+    """Schema for one page of changes since a sync cursor"""
+    categories: List[CategoryInDB]
+    expenses: List[ExpenseInDB]
+    shared_expenses: List[SharedExpenseInDB]  # Shares of your expenses and shares with you
+    deleted: List[SyncDeletion]
+    cursor: str  # Pass back to continue, or to sync again later once has_more is false
+    has_more: bool
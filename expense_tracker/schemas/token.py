@@ -0,0 +1,30 @@
+# expense_tracker/schemas/token.py
+from typing import Optional
+
+from .base import BaseSchema
+
+
+class Token(BaseSchema):
+    """Schema for an issued access token"""
+    access_token: str
+    token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseSchema):
+    """Schema for exchanging a refresh token for a new token pair"""
+    refresh_token: str
+
+
+class TokenPayload(BaseSchema):
+    """Schema for the claims carried by an access token"""
+    sub: Optional[str] = None
+    exp: Optional[int] = None
+    ver: int = 0  # Must match User.token_version for the token to be valid
+    jti: Optional[str] = None
+    typ: str = "access"  # "access" or "refresh"
+    fam: Optional[str] = None  # Rotation family of a refresh token
+
+    # Optional signed identity claims (see settings.AUTH_TRUST_TOKEN_CLAIMS)
+    email: Optional[str] = None
+    username: Optional[str] = None
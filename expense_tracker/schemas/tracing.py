@@ -0,0 +1,23 @@
+# expense_tracker/schemas/tracing.py
+from typing import Any, List, Optional
+
+from .base import BaseSchema
+
+
+class SpanRecord(BaseSchema):
+    """Schema for one timed operation of a request"""
+    name: str
+    kind: str  # http, service or db
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ms: float  # Offset from the start of the request
+    duration_ms: float
+    attributes: dict[str, Any]
+
+
+class TraceRecord(BaseSchema):
+    """Schema for the spans of one request"""
+    trace_id: str
+    started_at: float  # Unix timestamp
+    dropped: int  # Spans not kept because the trace was too large
+    spans: List[SpanRecord]
@@ -2,7 +2,7 @@
 import uuid
 from datetime import datetime
 
-from pydantic import EmailStr, Field
+from pydantic import ConfigDict, EmailStr, Field
 
 from .base import BaseSchema
 
@@ -15,7 +15,7 @@ class UserBase(BaseSchema):
 
 class UserCreate(UserBase):
     """Schema for creating a new user"""
-    pass
+    password: str | None = Field(None, min_length=8, max_length=72)  # bcrypt ignores bytes past 72
 
 
 class UserUpdate(BaseSchema):
@@ -34,3 +34,14 @@ class UserInDB(UserBase):
 class UserResponse(UserInDB):
     """Schema for user response"""
     pass
+
+
+class AuthenticatedUser(BaseSchema):
+    """Schema for the user resolved from an access token"""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: uuid.UUID
+    email: str
+    username: str
+    is_active: bool = True
+    token_version: int = 0
@@ -0,0 +1,123 @@
+# expense_tracker/services/category.py
+import uuid
+from typing import Optional
+
+from sqlalchemy import exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.cache import category_cache
+from expense_tracker.core.exceptions import (
+    CategoryInUseError,
+    CategoryNotFoundError,
+    DuplicateCategoryError,
+    PermissionDeniedError,
+)
+from expense_tracker.core.invalidation import EntityChange, publish_changes
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.category import Category
+from expense_tracker.models.expense import Expense
+from expense_tracker.schemas.category import CategoryCreate, CategoryInDB, CategoryUpdate
+from expense_tracker.services.sync import record_deletions
+
+
+@traced
+class CategoryService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def get_category(self, category_id: uuid.UUID) -> CategoryInDB:
+        """Get a read-only snapshot of a category by ID, served from the cache when possible"""
+        cached = category_cache.get(("id", category_id))
+        if cached is not None:
+            return cached
+        generation = category_cache.generation
+        category = await self.db_session.get(Category, category_id)
+        if category is None:
+            raise CategoryNotFoundError(f"Category with ID {category_id} not found")
+        return self._cache_category(category, generation)
+
+    async def get_category_by_name(self, user_id: Optional[uuid.UUID], name: str) -> Optional[CategoryInDB]:
+        """Get a category of user_id (or a system category for None) by name"""
+        cached = category_cache.get(("name", user_id, name))
+        if cached is not None:
+            return cached
+        generation = category_cache.generation
+        owner = Category.user_id.is_(None) if user_id is None else Category.user_id == user_id
+        query = select(Category).where(owner, Category.name == name).limit(1)
+        category = (await self.db_session.execute(query)).scalar_one_or_none()
+        if category is None:
+            return None
+        return self._cache_category(category, generation)
+
+    async def get_visible_category(self, user_id: uuid.UUID, category_id: uuid.UUID) -> CategoryInDB:
+        """Get a system category or one of user_id's own categories"""
+        category = await self.get_category(category_id)
+        if category.user_id not in (None, user_id):
+            raise CategoryNotFoundError(f"Category with ID {category_id} not found")
+        return category
+
+    async def list_categories(self, user_id: uuid.UUID) -> list[Category]:
+        """System categories and the categories of user_id"""
+        query = (
+            select(Category)
+            .where(or_(Category.user_id.is_(None), Category.user_id == user_id))
+            .order_by(Category.name)
+        )
+        return list((await self.db_session.scalars(query)).all())
+
+    async def create_category(self, user_id: uuid.UUID, category_data: CategoryCreate) -> Category:
+        """Create a custom category for user_id, named unlike any category they see"""
+        await self._check_name_free(user_id, category_data.name)
+        category = Category(name=category_data.name, user_id=user_id)
+        self.db_session.add(category)
+        await self.db_session.commit()
+        await self.db_session.refresh(category)
+        return category
+
+    async def update_category(
+        self, user_id: uuid.UUID, category_id: uuid.UUID, category_data: CategoryUpdate
+    ) -> Category:
+        """Rename a custom category; system categories can not be changed"""
+        category = await self._get_own_category(user_id, category_id)
+        if category_data.name is not None and category_data.name != category.name:
+            await self._check_name_free(user_id, category_data.name)
+            category.name = category_data.name
+        await publish_changes(self.db_session, [EntityChange("category", category.id, user_id)])
+        await self.db_session.commit()
+        await self.db_session.refresh(category)
+        category_cache.invalidate(category.id)
+        return category
+
+    async def delete_category(self, user_id: uuid.UUID, category_id: uuid.UUID) -> None:
+        """Delete a custom category without expenses"""
+        category = await self._get_own_category(user_id, category_id)
+        if await self.db_session.scalar(select(exists().where(Expense.category_id == category.id))):
+            raise CategoryInUseError("Category has expenses; move or delete them first")
+        await self.db_session.delete(category)
+        await record_deletions(self.db_session, [("category", category.id, user_id)])
+        await publish_changes(self.db_session, [EntityChange("category", category.id, user_id)])
+        await self.db_session.commit()
+        category_cache.invalidate(category.id)
+
+    async def _check_name_free(self, user_id: uuid.UUID, name: str) -> None:
+        if await self.get_category_by_name(None, name) or await self.get_category_by_name(user_id, name):
+            raise DuplicateCategoryError(f"Category {name} already exists")
+
+    async def _get_own_category(self, user_id: uuid.UUID, category_id: uuid.UUID) -> Category:
+        category = await self.db_session.get(Category, category_id)
+        if category is None or category.user_id not in (None, user_id):
+            raise CategoryNotFoundError(f"Category with ID {category_id} not found")
+        if category.user_id is None:
+            raise PermissionDeniedError("System categories can not be changed")
+        return category
+
+    @staticmethod
+    def _cache_category(category: Category, generation: int) -> CategoryInDB:
+        snapshot = CategoryInDB.model_validate(category)
+        category_cache.set(
+            category.id,
+            [("id", category.id), ("name", category.user_id, category.name)],
+            snapshot,
+            generation
+        )
+        return snapshot
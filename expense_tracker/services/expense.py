@@ -0,0 +1,481 @@
+# expense_tracker/services/expense.py
+import uuid
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import Select, delete, exists, func, insert, literal_column, or_, select, tuple_, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from expense_tracker.core.exceptions import BulkLimitExceededError, CategoryNotFoundError, ExpenseNotFoundError
+from expense_tracker.core.fields import FieldSelection, partial_model
+from expense_tracker.core.invalidation import EntityChange, publish_changes
+from expense_tracker.core.money import share_amount
+from expense_tracker.core.pagination import decode_cursor, encode_cursor
+from expense_tracker.core.settings import settings
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.category import Category
+from expense_tracker.models.expense import Expense
+from expense_tracker.models.shared_expense import SharedExpense
+from expense_tracker.models.user import User
+from expense_tracker.schemas.expense import (
+    ExpenseBatchCreate,
+    ExpenseBatchDelete,
+    ExpenseBatchItemResult,
+    ExpenseBatchRequest,
+    ExpenseBatchResult,
+    ExpenseBatchUpdate,
+    ExpenseBulkDelete,
+    ExpenseBulkResult,
+    ExpenseBulkUpdate,
+    ExpenseInDB,
+    ExpensePage,
+    ExpenseResponse,
+)
+from expense_tracker.schemas.queries import ExpenseAnalytics, ExpenseFilter
+from expense_tracker.services.ledger import ZERO
+from expense_tracker.services.shared_expense import ShareChange, apply_share_changes
+from expense_tracker.services.sync import record_deletions
+
+NOT_APPLIED = "Not applied, another operation of the atomic batch failed"
+
+
+def update_values(operation: ExpenseBatchUpdate) -> dict:
+    """Fields an update operation actually changes"""
+    return {
+        field: value
+        for field, value in operation.data.model_dump(exclude_unset=True).items()
+        if value is not None
+    }
+
+
+def filter_conditions(user_id: uuid.UUID, expense_filter: ExpenseFilter) -> list:
+    """WHERE conditions selecting the expenses of user_id that match expense_filter"""
+    conditions = [Expense.user_id == user_id]
+    if expense_filter.start_date is not None:
+        conditions.append(Expense.date >= expense_filter.start_date)
+    if expense_filter.end_date is not None:
+        conditions.append(Expense.date <= expense_filter.end_date)
+    if expense_filter.category_id:
+        conditions.append(Expense.category_id.in_(expense_filter.category_id))
+    if expense_filter.min_amount is not None:
+        conditions.append(Expense.amount >= expense_filter.min_amount)
+    if expense_filter.max_amount is not None:
+        conditions.append(Expense.amount <= expense_filter.max_amount)
+    if expense_filter.description_contains:
+        conditions.append(Expense.description.icontains(expense_filter.description_contains, autoescape=True))
+    if expense_filter.shared_only:
+        conditions.append(exists().where(SharedExpense.expense_id == Expense.id))
+    return conditions
+
+
+def row_limit(max_rows: int | None) -> int:
+    """The lower of the requested and the configured bulk row limit"""
+    if max_rows is None:
+        return settings.EXPENSE_BULK_MAX_ROWS
+    return min(max_rows, settings.EXPENSE_BULK_MAX_ROWS)
+
+
+def select_fields(selection: FieldSelection) -> Select:
+    """
+    SELECT of only the columns behind the selected ExpenseResponse fields,
+    joining category and user only when a field of theirs is selected.
+    Nested columns are labeled "<relation>__<field>".
+    """
+    columns = [Expense.created_at.label("cursor_created_at"), Expense.id.label("cursor_id")]
+    relations = []
+    for name, subfields in selection:
+        if subfields is None:
+            columns.append(getattr(Expense, name).label(name))
+        else:
+            related = Expense.__mapper__.relationships[name].mapper.class_
+            columns.extend(getattr(related, sub).label(f"{name}__{sub}") for sub in subfields)
+            relations.append(getattr(Expense, name))
+    query = select(*columns).select_from(Expense)
+    for relation in relations:
+        query = query.join(relation)
+    return query
+
+
+def row_versions(model) -> tuple:
+    """
+    Count and order-independent hash of (id, xmin) over the rows of model.
+
+    xmin is the transaction that wrote a row version, so any insert, update
+    or delete changes the pair once it is visible, whenever the writer
+    started. Timestamps taken at transaction start can not do that: a write
+    that commits late may carry an older updated_at than one already seen.
+    """
+    xmin = literal_column(f"{model.__table__.name}.xmin")
+    return func.count(model.id), func.coalesce(func.sum(func.hashtext(func.concat(model.id, ":", xmin))), 0)
+
+
+@traced
+class ExpenseService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def get_expense(self, user_id: uuid.UUID, expense_id: uuid.UUID) -> Expense:
+        """An expense of user_id with its category and user"""
+        query = (
+            select(Expense)
+            .options(joinedload(Expense.category, innerjoin=True), joinedload(Expense.user, innerjoin=True))
+            .where(Expense.id == expense_id, Expense.user_id == user_id)
+        )
+        expense = await self.db_session.scalar(query)
+        if expense is None:
+            raise ExpenseNotFoundError(f"Expense with ID {expense_id} not found")
+        return expense
+
+    async def list_expenses(
+        self,
+        user_id: uuid.UUID,
+        expense_filter: ExpenseFilter,
+        selection: FieldSelection,
+        limit: int,
+        cursor: str | None = None
+    ) -> ExpensePage:
+        """Expenses of user_id matching expense_filter, newest first, with only the selected fields"""
+        query = (
+            select_fields(selection)
+            .where(*filter_conditions(user_id, expense_filter))
+            .order_by(Expense.created_at.desc(), Expense.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            query = query.where(tuple_(Expense.created_at, Expense.id) < tuple_(*decode_cursor(cursor)))
+
+        rows = (await self.db_session.execute(query)).mappings().all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["cursor_created_at"], rows[-1]["cursor_id"])
+        model = partial_model(ExpenseResponse, selection)
+        return ExpensePage(
+            items=[
+                model.model_validate({
+                    name: row[name] if subfields is None else {sub: row[f"{name}__{sub}"] for sub in subfields}
+                    for name, subfields in selection
+                }).model_dump(mode="json")
+                for row in rows
+            ],
+            next_cursor=next_cursor
+        )
+
+    async def get_expense_version(self, user_id: uuid.UUID, expense_id: uuid.UUID) -> Row:
+        """
+        When an expense and the category and user embedded in its response
+        were last updated, read from the index-sized columns only.
+        """
+        query = (
+            select(Expense.updated_at, Category.updated_at, User.updated_at)
+            .join(Category, Category.id == Expense.category_id)
+            .join(User, User.id == Expense.user_id)
+            .where(Expense.id == expense_id, Expense.user_id == user_id)
+        )
+        version = (await self.db_session.execute(query)).one_or_none()
+        if version is None:
+            raise ExpenseNotFoundError(f"Expense with ID {expense_id} not found")
+        return version
+
+    async def get_collection_version(self, user_id: uuid.UUID, include_shares: bool = False) -> tuple:
+        """
+        Aggregate version of everything derived from the expenses of user_id.
+
+        Built from row_versions of the expenses, the categories visible to
+        user_id and, with include_shares, the shares of the expenses.
+        """
+        version = tuple((await self.db_session.execute(
+            select(*row_versions(Expense)).where(Expense.user_id == user_id)
+        )).one())
+        version += tuple((await self.db_session.execute(
+            select(*row_versions(Category)).where(or_(Category.user_id.is_(None), Category.user_id == user_id))
+        )).one())
+        if include_shares:
+            version += tuple((await self.db_session.execute(
+                select(*row_versions(SharedExpense))
+                .join(Expense, Expense.id == SharedExpense.expense_id)
+                .where(Expense.user_id == user_id)
+            )).one())
+        return version
+
+    async def get_analytics(self, user_id: uuid.UUID, expense_filter: ExpenseFilter) -> ExpenseAnalytics:
+        """Totals of the expenses of user_id matching expense_filter, overall, per category and per month"""
+        conditions = filter_conditions(user_id, expense_filter)
+        total, average = (await self.db_session.execute(
+            select(
+                func.coalesce(func.sum(Expense.amount), ZERO),
+                func.coalesce(func.round(func.avg(Expense.amount), 2), ZERO)
+            ).where(*conditions)
+        )).one()
+
+        category_total = func.sum(Expense.amount)
+        by_category = await self.db_session.execute(
+            select(Category.name, category_total)
+            .join(Category, Category.id == Expense.category_id)
+            .where(*conditions)
+            .group_by(Category.id, Category.name)
+            .order_by(category_total.desc(), Category.name)
+        )
+        month = func.to_char(Expense.date, "YYYY-MM")
+        by_month = await self.db_session.execute(
+            select(month, func.sum(Expense.amount)).where(*conditions).group_by(month).order_by(month)
+        )
+        return ExpenseAnalytics(
+            total_amount=total,
+            average_amount=average,
+            category_breakdown=[{name: amount} for name, amount in by_category],
+            monthly_totals=[{label: amount} for label, amount in by_month],
+        )
+
+    async def apply_batch(self, user_id: uuid.UUID, batch: ExpenseBatchRequest) -> ExpenseBatchResult:
+        """
+        Apply mixed create/update/delete operations in one transaction.
+
+        All operations are validated up front with a fixed number of queries,
+        then applied with one multi-row INSERT, one executemany UPDATE and
+        one DELETE. Shares of updated or deleted expenses are adjusted
+        through `apply_share_changes`. An atomic batch with any invalid
+        operation is rolled back as a whole; otherwise invalid operations
+        are skipped and reported.
+        """
+        operations = batch.operations
+        existing = await self._lock_existing(
+            {operation.id for operation in operations if operation.id is not None}
+        )
+        visible_categories = await self._visible_categories(user_id, {
+            operation.data.category_id
+            for operation in operations
+            if not isinstance(operation, ExpenseBatchDelete) and operation.data.category_id is not None
+        })
+
+        errors: dict[int, str] = {}
+        seen: set[uuid.UUID] = set()
+        for index, operation in enumerate(operations):
+            detail = None
+            if operation.id is not None and operation.id in seen:
+                detail = f"Expense with ID {operation.id} is used by more than one operation"
+            elif isinstance(operation, ExpenseBatchCreate):
+                if operation.id is not None and operation.id in existing:
+                    detail = f"Expense with ID {operation.id} already exists"
+                elif operation.data.category_id not in visible_categories:
+                    detail = f"Category with ID {operation.data.category_id} not found"
+            else:
+                row = existing.get(operation.id)
+                if row is None or row.user_id != user_id:
+                    detail = f"Expense with ID {operation.id} not found"
+                elif isinstance(operation, ExpenseBatchUpdate) and operation.data.category_id is not None \
+                        and operation.data.category_id not in visible_categories:
+                    detail = f"Category with ID {operation.data.category_id} not found"
+            if operation.id is not None:
+                seen.add(operation.id)
+            if detail is not None:
+                errors[index] = detail
+
+        if errors and batch.atomic:
+            await self.db_session.rollback()
+            return ExpenseBatchResult(committed=False, results=[
+                ExpenseBatchItemResult(
+                    index=index, op=operation.op, id=operation.id, ok=False,
+                    detail=errors.get(index, NOT_APPLIED)
+                )
+                for index, operation in enumerate(operations)
+            ])
+
+        valid = [(index, operation) for index, operation in enumerate(operations) if index not in errors]
+        creates = [(index, op) for index, op in valid if isinstance(op, ExpenseBatchCreate)]
+        updates = [(index, op) for index, op in valid if isinstance(op, ExpenseBatchUpdate)]
+        deletes = [(index, op) for index, op in valid if isinstance(op, ExpenseBatchDelete)]
+
+        expenses: dict[int, Expense] = {}
+        if creates:
+            rows = [
+                {"id": op.id or uuid.uuid4(), **op.data.model_dump(), "user_id": user_id}
+                for _, op in creates
+            ]
+            statement = insert(Expense).returning(Expense, sort_by_parameter_order=True)
+            created = (await self.db_session.scalars(statement, rows)).all()
+            expenses.update(zip((index for index, _ in creates), created))
+
+        # Shares follow the amount of their expense, and disappear with it
+        new_amounts = {
+            op.id: op.data.amount
+            for _, op in updates
+            if op.data.amount is not None and op.data.amount != existing[op.id].amount
+        }
+        deleted_ids = [op.id for _, op in deletes]
+        await self._adjust_shares(existing, new_amounts, deleted_ids)
+
+        update_params = [{"id": op.id, **update_values(op)} for _, op in updates if update_values(op)]
+        if update_params:
+            await self.db_session.execute(update(Expense), update_params)
+        if updates:
+            query = (
+                select(Expense)
+                .where(Expense.id.in_([op.id for _, op in updates]))
+                .execution_options(populate_existing=True)
+            )
+            updated = {expense.id: expense for expense in await self.db_session.scalars(query)}
+            expenses.update((index, updated[op.id]) for index, op in updates)
+
+        if deleted_ids:
+            await self.db_session.execute(
+                delete(Expense)
+                .where(Expense.id.in_(deleted_ids))
+                .execution_options(synchronize_session=False)
+            )
+            await record_deletions(self.db_session, [("expense", expense_id, user_id) for expense_id in deleted_ids])
+
+        await publish_changes(self.db_session, [
+            EntityChange("expense", op.id if op.id is not None else expenses[index].id, user_id)
+            for index, op in valid
+        ])
+        await self.db_session.commit()
+
+        return ExpenseBatchResult(committed=True, results=[
+            ExpenseBatchItemResult(
+                index=index,
+                op=operation.op,
+                id=expenses[index].id if index in expenses else operation.id,
+                ok=index not in errors,
+                detail=errors.get(index),
+                expense=ExpenseInDB.model_validate(expenses[index]) if index in expenses else None
+            )
+            for index, operation in enumerate(operations)
+        ])
+
+    async def bulk_update(self, user_id: uuid.UUID, request: ExpenseBulkUpdate) -> ExpenseBulkResult:
+        """
+        Apply one patch to every expense of user_id matching a filter.
+
+        The matching rows are locked and counted first so the row limit is
+        enforced before anything is written, then changed with a single
+        UPDATE. Shares follow an amount change in the same transaction.
+        """
+        values = {field: value for field, value in request.patch.model_dump().items() if value is not None}
+        if "category_id" in values and not await self._visible_categories(user_id, {values["category_id"]}):
+            raise CategoryNotFoundError(f"Category with ID {values['category_id']} not found")
+
+        conditions = filter_conditions(user_id, request.filter)
+        if request.dry_run:
+            return ExpenseBulkResult(matched=await self._count(conditions), affected=0, dry_run=True)
+
+        existing = await self._lock_matching(conditions, row_limit(request.max_rows))
+        if existing:
+            if "amount" in values:
+                await self._adjust_shares(existing, {
+                    expense_id: values["amount"]
+                    for expense_id, row in existing.items()
+                    if row.amount != values["amount"]
+                }, ())
+            await self.db_session.execute(
+                update(Expense)
+                .where(Expense.id.in_(existing.keys()))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await publish_changes(self.db_session, [
+                EntityChange("expense", expense_id, user_id) for expense_id in existing
+            ])
+        await self.db_session.commit()
+        return ExpenseBulkResult(matched=len(existing), affected=len(existing), dry_run=False)
+
+    async def bulk_delete(self, user_id: uuid.UUID, request: ExpenseBulkDelete) -> ExpenseBulkResult:
+        """
+        Delete every expense of user_id matching a filter.
+
+        Like `bulk_update`, the row limit is enforced on the locked rows
+        before the single DELETE. Shares are removed by the database
+        cascade after their balances were reversed.
+        """
+        conditions = filter_conditions(user_id, request.filter)
+        if request.dry_run:
+            return ExpenseBulkResult(matched=await self._count(conditions), affected=0, dry_run=True)
+
+        existing = await self._lock_matching(conditions, row_limit(request.max_rows))
+        if existing:
+            await self._adjust_shares(existing, {}, existing.keys())
+            await self.db_session.execute(
+                delete(Expense)
+                .where(Expense.id.in_(existing.keys()))
+                .execution_options(synchronize_session=False)
+            )
+            await record_deletions(self.db_session, [("expense", expense_id, user_id) for expense_id in existing])
+            await publish_changes(self.db_session, [
+                EntityChange("expense", expense_id, user_id) for expense_id in existing
+            ])
+        await self.db_session.commit()
+        return ExpenseBulkResult(matched=len(existing), affected=len(existing), dry_run=False)
+
+    async def _count(self, conditions: list) -> int:
+        query = select(func.count()).select_from(Expense).where(*conditions)
+        return (await self.db_session.execute(query)).scalar_one()
+
+    async def _lock_matching(self, conditions: list, limit: int) -> dict:
+        """Lock the expenses matching conditions in id order, refusing more than limit"""
+        query = (
+            select(Expense.id, Expense.user_id, Expense.amount, Expense.group_id)
+            .where(*conditions)
+            .order_by(Expense.id)
+            .limit(limit + 1)
+            .with_for_update()
+        )
+        rows = {row.id: row for row in await self.db_session.execute(query)}
+        if len(rows) > limit:
+            await self.db_session.rollback()
+            raise BulkLimitExceededError(
+                f"More than {limit} expenses match the filter, narrow it down")
+        return rows
+
+    async def _lock_existing(self, expense_ids: set[uuid.UUID]) -> dict:
+        """Existing expenses among expense_ids, locked in id order"""
+        if not expense_ids:
+            return {}
+        query = (
+            select(Expense.id, Expense.user_id, Expense.amount, Expense.group_id)
+            .where(Expense.id.in_(expense_ids))
+            .order_by(Expense.id)
+            .with_for_update()
+        )
+        return {row.id: row for row in await self.db_session.execute(query)}
+
+    async def _visible_categories(self, user_id: uuid.UUID, category_ids: set[uuid.UUID]) -> set[uuid.UUID]:
+        """The system categories and categories of user_id among category_ids"""
+        if not category_ids:
+            return set()
+        query = select(Category.id).where(
+            Category.id.in_(category_ids),
+            or_(Category.user_id.is_(None), Category.user_id == user_id)
+        )
+        return set((await self.db_session.scalars(query)).all())
+
+    async def _adjust_shares(
+        self, existing: dict, new_amounts: dict[uuid.UUID, Decimal], deleted_ids: Iterable[uuid.UUID]
+    ) -> None:
+        deleted_ids = set(deleted_ids)
+        expense_ids = new_amounts.keys() | deleted_ids
+        if not expense_ids:
+            return
+        query = (
+            select(SharedExpense)
+            .where(SharedExpense.expense_id.in_(expense_ids))
+            .order_by(SharedExpense.id)
+            .with_for_update()
+        )
+        changes = []
+        for share in await self.db_session.scalars(query):
+            expense = existing[share.expense_id]
+            deleted = share.expense_id in deleted_ids
+            new_amount = new_amounts.get(share.expense_id, expense.amount)
+            changes.append(ShareChange(
+                owner_id=expense.user_id,
+                shared_with_user_id=share.shared_with_user_id,
+                old_status=share.status,
+                new_status=None if deleted else share.status,
+                old_amount=share_amount(expense.amount, share.split_percentage),
+                new_amount=ZERO if deleted else share_amount(new_amount, share.split_percentage),
+                group_id=expense.group_id,
+                shared_expense_id=share.id
+            ))
+        await apply_share_changes(self.db_session, changes)
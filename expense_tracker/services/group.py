@@ -0,0 +1,291 @@
+# expense_tracker/services/group.py
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from expense_tracker.core.exceptions import (
+    GroupMembershipError,
+    GroupNotFoundError,
+    PermissionDeniedError,
+    UserNotFoundError,
+)
+from expense_tracker.core.invalidation import EntityChange, publish_changes
+from expense_tracker.core.money import allocate_largest_remainder, share_amount
+from expense_tracker.core.pagination import decode_cursor, encode_cursor
+from expense_tracker.core.singleflight import register_flight
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.expense import Expense
+from expense_tracker.models.group import Group, GroupMember
+from expense_tracker.models.shared_expense import SharedExpense, SharedExpenseStatus
+from expense_tracker.models.user import User
+from expense_tracker.schemas.expense import ExpenseInDB
+from expense_tracker.schemas.group import (
+    GroupCreate,
+    GroupExpense,
+    GroupExpenseCreate,
+    GroupFeedPage,
+    GroupResponse,
+)
+from expense_tracker.schemas.shared_expense import SharedExpenseInDB
+from expense_tracker.services.category import CategoryService
+from expense_tracker.services.shared_expense import ShareChange, apply_share_changes
+
+MAX_GROUP_MEMBERS = 100
+
+T = TypeVar("T")
+
+group_flight = register_flight("group")
+
+
+@traced
+class GroupService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def create_group(self, user_id: uuid.UUID, group_data: GroupCreate) -> GroupResponse:
+        """Create a group with user_id and the given users as members"""
+        member_ids = {user_id, *group_data.member_ids}
+        await self._check_users_exist(member_ids)
+
+        group = Group(name=group_data.name, created_by_id=user_id)
+        self.db_session.add(group)
+        await self.db_session.flush()
+        await self.db_session.execute(insert(GroupMember), [
+            {"id": uuid.uuid4(), "group_id": group.id, "user_id": member_id}
+            for member_id in sorted(member_ids)
+        ])
+        await self.db_session.commit()
+        return await self._fresh_group(user_id, group.id)
+
+    async def list_groups(self, user_id: uuid.UUID) -> list[Group]:
+        """Groups user_id is a member of, most recently joined first"""
+        query = (
+            select(Group)
+            .join(GroupMember, GroupMember.group_id == Group.id)
+            .where(GroupMember.user_id == user_id)
+            .order_by(GroupMember.created_at.desc())
+        )
+        return list((await self.db_session.scalars(query)).all())
+
+    async def get_group(self, user_id: uuid.UUID, group_id: uuid.UUID) -> GroupResponse:
+        """
+        A group with its members and cached balances, if user_id is a member.
+
+        Concurrent requests for the same group share one query.
+        """
+        group = await group_flight.do(("group", group_id), lambda: self._read(self._load_group, group_id))
+        return self._visible_group(user_id, group_id, group)
+
+    async def _fresh_group(self, user_id: uuid.UUID, group_id: uuid.UUID) -> GroupResponse:
+        """Like get_group but uncoalesced, so a writer sees its own write"""
+        group = await self._load_group(self.db_session, group_id)
+        return self._visible_group(user_id, group_id, group)
+
+    @staticmethod
+    async def _load_group(session: AsyncSession, group_id: uuid.UUID) -> Optional[GroupResponse]:
+        query = (
+            select(Group)
+            .options(selectinload(Group.members))
+            .where(Group.id == group_id)
+            .execution_options(populate_existing=True)
+        )
+        group = (await session.execute(query)).scalar_one_or_none()
+        return GroupResponse.model_validate(group) if group is not None else None
+
+    @staticmethod
+    def _visible_group(user_id: uuid.UUID, group_id: uuid.UUID, group: Optional[GroupResponse]) -> GroupResponse:
+        if group is None or user_id not in {member.user_id for member in group.members}:
+            raise GroupNotFoundError(f"Group with ID {group_id} not found")
+        return group
+
+    async def add_member(self, user_id: uuid.UUID, group_id: uuid.UUID, new_member_id: uuid.UUID) -> GroupResponse:
+        """Add a user to a group; only the group creator can do this"""
+        group = await self._get_managed_group(user_id, group_id)
+        await self._check_users_exist({new_member_id})
+
+        members = await self._member_ids(group.id)
+        if new_member_id in members:
+            raise GroupMembershipError("The user is already a member of the group")
+        if len(members) >= MAX_GROUP_MEMBERS:
+            raise GroupMembershipError(f"A group can have at most {MAX_GROUP_MEMBERS} members")
+
+        self.db_session.add(GroupMember(group_id=group.id, user_id=new_member_id))
+        await self.db_session.commit()
+        return await self._fresh_group(user_id, group.id)
+
+    async def remove_member(self, user_id: uuid.UUID, group_id: uuid.UUID, member_id: uuid.UUID) -> None:
+        """
+        Remove a member from a group. The creator can remove anyone but
+        themselves, other members can only leave. Members with an unsettled
+        balance can not be removed, since it could no longer be tracked.
+        """
+        query = (
+            select(GroupMember)
+            .options(selectinload(GroupMember.group))
+            .where(GroupMember.group_id == group_id, GroupMember.user_id == member_id)
+            .with_for_update(of=GroupMember)
+        )
+        member = (await self.db_session.execute(query)).scalar_one_or_none()
+        if member is None:
+            await self._member_ids(group_id, required_member=user_id)
+            raise GroupMembershipError("The user is not a member of the group")
+
+        group = member.group
+        if user_id == member_id:
+            if user_id == group.created_by_id:
+                raise GroupMembershipError("The creator of a group can not leave it")
+        elif user_id != group.created_by_id:
+            await self._member_ids(group_id, required_member=user_id)
+            raise PermissionDeniedError("Only the creator of a group can remove other members")
+        if member.balance != 0:
+            raise GroupMembershipError(f"The member has an unsettled group balance of {member.balance}")
+
+        await self.db_session.delete(member)
+        await self.db_session.commit()
+
+    async def get_feed(
+        self, user_id: uuid.UUID, group_id: uuid.UUID, limit: int, cursor: Optional[str] = None
+    ) -> GroupFeedPage:
+        """
+        Expenses of a group with their shares, newest first.
+
+        Concurrent requests for the same page share one query; membership
+        is still checked per user.
+        """
+        await self._member_ids(group_id, required_member=user_id)
+        cursor_position = decode_cursor(cursor) if cursor is not None else None
+        return await group_flight.do(
+            ("feed", group_id, limit, cursor),
+            lambda: self._read(self._load_feed, group_id, limit, cursor_position)
+        )
+
+    @staticmethod
+    async def _load_feed(
+        session: AsyncSession,
+        group_id: uuid.UUID,
+        limit: int,
+        cursor_position: Optional[tuple[datetime, uuid.UUID]]
+    ) -> GroupFeedPage:
+        query = (
+            select(Expense)
+            .options(selectinload(Expense.shared_expenses))
+            .where(Expense.group_id == group_id)
+            .order_by(Expense.created_at.desc(), Expense.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor_position is not None:
+            query = query.where(tuple_(Expense.created_at, Expense.id) < tuple_(*cursor_position))
+
+        expenses = list((await session.scalars(query)).all())
+        next_cursor = None
+        if len(expenses) > limit:
+            expenses = expenses[:limit]
+            next_cursor = encode_cursor(expenses[-1].created_at, expenses[-1].id)
+        return GroupFeedPage(
+            items=[GroupExpense.model_validate(expense) for expense in expenses],
+            next_cursor=next_cursor
+        )
+
+    async def create_group_expense(
+        self, user_id: uuid.UUID, group_id: uuid.UUID, expense_data: GroupExpenseCreate
+    ) -> GroupExpense:
+        """
+        Record an expense paid by user_id and split it equally among members.
+
+        The shares of all participants are written with one bulk INSERT and
+        start out accepted, since members agreed to share expenses by joining
+        the group. Member rows are locked for update, in user order, before
+        their balances are changed: nobody can leave meanwhile, and concurrent
+        group expenses queue up instead of deadlocking on a lock upgrade.
+        """
+        members = await self._member_ids(group_id, required_member=user_id, lock=True)
+        participants = set(expense_data.member_ids) if expense_data.member_ids is not None else members
+        if not participants <= members:
+            raise GroupMembershipError("Expenses can only be split among group members")
+
+        await CategoryService(self.db_session).get_visible_category(user_id, expense_data.category_id)
+
+        expense = Expense(
+            **expense_data.model_dump(exclude={"member_ids"}),
+            user_id=user_id,
+            group_id=group_id
+        )
+        self.db_session.add(expense)
+        await self.db_session.flush()
+
+        # The payer's own part is allocated too, so rounding treats everyone alike
+        debtors = sorted(participants - {user_id})
+        parts = allocate_largest_remainder(10_000, [1] * (len(debtors) + 1))[1:]
+        percentages = [Decimal(part) / 100 for part in parts]
+
+        shares: list[SharedExpense] = []
+        if debtors:
+            result = await self.db_session.scalars(insert(SharedExpense).returning(SharedExpense), [
+                {
+                    "id": uuid.uuid4(),
+                    "expense_id": expense.id,
+                    "shared_with_user_id": debtor_id,
+                    "split_percentage": percentage,
+                    "status": SharedExpenseStatus.ACCEPTED,
+                    "version": 1,
+                }
+                for debtor_id, percentage in zip(debtors, percentages)
+            ])
+            shares = list(result.all())
+            await apply_share_changes(self.db_session, [
+                ShareChange(
+                    owner_id=user_id,
+                    shared_with_user_id=share.shared_with_user_id,
+                    old_status=None,
+                    new_status=share.status,
+                    new_amount=share_amount(expense.amount, share.split_percentage),
+                    group_id=group_id,
+                    shared_expense_id=share.id
+                )
+                for share in shares
+            ])
+        await publish_changes(self.db_session, [EntityChange("expense", expense.id, user_id)])
+        await self.db_session.commit()
+        await self.db_session.refresh(expense)
+
+        return GroupExpense(
+            **ExpenseInDB.model_validate(expense).model_dump(),
+            shared_expenses=[SharedExpenseInDB.model_validate(share) for share in shares]
+        )
+
+    async def _read(self, load: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """Run a coalesced read in its own session, independent of any one request"""
+        async with AsyncSession(self.db_session.bind, expire_on_commit=False) as session:
+            return await load(session, *args)
+
+    async def _get_managed_group(self, user_id: uuid.UUID, group_id: uuid.UUID) -> Group:
+        group = await self.db_session.get(Group, group_id)
+        if group is None:
+            raise GroupNotFoundError(f"Group with ID {group_id} not found")
+        if group.created_by_id != user_id:
+            await self._member_ids(group_id, required_member=user_id)
+            raise PermissionDeniedError("Only the creator of a group can add members")
+        return group
+
+    async def _member_ids(
+        self, group_id: uuid.UUID, *, required_member: Optional[uuid.UUID] = None, lock: bool = False
+    ) -> set[uuid.UUID]:
+        """Members of a group, raising GroupNotFoundError unless required_member is one"""
+        query = select(GroupMember.user_id).where(GroupMember.group_id == group_id)
+        if lock:
+            query = query.order_by(GroupMember.user_id).with_for_update()
+        members = set((await self.db_session.scalars(query)).all())
+        if required_member is not None and required_member not in members:
+            raise GroupNotFoundError(f"Group with ID {group_id} not found")
+        return members
+
+    async def _check_users_exist(self, user_ids: set[uuid.UUID]) -> None:
+        query = select(User.id).where(User.id.in_(user_ids))
+        missing = user_ids - set((await self.db_session.scalars(query)).all())
+        if missing:
+            raise UserNotFoundError(f"User with ID {sorted(missing)[0]} not found")
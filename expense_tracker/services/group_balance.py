@@ -0,0 +1,61 @@
+# expense_tracker/services/group_balance.py
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.group import GroupMember
+from expense_tracker.services.ledger import ZERO
+
+# Core table so the executemany UPDATE is keyed by (group_id, user_id), not the primary key
+_member_table = GroupMember.__table__
+
+
+@traced
+class GroupBalanceService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def apply_deltas(
+        self, deltas: Iterable[tuple[Optional[uuid.UUID], uuid.UUID, uuid.UUID, Decimal]]
+    ) -> None:
+        """
+        Add (group, creditor, debtor, amount) deltas to cached member balances.
+
+        Deltas of expenses outside any group are ignored. Does not commit:
+        callers run this in the transaction that changed the shared expenses.
+        Members are updated in a fixed order so concurrent writers lock rows
+        in the same sequence. Users who are not (or no longer) members of the
+        group have no balance to update.
+        """
+        totals: dict[tuple[uuid.UUID, uuid.UUID], Decimal] = defaultdict(lambda: ZERO)
+        for group_id, creditor_id, debtor_id, amount in deltas:
+            if group_id is None or amount == 0 or creditor_id == debtor_id:
+                continue
+            totals[(group_id, creditor_id)] += amount
+            totals[(group_id, debtor_id)] -= amount
+
+        params = [
+            {"b_group_id": group_id, "b_user_id": user_id, "delta": amount}
+            for (group_id, user_id), amount in sorted(totals.items())
+            if amount != 0
+        ]
+        if not params:
+            return
+
+        statement = (
+            update(_member_table)
+            .where(
+                _member_table.c.group_id == bindparam("b_group_id"),
+                _member_table.c.user_id == bindparam("b_user_id")
+            )
+            .values(
+                balance=_member_table.c.balance + bindparam("delta"),
+                updated_at=func.now()
+            )
+        )
+        await self.db_session.execute(statement, params)
@@ -0,0 +1,145 @@
+# expense_tracker/services/inbox.py
+import uuid
+from collections import Counter, defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from expense_tracker.core.pagination import decode_cursor, encode_cursor
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.inbox import InboxCounter
+from expense_tracker.models.shared_expense import SharedExpense, SharedExpenseStatus
+from expense_tracker.schemas.inbox import InboxCounts, InboxItem, InboxPage
+
+COUNTER_COLUMNS = {status: status.value for status in SharedExpenseStatus}
+
+
+@traced
+class InboxService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def apply_deltas(self, deltas: Iterable[tuple[uuid.UUID, SharedExpenseStatus, int]]) -> None:
+        """
+        Add (user, status, delta) changes to the inbox counters in one statement.
+
+        Does not commit: callers run this in the transaction that changed the
+        shared expenses. Users are upserted in a fixed order so concurrent
+        writers lock counter rows in the same sequence.
+        """
+        totals: dict[uuid.UUID, Counter] = defaultdict(Counter)
+        for user_id, status, delta in deltas:
+            if delta:
+                totals[user_id][COUNTER_COLUMNS[status]] += delta
+
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                **{column: counts[column] for column in COUNTER_COLUMNS.values()},
+            }
+            for user_id, counts in sorted(totals.items())
+            if any(counts.values())
+        ]
+        if not rows:
+            return
+
+        statement = insert(InboxCounter).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[InboxCounter.user_id],
+            set_={
+                **{
+                    column: getattr(InboxCounter, column) + getattr(statement.excluded, column)
+                    for column in COUNTER_COLUMNS.values()
+                },
+                "updated_at": func.now(),
+            }
+        )
+        await self.db_session.execute(statement)
+
+    async def get_counts(self, user_id: uuid.UUID) -> InboxCounts:
+        query = select(InboxCounter).where(InboxCounter.user_id == user_id)
+        counter = (await self.db_session.execute(query)).scalar_one_or_none()
+        if counter is None:
+            return InboxCounts()
+        return InboxCounts.model_validate(counter)
+
+    async def get_inbox(
+        self,
+        user_id: uuid.UUID,
+        status: SharedExpenseStatus,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> InboxPage:
+        """Expenses shared with user_id in one status, newest first"""
+        query = (
+            select(SharedExpense)
+            .options(joinedload(SharedExpense.expense, innerjoin=True))
+            .where(
+                SharedExpense.shared_with_user_id == user_id,
+                SharedExpense.status == status
+            )
+            .order_by(SharedExpense.created_at.desc(), SharedExpense.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            created_at, row_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(SharedExpense.created_at, SharedExpense.id) < tuple_(created_at, row_id)
+            )
+
+        shares = list((await self.db_session.execute(query)).scalars())
+        next_cursor = None
+        if len(shares) > limit:
+            shares = shares[:limit]
+            next_cursor = encode_cursor(shares[-1].created_at, shares[-1].id)
+        return InboxPage(
+            items=[InboxItem.model_validate(share) for share in shares],
+            next_cursor=next_cursor
+        )
+
+    async def rebuild(self) -> int:
+        """
+        Recount every user's inbox from shared expenses and commit.
+
+        Used to backfill the counters or repair them after writes that
+        bypassed the shared expense service. Counter writers are blocked
+        meanwhile so no change is lost. Returns the number of users.
+        """
+        await self.db_session.execute(text("LOCK TABLE inbox_counter IN SHARE ROW EXCLUSIVE MODE"))
+
+        query = select(
+            SharedExpense.shared_with_user_id,
+            SharedExpense.status,
+            func.count()
+        ).group_by(SharedExpense.shared_with_user_id, SharedExpense.status)
+
+        counts: dict[uuid.UUID, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(COUNTER_COLUMNS.values(), 0)
+        )
+        for user_id, status, count in await self.db_session.execute(query):
+            counts[user_id][COUNTER_COLUMNS[status]] = count
+
+        # Users whose shares are all gone still need their counters zeroed
+        for (user_id,) in await self.db_session.execute(select(InboxCounter.user_id)):
+            counts[user_id]
+
+        if counts:
+            rows = [
+                {"id": uuid.uuid4(), "user_id": user_id, **columns}
+                for user_id, columns in sorted(counts.items())
+            ]
+            statement = insert(InboxCounter).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[InboxCounter.user_id],
+                set_={
+                    **{column: getattr(statement.excluded, column) for column in COUNTER_COLUMNS.values()},
+                    "updated_at": func.now(),
+                }
+            )
+            await self.db_session.execute(statement)
+        await self.db_session.commit()
+        return len(counts)
@@ -0,0 +1,162 @@
+# expense_tracker/services/ledger.py
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import case, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.balance import UserBalance
+from expense_tracker.models.expense import Expense
+from expense_tracker.models.shared_expense import SharedExpense, SharedExpenseStatus
+from expense_tracker.schemas.balance import BalanceDrift, BalanceResponse, ReconciliationReport
+
+ZERO = Decimal("0.00")
+
+# Statuses whose share is still owed to the expense owner
+OUTSTANDING_STATUSES = frozenset({SharedExpenseStatus.ACCEPTED})
+
+PairKey = tuple[uuid.UUID, uuid.UUID]
+
+
+def ordered_pair(creditor_id: uuid.UUID, debtor_id: uuid.UUID, amount: Decimal) -> tuple[PairKey, Decimal]:
+    """Map "debtor owes creditor amount" onto the (user_a, user_b) storage convention"""
+    if creditor_id < debtor_id:
+        return (creditor_id, debtor_id), amount
+    return (debtor_id, creditor_id), -amount
+
+
+@traced
+class LedgerService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def apply_deltas(self, deltas: Iterable[tuple[uuid.UUID, uuid.UUID, Decimal]]) -> None:
+        """
+        Add (creditor, debtor, amount) deltas to the ledger in one statement.
+
+        Does not commit: callers run this in the transaction that changed the
+        shared expenses. Pairs are upserted in a fixed order so concurrent
+        writers lock ledger rows in the same sequence.
+        """
+        totals: dict[PairKey, Decimal] = defaultdict(lambda: ZERO)
+        for creditor_id, debtor_id, amount in deltas:
+            if amount == 0 or creditor_id == debtor_id:
+                continue
+            pair, signed = ordered_pair(creditor_id, debtor_id, amount)
+            totals[pair] += signed
+
+        rows = [
+            {"id": uuid.uuid4(), "user_a_id": a, "user_b_id": b, "amount": amount}
+            for (a, b), amount in sorted(totals.items())
+            if amount != 0
+        ]
+        if not rows:
+            return
+
+        statement = insert(UserBalance).values(rows)
+        statement = statement.on_conflict_do_update(
+            constraint="uq_user_balance_pair",
+            set_={
+                "amount": UserBalance.amount + statement.excluded.amount,
+                "updated_at": func.now(),
+            }
+        )
+        await self.db_session.execute(statement)
+
+    async def get_balances(self, user_id: uuid.UUID) -> list[BalanceResponse]:
+        """All non-zero balances of a user, positive when the other user owes them"""
+        query = select(
+            case(
+                (UserBalance.user_a_id == user_id, UserBalance.user_b_id),
+                else_=UserBalance.user_a_id
+            ).label("user_id"),
+            case(
+                (UserBalance.user_a_id == user_id, UserBalance.amount),
+                else_=-UserBalance.amount
+            ).label("amount"),
+            UserBalance.updated_at,
+        ).where(
+            or_(UserBalance.user_a_id == user_id, UserBalance.user_b_id == user_id),
+            UserBalance.amount != 0
+        ).order_by(UserBalance.updated_at.desc())
+        result = await self.db_session.execute(query)
+        return [BalanceResponse(**row) for row in result.mappings()]
+
+    async def get_balance(self, user_id: uuid.UUID, other_user_id: uuid.UUID) -> BalanceResponse:
+        """Net amount other_user_id owes user_id"""
+        (a, b), sign = ordered_pair(user_id, other_user_id, Decimal(1))
+        query = select(UserBalance.amount, UserBalance.updated_at).where(
+            UserBalance.user_a_id == a,
+            UserBalance.user_b_id == b
+        )
+        row = (await self.db_session.execute(query)).one_or_none()
+        if row is None:
+            return BalanceResponse(user_id=other_user_id, amount=ZERO)
+        return BalanceResponse(user_id=other_user_id, amount=row.amount * sign, updated_at=row.updated_at)
+
+    async def reconcile(self, *, fix: bool = False) -> ReconciliationReport:
+        """
+        Rebuild balances from shared expenses and report pairs that drifted.
+
+        Writers are blocked on the ledger for the duration so the comparison
+        is exact. With fix=True the drifted pairs are overwritten with the
+        rebuilt values and the transaction is committed.
+        """
+        await self.db_session.execute(text("LOCK TABLE user_balance IN SHARE ROW EXCLUSIVE MODE"))
+
+        owed = func.sum(func.round(Expense.amount * SharedExpense.split_percentage / 100, 2))
+        source_query = (
+            select(Expense.user_id, SharedExpense.shared_with_user_id, owed)
+            .select_from(SharedExpense)
+            .join(Expense, Expense.id == SharedExpense.expense_id)
+            .where(SharedExpense.status.in_(OUTSTANDING_STATUSES))
+            .group_by(Expense.user_id, SharedExpense.shared_with_user_id)
+        )
+        expected: dict[PairKey, Decimal] = defaultdict(lambda: ZERO)
+        for creditor_id, debtor_id, amount in await self.db_session.execute(source_query):
+            if creditor_id == debtor_id:
+                continue
+            pair, signed = ordered_pair(creditor_id, debtor_id, amount)
+            expected[pair] += signed
+
+        ledger_query = select(UserBalance.user_a_id, UserBalance.user_b_id, UserBalance.amount)
+        ledger = {
+            (a, b): amount
+            for a, b, amount in await self.db_session.execute(ledger_query)
+        }
+
+        drift = [
+            BalanceDrift(
+                user_a_id=a,
+                user_b_id=b,
+                ledger_amount=ledger.get((a, b), ZERO),
+                expected_amount=expected.get((a, b), ZERO),
+            )
+            for a, b in sorted(ledger.keys() | expected.keys())
+            if ledger.get((a, b), ZERO) != expected.get((a, b), ZERO)
+        ]
+
+        if fix and drift:
+            statement = insert(UserBalance).values([
+                {"id": uuid.uuid4(), "user_a_id": d.user_a_id, "user_b_id": d.user_b_id,
+                 "amount": d.expected_amount}
+                for d in drift
+            ])
+            statement = statement.on_conflict_do_update(
+                constraint="uq_user_balance_pair",
+                set_={"amount": statement.excluded.amount, "updated_at": func.now()}
+            )
+            await self.db_session.execute(statement)
+            await self.db_session.commit()
+        else:
+            await self.db_session.rollback()
+
+        return ReconciliationReport(
+            pairs_checked=len(ledger.keys() | expected.keys()),
+            drift=drift,
+            fixed=fix and bool(drift),
+        )
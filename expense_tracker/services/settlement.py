@@ -0,0 +1,134 @@
+# expense_tracker/services/settlement.py
+import heapq
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Hashable, Iterable, Mapping, TypeVar
+
+from sqlalchemy import and_, case, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.exceptions import PermissionDeniedError
+from expense_tracker.core.money import from_minor_units, to_minor_units
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.balance import UserBalance
+from expense_tracker.models.group import GroupMember
+from expense_tracker.schemas.balance import SettlementPlan, SettlementTransfer
+
+K = TypeVar("K", bound=Hashable)
+
+
+@dataclass(frozen=True, slots=True)
+class Transfer:
+    """Payment of amount cents from debtor to creditor"""
+    debtor: Hashable
+    creditor: Hashable
+    amount: int
+
+
+def net_positions(debts: Iterable[tuple[K, K, int]]) -> dict[K, int]:
+    """Collapse (creditor, debtor, cents) debts into a net position per member"""
+    positions: dict[K, int] = defaultdict(int)
+    for creditor, debtor, amount in debts:
+        positions[creditor] += amount
+        positions[debtor] -= amount
+    return positions
+
+
+def plan_transfers(positions: Mapping[K, int]) -> list[Transfer]:
+    """
+    Plan transfers that clear all net positions (in cents).
+
+    Greedy: repeatedly match the largest creditor with the largest debtor
+    using two max-heaps and transfer the smaller of the two amounts, which
+    zeroes at least one of them. This needs at most n - 1 transfers for n
+    members with a non-zero position and runs in O(n log n). Finding the
+    true minimum is NP-hard; the greedy plan is optimal or close to it in
+    practice. Ties are broken by member key so plans are deterministic.
+    """
+    if sum(positions.values()) != 0:
+        raise ValueError("Net positions must sum to zero")
+
+    creditors = [(-amount, member) for member, amount in positions.items() if amount > 0]
+    debtors = [(amount, member) for member, amount in positions.items() if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers: list[Transfer] = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debit, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debit)
+        transfers.append(Transfer(debtor=debtor, creditor=creditor, amount=amount))
+
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debit > amount:
+            heapq.heappush(debtors, (debit + amount, debtor))
+    return transfers
+
+
+@traced
+class SettlementService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def check_counterparties(self, user_id: uuid.UUID, user_ids: Iterable[uuid.UUID]) -> None:
+        """
+        Raise unless user_id is one of user_ids and every other user has a
+        balance with user_id or shares a group with them.
+        """
+        others = set(user_ids)
+        if user_id not in others:
+            raise PermissionDeniedError("You can only plan settlements you take part in")
+        others.discard(user_id)
+
+        counterparty = case((UserBalance.user_a_id == user_id, UserBalance.user_b_id), else_=UserBalance.user_a_id)
+        own_groups = select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+        query = union(
+            select(counterparty).where(
+                or_(UserBalance.user_a_id == user_id, UserBalance.user_b_id == user_id),
+                counterparty.in_(others)
+            ),
+            select(GroupMember.user_id).where(GroupMember.group_id.in_(own_groups), GroupMember.user_id.in_(others))
+        )
+        if others - set((await self.db_session.scalars(query)).all()):
+            raise PermissionDeniedError(
+                "You can only plan settlements with users you share expenses or a group with")
+
+    async def plan_for_users(self, user_id: uuid.UUID, user_ids: Iterable[uuid.UUID]) -> SettlementPlan:
+        """
+        Plan the transfers that settle user_id's balances with a set of users.
+
+        Only balances user_id is a party to are read, so balances between
+        the other users neither show up in nor change the plan. Balances
+        with users outside the set are left alone.
+        """
+        members = set(user_ids)
+        query = select(UserBalance.user_a_id, UserBalance.user_b_id, UserBalance.amount).where(
+            and_(
+                or_(UserBalance.user_a_id == user_id, UserBalance.user_b_id == user_id),
+                UserBalance.user_a_id.in_(members),
+                UserBalance.user_b_id.in_(members),
+                UserBalance.amount != 0
+            )
+        )
+        rows = (await self.db_session.execute(query)).all()
+
+        # A positive amount means user_b owes user_a
+        positions = net_positions(
+            (user_a_id, user_b_id, to_minor_units(amount))
+            for user_a_id, user_b_id, amount in rows
+        )
+        transfers = plan_transfers(positions)
+        return SettlementPlan(
+            pairwise_balances=len(rows),
+            transfers=[
+                SettlementTransfer(
+                    from_user_id=transfer.debtor,
+                    to_user_id=transfer.creditor,
+                    amount=from_minor_units(transfer.amount)
+                )
+                for transfer in transfers
+            ]
+        )
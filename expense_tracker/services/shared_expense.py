@@ -0,0 +1,522 @@
+# expense_tracker/services/shared_expense.py
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, func, insert, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from expense_tracker.core.exceptions import (
+    ExpenseNotFoundError,
+    InvalidShareError,
+    InvalidStatusTransitionError,
+    PermissionDeniedError,
+    SharedExpenseNotFoundError,
+    StaleVersionError,
+    UserNotFoundError,
+)
+from expense_tracker.core.invalidation import EntityChange, publish_changes
+from expense_tracker.core.money import allocate_largest_remainder, share_amount
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.expense import Expense
+from expense_tracker.models.shared_expense import SharedExpense, SharedExpenseStatus
+from expense_tracker.models.user import User
+from expense_tracker.schemas.shared_expense import (
+    SharedExpenseBatchCreate,
+    SharedExpenseBatchError,
+    SharedExpenseBatchItem,
+    SharedExpenseBatchResult,
+    SharedExpenseCreate,
+    SharedExpenseInDB,
+    SharedExpenseTransition,
+    SharedExpenseTransitionResult,
+    SharedExpenseUpdate,
+    SharedExpenseVersion,
+)
+from expense_tracker.services.group_balance import GroupBalanceService
+from expense_tracker.services.inbox import InboxService
+from expense_tracker.services.ledger import OUTSTANDING_STATUSES, ZERO, LedgerService
+from expense_tracker.services.sync import record_deletions
+
+ALLOWED_TRANSITIONS: dict[SharedExpenseStatus, frozenset[SharedExpenseStatus]] = {
+    SharedExpenseStatus.PENDING: frozenset({SharedExpenseStatus.ACCEPTED, SharedExpenseStatus.REJECTED}),
+    SharedExpenseStatus.ACCEPTED: frozenset({SharedExpenseStatus.SETTLED}),
+    SharedExpenseStatus.REJECTED: frozenset(),
+    SharedExpenseStatus.SETTLED: frozenset(),
+}
+
+# Transitions only the user the expense is shared with may make
+DEBTOR_ONLY_STATUSES = frozenset({SharedExpenseStatus.ACCEPTED, SharedExpenseStatus.REJECTED})
+
+MAX_SPLIT_PERCENTAGE = Decimal(100)
+
+
+@dataclass(frozen=True, slots=True)
+class ShareChange:
+    """
+    Before and after state of one shared expense.
+
+    A None status means the share did not exist before (creation) or does
+    not exist after (deletion). Amounts are the owed share, not the expense
+    total, and group_id is the group the expense was recorded in, if any.
+    Both users are notified of the change (see `core.events`).
+    Every write to shared expenses reports its changes through
+    `apply_share_changes` so derived aggregates stay in step.
+    """
+    owner_id: uuid.UUID
+    shared_with_user_id: uuid.UUID
+    old_status: Optional[SharedExpenseStatus]
+    new_status: Optional[SharedExpenseStatus]
+    old_amount: Decimal = ZERO
+    new_amount: Decimal = ZERO
+    group_id: Optional[uuid.UUID] = None
+    shared_expense_id: Optional[uuid.UUID] = None
+
+    @property
+    def status_deltas(self) -> list[tuple[SharedExpenseStatus, int]]:
+        """Changes of the per-status inbox counts of shared_with_user_id"""
+        if self.old_status == self.new_status:
+            return []
+        deltas = []
+        if self.old_status is not None:
+            deltas.append((self.old_status, -1))
+        if self.new_status is not None:
+            deltas.append((self.new_status, 1))
+        return deltas
+
+    @property
+    def balance_delta(self) -> Decimal:
+        """Change of the amount shared_with_user_id owes owner_id"""
+        before = self.old_amount if self.old_status in OUTSTANDING_STATUSES else ZERO
+        after = self.new_amount if self.new_status in OUTSTANDING_STATUSES else ZERO
+        return after - before
+
+
+async def apply_share_changes(db: AsyncSession, changes: Iterable[ShareChange]) -> None:
+    """Update derived aggregates for shared expense changes, without committing"""
+    changes = list(changes)
+    await LedgerService(db).apply_deltas(
+        (change.owner_id, change.shared_with_user_id, change.balance_delta)
+        for change in changes
+    )
+    await InboxService(db).apply_deltas(
+        (change.shared_with_user_id, status, delta)
+        for change in changes
+        for status, delta in change.status_deltas
+    )
+    await GroupBalanceService(db).apply_deltas(
+        (change.group_id, change.owner_id, change.shared_with_user_id, change.balance_delta)
+        for change in changes
+        if change.group_id is not None
+    )
+    await record_deletions(db, [
+        ("shared_expense", change.shared_expense_id, user_id)
+        for change in changes
+        if change.new_status is None and change.shared_expense_id is not None
+        for user_id in (change.owner_id, change.shared_with_user_id)
+    ])
+    await publish_changes(db, [
+        EntityChange("shared_expense", change.shared_expense_id, user_id)
+        for change in changes
+        if change.shared_expense_id is not None
+        for user_id in (change.owner_id, change.shared_with_user_id)
+    ])
+
+
+def split_percentages(item: SharedExpenseBatchItem) -> list[Decimal]:
+    """Explicit percentages as given, weighted ones allocated in hundredths of a percent"""
+    weights = [split.weight for split in item.splits if split.weight is not None]
+    weighted = []
+    if weights:
+        total = int(item.weighted_percentage * 100)
+        # The owner's part is allocated alongside so rounding treats everyone alike
+        parts = allocate_largest_remainder(total, [item.owner_weight, *weights])[1:]
+        weighted = [Decimal(part) / 100 for part in parts]
+
+    percentages = []
+    for split in item.splits:
+        if split.weight is None:
+            percentages.append(split.split_percentage)
+        else:
+            percentages.append(weighted.pop(0))
+    return percentages
+
+
+def batch_error(
+    item: SharedExpenseBatchItem, detail: str, shared_with_user_id: Optional[uuid.UUID] = None
+) -> SharedExpenseBatchError:
+    return SharedExpenseBatchError(
+        expense_id=item.expense_id,
+        shared_with_user_id=shared_with_user_id,
+        detail=detail
+    )
+
+
+@traced
+class SharedExpenseService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def create_shared_expense(
+        self, user_id: uuid.UUID, share_data: SharedExpenseCreate
+    ) -> SharedExpense:
+        """Share an expense of user_id with another user"""
+        query = select(Expense).where(Expense.id == share_data.expense_id).with_for_update()
+        expense = (await self.db_session.execute(query)).scalar_one_or_none()
+        if expense is None:
+            raise ExpenseNotFoundError(f"Expense with ID {share_data.expense_id} not found")
+        if expense.user_id != user_id:
+            raise PermissionDeniedError("Only the owner of an expense can share it")
+        if share_data.shared_with_user_id == user_id:
+            raise InvalidShareError("An expense can not be shared with its owner")
+        if await self.db_session.scalar(select(User.id).where(User.id == share_data.shared_with_user_id)) is None:
+            raise UserNotFoundError(f"User with ID {share_data.shared_with_user_id} not found")
+
+        allocated, shared_with = (await self._allocations([expense.id])).get(expense.id, (Decimal(0), set()))
+        if share_data.shared_with_user_id in shared_with:
+            raise InvalidShareError("The expense is already shared with this user")
+        if allocated + share_data.split_percentage > MAX_SPLIT_PERCENTAGE:
+            raise InvalidShareError(
+                f"Splits would exceed 100% of the expense ({allocated}% already shared)")
+
+        shared_expense = SharedExpense(
+            id=uuid.uuid4(),
+            expense_id=expense.id,
+            shared_with_user_id=share_data.shared_with_user_id,
+            split_percentage=share_data.split_percentage,
+            status=SharedExpenseStatus.PENDING
+        )
+        self.db_session.add(shared_expense)
+        await apply_share_changes(self.db_session, [ShareChange(
+            owner_id=expense.user_id,
+            shared_with_user_id=shared_expense.shared_with_user_id,
+            old_status=None,
+            new_status=shared_expense.status,
+            new_amount=share_amount(expense.amount, shared_expense.split_percentage),
+            group_id=expense.group_id,
+            shared_expense_id=shared_expense.id
+        )])
+        await self.db_session.commit()
+        await self.db_session.refresh(shared_expense)
+        return shared_expense
+
+    async def create_shared_expenses_batch(
+        self, user_id: uuid.UUID, batch: SharedExpenseBatchCreate
+    ) -> SharedExpenseBatchResult:
+        """
+        Create the splits of one or many expenses in a single INSERT.
+
+        The expenses are locked in id order, so concurrent batches for the
+        same expenses serialize instead of deadlocking. Existing splits are
+        then read with one aggregate query. Weighted splits are converted to
+        percentages with the largest remainder method. Invalid splits are
+        reported and skipped; the rest of the batch is still created.
+        """
+        expense_ids = sorted({item.expense_id for item in batch.items})
+        query = (
+            select(Expense.id, Expense.user_id, Expense.amount, Expense.group_id)
+            .where(Expense.id.in_(expense_ids))
+            .order_by(Expense.id)
+            .with_for_update()
+        )
+        expenses = {row.id: row for row in await self.db_session.execute(query)}
+        allocations = await self._allocations(expenses.keys())
+
+        requested_users = {split.shared_with_user_id for item in batch.items for split in item.splits}
+        user_query = select(User.id).where(User.id.in_(requested_users))
+        existing_users = set((await self.db_session.scalars(user_query)).all())
+
+        rows: list[dict] = []
+        changes: list[ShareChange] = []
+        errors: list[SharedExpenseBatchError] = []
+
+        for item in batch.items:
+            expense = expenses.get(item.expense_id)
+            if expense is None:
+                errors.append(batch_error(item, f"Expense with ID {item.expense_id} not found"))
+                continue
+            if expense.user_id != user_id:
+                errors.append(batch_error(item, "Only the owner of an expense can share it"))
+                continue
+
+            allocated, shared_with = allocations.get(expense.id, (Decimal(0), set()))
+            shared_with = set(shared_with)
+            for split, percentage in zip(item.splits, split_percentages(item)):
+                detail = None
+                if split.shared_with_user_id == user_id:
+                    detail = "An expense can not be shared with its owner"
+                elif split.shared_with_user_id not in existing_users:
+                    detail = f"User with ID {split.shared_with_user_id} not found"
+                elif split.shared_with_user_id in shared_with:
+                    detail = "The expense is already shared with this user"
+                elif percentage <= 0:
+                    detail = "Split rounds down to 0%"
+                elif allocated + percentage > MAX_SPLIT_PERCENTAGE:
+                    detail = (f"Split of {percentage}% would exceed 100% of the expense "
+                              f"({allocated}% already shared)")
+
+                if detail is not None:
+                    errors.append(batch_error(item, detail, split.shared_with_user_id))
+                else:
+                    allocated += percentage
+                    shared_with.add(split.shared_with_user_id)
+                    share_id = uuid.uuid4()
+                    rows.append({
+                        "id": share_id,
+                        "expense_id": expense.id,
+                        "shared_with_user_id": split.shared_with_user_id,
+                        "split_percentage": percentage,
+                        "status": SharedExpenseStatus.PENDING,
+                        "version": 1,
+                    })
+                    changes.append(ShareChange(
+                        owner_id=expense.user_id,
+                        shared_with_user_id=split.shared_with_user_id,
+                        old_status=None,
+                        new_status=SharedExpenseStatus.PENDING,
+                        new_amount=share_amount(expense.amount, percentage),
+                        group_id=expense.group_id,
+                        shared_expense_id=share_id
+                    ))
+            allocations[expense.id] = (allocated, shared_with)
+
+        created: list[SharedExpense] = []
+        if rows:
+            result = await self.db_session.scalars(
+                insert(SharedExpense).returning(SharedExpense), rows
+            )
+            created = list(result.all())
+            await apply_share_changes(self.db_session, changes)
+        await self.db_session.commit()
+
+        return SharedExpenseBatchResult(
+            created=[SharedExpenseInDB.model_validate(share) for share in created],
+            errors=errors
+        )
+
+    async def transition_shared_expenses(
+        self, user_id: uuid.UUID, transition: SharedExpenseTransition
+    ) -> SharedExpenseTransitionResult:
+        """
+        Move every matching shared expense to a new status in one UPDATE.
+
+        Valid transitions and who may make them are part of the WHERE clause,
+        so rows that already moved on are skipped rather than applied twice.
+        Matching rows are locked in id order first so concurrent transitions
+        (e.g. both parties settling up at once) queue instead of deadlocking,
+        and each updated row gets its version bumped. With expected_versions
+        only rows still at the given version are updated.
+        """
+        new_status = SharedExpenseStatus(transition.status.value)
+        sources = [status for status, targets in ALLOWED_TRANSITIONS.items() if new_status in targets]
+        if not sources:
+            raise InvalidStatusTransitionError(f"Can not change status to {new_status.value}")
+
+        if new_status in DEBTOR_ONLY_STATUSES:
+            party = SharedExpense.shared_with_user_id == user_id
+            counterparty = Expense.user_id
+        else:
+            party = or_(SharedExpense.shared_with_user_id == user_id, Expense.user_id == user_id)
+            counterparty = None
+
+        conditions = [party, SharedExpense.status.in_(sources)]
+        if transition.shared_expense_ids is not None:
+            conditions.append(SharedExpense.id.in_(transition.shared_expense_ids))
+        if transition.expense_ids is not None:
+            conditions.append(SharedExpense.expense_id.in_(transition.expense_ids))
+        if transition.counterparty_user_id is not None:
+            other = transition.counterparty_user_id
+            if counterparty is not None:
+                conditions.append(counterparty == other)
+            else:
+                conditions.append(or_(
+                    and_(SharedExpense.shared_with_user_id == user_id, Expense.user_id == other),
+                    and_(Expense.user_id == user_id, SharedExpense.shared_with_user_id == other),
+                ))
+        if transition.expected_versions is not None:
+            conditions.append(tuple_(SharedExpense.id, SharedExpense.version).in_(
+                list(transition.expected_versions.items())
+            ))
+
+        target = (
+            select(SharedExpense.id, SharedExpense.status.label("old_status"))
+            .join(Expense, Expense.id == SharedExpense.expense_id)
+            .where(*conditions)
+            .order_by(SharedExpense.id)
+            .with_for_update(of=SharedExpense)
+            .cte("target")
+        )
+        statement = (
+            update(SharedExpense)
+            .where(
+                SharedExpense.id == target.c.id,
+                Expense.id == SharedExpense.expense_id,
+                SharedExpense.status.in_(sources)
+            )
+            .values(status=new_status, version=SharedExpense.version + 1)
+            .returning(
+                SharedExpense.id,
+                SharedExpense.version,
+                SharedExpense.shared_with_user_id,
+                SharedExpense.split_percentage,
+                target.c.old_status,
+                Expense.user_id.label("owner_id"),
+                Expense.amount,
+                Expense.group_id
+            )
+            .execution_options(synchronize_session=False)
+        )
+        rows = (await self.db_session.execute(statement)).all()
+
+        await apply_share_changes(self.db_session, [
+            ShareChange(
+                owner_id=row.owner_id,
+                shared_with_user_id=row.shared_with_user_id,
+                old_status=row.old_status,
+                new_status=new_status,
+                old_amount=share_amount(row.amount, row.split_percentage),
+                new_amount=share_amount(row.amount, row.split_percentage),
+                group_id=row.group_id,
+                shared_expense_id=row.id
+            )
+            for row in rows
+        ])
+        await self.db_session.commit()
+
+        updated_ids = {row.id for row in rows}
+        requested = set(transition.shared_expense_ids or ()) | set(transition.expected_versions or ())
+        return SharedExpenseTransitionResult(
+            status=transition.status,
+            updated=[SharedExpenseVersion(id=row.id, version=row.version) for row in rows],
+            conflicts=sorted(requested - updated_ids)
+        )
+
+    async def _allocations(
+        self, expense_ids: Iterable[uuid.UUID], exclude: Optional[uuid.UUID] = None
+    ) -> dict[uuid.UUID, tuple[Decimal, set[uuid.UUID]]]:
+        """Percentage already shared and users already shared with, per expense, except share `exclude`"""
+        expense_ids = list(expense_ids)
+        if not expense_ids:
+            return {}
+        query = (
+            select(
+                SharedExpense.expense_id,
+                func.sum(SharedExpense.split_percentage),
+                func.array_agg(SharedExpense.shared_with_user_id)
+            )
+            .where(
+                SharedExpense.expense_id.in_(expense_ids),
+                SharedExpense.status != SharedExpenseStatus.REJECTED
+            )
+            .group_by(SharedExpense.expense_id)
+        )
+        if exclude is not None:
+            query = query.where(SharedExpense.id != exclude)
+        return {
+            expense_id: (allocated, set(users))
+            for expense_id, allocated, users in await self.db_session.execute(query)
+        }
+
+    async def get_shared_expense(
+        self, user_id: uuid.UUID, shared_expense_id: uuid.UUID, *, for_update: bool = False
+    ) -> SharedExpense:
+        """
+        Get a shared expense visible to user_id, with its expense loaded.
+
+        With for_update the expense is locked before the share, the order
+        batch writes lock them in, and both are read from the locked rows.
+        """
+        query = (
+            select(SharedExpense)
+            .options(joinedload(SharedExpense.expense, innerjoin=True))
+            .where(SharedExpense.id == shared_expense_id)
+        )
+        if for_update:
+            expense_id = select(SharedExpense.expense_id).where(SharedExpense.id == shared_expense_id)
+            await self.db_session.execute(
+                select(Expense.id).where(Expense.id == expense_id.scalar_subquery()).with_for_update()
+            )
+            query = query.with_for_update(of=SharedExpense).execution_options(populate_existing=True)
+        shared_expense = (await self.db_session.execute(query)).scalar_one_or_none()
+        if shared_expense is None or user_id not in (
+            shared_expense.expense.user_id, shared_expense.shared_with_user_id
+        ):
+            raise SharedExpenseNotFoundError(f"Shared expense with ID {shared_expense_id} not found")
+        return shared_expense
+
+    async def update_shared_expense(
+        self, user_id: uuid.UUID, shared_expense_id: uuid.UUID, share_data: SharedExpenseUpdate
+    ) -> SharedExpense:
+        """
+        Change the status or split of a shared expense.
+
+        Only the user an expense is shared with can accept or reject it,
+        either party can settle it, and only the owner can change the split.
+        """
+        shared_expense = await self.get_shared_expense(user_id, shared_expense_id, for_update=True)
+        if share_data.version is not None and share_data.version != shared_expense.version:
+            raise StaleVersionError(
+                f"Shared expense is at version {shared_expense.version}, not {share_data.version}")
+        expense = shared_expense.expense
+        old_status = shared_expense.status
+        old_amount = share_amount(expense.amount, shared_expense.split_percentage)
+
+        if share_data.status is not None:
+            new_status = SharedExpenseStatus(share_data.status.value)
+            if new_status != old_status:
+                if new_status not in ALLOWED_TRANSITIONS[old_status]:
+                    raise InvalidStatusTransitionError(
+                        f"Can not change status from {old_status.value} to {new_status.value}")
+                if new_status in DEBTOR_ONLY_STATUSES and user_id != shared_expense.shared_with_user_id:
+                    raise PermissionDeniedError(
+                        f"Only the user the expense is shared with can mark it {new_status.value}")
+                shared_expense.status = new_status
+
+        if share_data.split_percentage is not None \
+                and share_data.split_percentage != shared_expense.split_percentage:
+            if user_id != expense.user_id:
+                raise PermissionDeniedError("Only the owner of an expense can change its split")
+            if old_status not in (SharedExpenseStatus.PENDING, SharedExpenseStatus.ACCEPTED):
+                raise InvalidShareError(f"Can not change the split of a {old_status.value} share")
+            # The expense lock serializes this with share creation, which validates under it too
+            allocated, _ = (await self._allocations([expense.id], exclude=shared_expense.id)).get(
+                expense.id, (Decimal(0), set()))
+            if allocated + share_data.split_percentage > MAX_SPLIT_PERCENTAGE:
+                raise InvalidShareError(
+                    f"Splits would exceed 100% of the expense ({allocated}% shared with others)")
+            shared_expense.split_percentage = share_data.split_percentage
+
+        await apply_share_changes(self.db_session, [ShareChange(
+            owner_id=expense.user_id,
+            shared_with_user_id=shared_expense.shared_with_user_id,
+            old_status=old_status,
+            new_status=shared_expense.status,
+            old_amount=old_amount,
+            new_amount=share_amount(expense.amount, shared_expense.split_percentage),
+            group_id=expense.group_id,
+            shared_expense_id=shared_expense.id
+        )])
+        await self.db_session.commit()
+        await self.db_session.refresh(shared_expense)
+        return shared_expense
+
+    async def delete_shared_expense(self, user_id: uuid.UUID, shared_expense_id: uuid.UUID) -> None:
+        """Delete a shared expense; only the owner of the expense can do this"""
+        shared_expense = await self.get_shared_expense(user_id, shared_expense_id, for_update=True)
+        expense = shared_expense.expense
+        if user_id != expense.user_id:
+            raise PermissionDeniedError("Only the owner of an expense can delete its shares")
+
+        await apply_share_changes(self.db_session, [ShareChange(
+            owner_id=expense.user_id,
+            shared_with_user_id=shared_expense.shared_with_user_id,
+            old_status=shared_expense.status,
+            new_status=None,
+            old_amount=share_amount(expense.amount, shared_expense.split_percentage),
+            group_id=expense.group_id,
+            shared_expense_id=shared_expense.id
+        )])
+        await self.db_session.delete(shared_expense)
+        await self.db_session.commit()
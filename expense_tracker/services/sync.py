@@ -0,0 +1,176 @@
+# expense_tracker/services/sync.py
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.exceptions import InvalidCursorError, SyncCursorExpiredError
+from expense_tracker.core.settings import settings
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.category import Category
+from expense_tracker.models.expense import Expense
+from expense_tracker.models.shared_expense import SharedExpense
+from expense_tracker.models.tombstone import Tombstone
+from expense_tracker.schemas.category import CategoryInDB
+from expense_tracker.schemas.expense import ExpenseInDB
+from expense_tracker.schemas.shared_expense import SharedExpenseInDB
+from expense_tracker.schemas.sync import SyncDeletion, SyncPage
+
+# Sources are synced one after another, each in (updated_at, id) order
+PHASES = ("category", "expense", "shared_by_me", "shared_with_me", "tombstone")
+
+
+@dataclass(frozen=True, slots=True)
+class SyncCursor:
+    """
+    Position of a client in the change history.
+
+    A sync returns rows with since < updated_at <= until, where until lags
+    the database clock by `SYNC_SAFETY_LAG_SECONDS` so rows of transactions
+    still in flight are not skipped. Mid-sync cursors also carry the phase
+    and the last (updated_at, id) returned. A finished sync hands out a
+    cursor with until unset, from which the next sync starts.
+    """
+    since: Optional[datetime]
+    until: Optional[datetime] = None
+    phase: int = 0
+    after: Optional[tuple[datetime, uuid.UUID]] = None
+
+    def encode(self) -> str:
+        data = {
+            "s": self.since.isoformat() if self.since else None,
+            "u": self.until.isoformat() if self.until else None,
+            "p": self.phase,
+            "a": [self.after[0].isoformat(), self.after[1].hex] if self.after else None,
+        }
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "SyncCursor":
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            after = data["a"]
+            result = cls(
+                since=datetime.fromisoformat(data["s"]) if data["s"] else None,
+                until=datetime.fromisoformat(data["u"]) if data["u"] else None,
+                phase=int(data["p"]),
+                after=(datetime.fromisoformat(after[0]), uuid.UUID(hex=after[1])) if after else None,
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, IndexError) as e:
+            raise InvalidCursorError("Invalid sync cursor") from e
+        if not 0 <= result.phase < len(PHASES):
+            raise InvalidCursorError("Invalid sync cursor")
+        return result
+
+
+async def record_deletions(db: AsyncSession, deletions: Iterable[tuple[str, uuid.UUID, uuid.UUID]]) -> None:
+    """Write (table_name, entity_id, user_id) tombstones in one statement, without committing"""
+    rows = [
+        {"id": uuid.uuid4(), "table_name": table_name, "entity_id": entity_id, "user_id": user_id}
+        for table_name, entity_id, user_id in deletions
+    ]
+    if rows:
+        await db.execute(insert(Tombstone), rows)
+
+
+@traced
+class SyncService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def sync(self, user_id: uuid.UUID, cursor: Optional[str], limit: int) -> SyncPage:
+        """
+        Up to limit rows created, updated or deleted since the cursor.
+
+        Without a cursor everything visible to the user is returned, and
+        deletions are skipped since the client has nothing to delete.
+        """
+        state = SyncCursor.decode(cursor) if cursor else SyncCursor(since=None)
+        if state.until is None:
+            now = await self.db_session.scalar(select(func.now()))
+            state = replace(state, until=now - timedelta(seconds=settings.SYNC_SAFETY_LAG_SECONDS))
+            retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+            if state.since is not None and state.since < now - retention:
+                raise SyncCursorExpiredError("Sync cursor is too old, sync again without a cursor")
+            if state.since is not None and state.since >= state.until:
+                # Synced moments ago: nothing is old enough to be returned safely yet
+                return self._page([], SyncCursor(since=state.since), has_more=False)
+
+        rows: list[tuple[str, object]] = []
+        remaining = limit
+        while state.phase < len(PHASES):
+            phase = PHASES[state.phase]
+            if phase == "tombstone" and state.since is None:
+                state = replace(state, phase=state.phase + 1, after=None)
+                continue
+
+            query = self._phase_query(phase, user_id, state)
+            batch = list((await self.db_session.scalars(query.limit(remaining + 1))).all())
+            if len(batch) > remaining:
+                batch = batch[:remaining]
+                rows.extend((phase, row) for row in batch)
+                last = batch[-1]
+                state = replace(state, after=(last.updated_at, last.id))
+                return self._page(rows, state, has_more=True)
+
+            rows.extend((phase, row) for row in batch)
+            remaining -= len(batch)
+            state = replace(state, phase=state.phase + 1, after=None)
+
+        return self._page(rows, SyncCursor(since=state.until), has_more=False)
+
+    def _phase_query(self, phase: str, user_id: uuid.UUID, state: SyncCursor):
+        if phase == "category":
+            model = Category
+            condition = or_(Category.user_id.is_(None), Category.user_id == user_id)
+        elif phase == "expense":
+            model = Expense
+            condition = Expense.user_id == user_id
+        elif phase == "shared_by_me":
+            model = SharedExpense
+            condition = SharedExpense.expense_id.in_(select(Expense.id).where(Expense.user_id == user_id))
+        elif phase == "shared_with_me":
+            model = SharedExpense
+            condition = SharedExpense.shared_with_user_id == user_id
+        else:
+            model = Tombstone
+            condition = Tombstone.user_id == user_id
+
+        query = (
+            select(model)
+            .where(condition, model.updated_at <= state.until)
+            .order_by(model.updated_at, model.id)
+        )
+        if state.since is not None:
+            query = query.where(model.updated_at > state.since)
+        if state.after is not None:
+            query = query.where(tuple_(model.updated_at, model.id) > tuple_(*state.after))
+        return query
+
+    @staticmethod
+    def _page(rows: list[tuple[str, object]], cursor: SyncCursor, *, has_more: bool) -> SyncPage:
+        return SyncPage(
+            categories=[CategoryInDB.model_validate(row) for phase, row in rows if phase == "category"],
+            expenses=[ExpenseInDB.model_validate(row) for phase, row in rows if phase == "expense"],
+            shared_expenses=[
+                SharedExpenseInDB.model_validate(row)
+                for phase, row in rows
+                if phase in ("shared_by_me", "shared_with_me")
+            ],
+            deleted=[SyncDeletion.model_validate(row) for phase, row in rows if phase == "tombstone"],
+            cursor=cursor.encode(),
+            has_more=has_more
+        )
+
+    async def purge_tombstones(self) -> int:
+        """Delete tombstones older than the retention period"""
+        cutoff = func.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        result = await self.db_session.execute(delete(Tombstone).where(Tombstone.created_at < cutoff))
+        await self.db_session.commit()
+        return result.rowcount
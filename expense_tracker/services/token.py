@@ -0,0 +1,143 @@
+# expense_tracker/services/token.py
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from jose import JWTError, jwt
+from pydantic import ValidationError
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.exceptions import InvalidTokenError
+from expense_tracker.core.revocation import revocation_filter
+from expense_tracker.core.security import (
+    ALGORITHM,
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    SECRET_KEY,
+    create_refresh_token,
+    create_user_access_token,
+)
+from expense_tracker.core.tracing import traced
+from expense_tracker.models.token import RefreshToken, RevokedToken
+from expense_tracker.models.user import User
+from expense_tracker.schemas.token import Token, TokenPayload
+
+
+@traced
+class TokenService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def issue_tokens(self, user: User) -> Token:
+        """Issue an access token and the first refresh token of a new family"""
+        refresh_token = self._add_refresh_token(user.id, family_id=uuid.uuid4())
+        await self.db_session.commit()
+        return Token(
+            access_token=create_user_access_token(user),
+            refresh_token=refresh_token
+        )
+
+    async def rotate_refresh_token(self, refresh_token: str) -> Token:
+        """
+        Exchange a refresh token for a new token pair.
+
+        The presented token is marked as used and its successor joins the same
+        family. Presenting a token that was already used means it leaked, so
+        the whole family is revoked.
+        """
+        token_data = self.decode_refresh_token(refresh_token)
+
+        query = (
+            select(RefreshToken)
+            .where(RefreshToken.jti == token_data.jti)
+            .with_for_update()
+        )
+        stored = (await self.db_session.execute(query)).scalar_one_or_none()
+        if stored is None or stored.revoked_at is not None:
+            raise InvalidTokenError("Refresh token has been revoked")
+
+        now = datetime.now(timezone.utc)
+        if stored.used_at is not None:
+            await self._revoke_family(stored.family_id, now)
+            await self.db_session.commit()
+            raise InvalidTokenError("Refresh token reuse detected")
+
+        user = await self.db_session.get(User, stored.user_id)
+        if user is None or not user.is_active:
+            raise InvalidTokenError("User is not active")
+
+        stored.used_at = now
+        new_refresh_token = self._add_refresh_token(user.id, family_id=stored.family_id)
+        await self.db_session.commit()
+        return Token(
+            access_token=create_user_access_token(user),
+            refresh_token=new_refresh_token
+        )
+
+    async def revoke_access_token(self, token_data: TokenPayload, reason: str = "logout") -> None:
+        """Add an access token to the revocation list"""
+        if token_data.jti is None or token_data.exp is None:
+            raise InvalidTokenError("Token cannot be revoked")
+
+        statement = insert(RevokedToken).values(
+            id=uuid.uuid4(),
+            jti=token_data.jti,
+            user_id=uuid.UUID(token_data.sub),
+            expires_at=datetime.fromtimestamp(token_data.exp, timezone.utc),
+            reason=reason
+        ).on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        await self.db_session.execute(statement)
+        await self.db_session.commit()
+        revocation_filter.add(token_data.jti)
+
+    async def revoke_refresh_family(self, refresh_token: str, user_id: uuid.UUID) -> None:
+        """Revoke every refresh token in the family of the given token"""
+        token_data = self.decode_refresh_token(refresh_token)
+        if token_data.sub != str(user_id):
+            raise InvalidTokenError("Refresh token belongs to another user")
+        await self._revoke_family(uuid.UUID(token_data.fam), datetime.now(timezone.utc))
+        await self.db_session.commit()
+
+    async def purge_expired(self) -> int:
+        """Delete revocation and refresh token rows past their expiry"""
+        now = datetime.now(timezone.utc)
+        revoked = await self.db_session.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at < now)
+        )
+        refresh = await self.db_session.execute(
+            delete(RefreshToken).where(RefreshToken.expires_at < now)
+        )
+        await self.db_session.commit()
+        return revoked.rowcount + refresh.rowcount
+
+    @staticmethod
+    def decode_refresh_token(refresh_token: str) -> TokenPayload:
+        try:
+            payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+            token_data = TokenPayload(**payload)
+        except (JWTError, ValidationError):
+            raise InvalidTokenError("Invalid refresh token")
+        if token_data.typ != "refresh" or not token_data.jti or not token_data.fam:
+            raise InvalidTokenError("Invalid refresh token")
+        return token_data
+
+    def _add_refresh_token(self, user_id: uuid.UUID, family_id: uuid.UUID) -> str:
+        jti = uuid.uuid4().hex
+        expires_at = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        self.db_session.add(RefreshToken(
+            jti=jti,
+            user_id=user_id,
+            family_id=family_id,
+            expires_at=expires_at
+        ))
+        return create_refresh_token(user_id, jti, family_id, expires_at)
+
+    async def _revoke_family(self, family_id: uuid.UUID, now: datetime) -> None:
+        await self.db_session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.family_id == family_id,
+                RefreshToken.revoked_at.is_(None)
+            )
+            .values(revoked_at=now)
+        )
@@ -1,27 +1,35 @@
 # expense_tracker/services/user.py
 import datetime
+import uuid
 from typing import Optional
 
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from expense_tracker.core.auth_cache import auth_user_cache
+from expense_tracker.core.cache import user_cache
 from expense_tracker.core.exceptions import DuplicateEmailError, UserNotFoundError
+from expense_tracker.core.invalidation import EntityChange, publish_changes
+from expense_tracker.core.security import get_password_hash_async, verify_password_async
+from expense_tracker.core.tracing import traced
 from expense_tracker.models.user import User
-from expense_tracker.schemas.user import UserCreate, UserUpdate
+from expense_tracker.schemas.user import UserCreate, UserInDB, UserUpdate
 
 current_time = datetime.datetime.now()
 
 
+@traced
 class UserService:
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
     async def create_user(self, user_data: UserCreate) -> User:
-        """Create a new user"""
+        """Create a new user, hashing the password off the event loop"""
         user = User(
             email=user_data.email,
             username=user_data.username,
+            hashed_password=await get_password_hash_async(user_data.password) if user_data.password else None,
             created_at=current_time,
             updated_at=current_time
         )
@@ -38,6 +46,14 @@ class UserService:
                     f"Email {user_data.email} already exists")
             raise
 
+    async def authenticate(self, email: str, password: str) -> Optional[User]:
+        """The active user with this email and password, None for any mismatch"""
+        user = await self.db_session.scalar(select(User).where(User.email == email))
+        hashed_password = user.hashed_password if user is not None else None
+        if not await verify_password_async(password, hashed_password) or not user.is_active:
+            return None
+        return user
+
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get a user by ID"""
         query = select(User).where(User.id == user_id)
@@ -48,11 +64,62 @@ class UserService:
             raise UserNotFoundError(f"User with ID {user_id} not found")
         return user
 
-    async def get_user_by_email(self, email: str) -> Optional[User]:
-        """Get a user by email"""
+    async def get_user(self, user_id: uuid.UUID | str) -> UserInDB:
+        """Get a read-only snapshot of a user by ID, served from the cache when possible"""
+        try:
+            user_id = uuid.UUID(str(user_id))
+        except ValueError:
+            raise UserNotFoundError(f"User with ID {user_id} not found")
+
+        cached = user_cache.get(("id", user_id))
+        if cached is not None:
+            return cached
+        generation = user_cache.generation
+        user = await self.get_user_by_id(user_id)
+        return self._cache_user(user, generation)
+
+    async def get_user_version(self, user_id: uuid.UUID | str) -> datetime.datetime:
+        """When a user was last updated, without loading the row when it is cached"""
+        try:
+            user_id = uuid.UUID(str(user_id))
+        except ValueError:
+            raise UserNotFoundError(f"User with ID {user_id} not found")
+
+        cached = user_cache.get(("id", user_id))
+        if cached is not None:
+            return cached.updated_at
+        updated_at = await self.db_session.scalar(select(User.updated_at).where(User.id == user_id))
+        if updated_at is None:
+            raise UserNotFoundError(f"User with ID {user_id} not found")
+        return updated_at
+
+    async def get_user_by_email(self, email: str) -> Optional[UserInDB]:
+        """Get a read-only snapshot of a user by email, served from the cache when possible"""
+        cached = user_cache.get(("email", email))
+        if cached is not None:
+            return cached
+        generation = user_cache.generation
         query = select(User).where(User.email == email)
         result = await self.db_session.execute(query)
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
+        return self._cache_user(user, generation)
+
+    @staticmethod
+    def _cache_user(user: User, generation: int) -> UserInDB:
+        snapshot = UserInDB.model_validate(user)
+        user_cache.set(user.id, [("id", user.id), ("email", user.email)], snapshot, generation)
+        return snapshot
+
+    async def _publish(self, user_id: uuid.UUID) -> None:
+        """Have other workers drop the user from their caches once this transaction commits"""
+        await publish_changes(self.db_session, [EntityChange("user", user_id, user_id)])
+
+    @staticmethod
+    def _invalidate(user_id: uuid.UUID) -> None:
+        auth_user_cache.invalidate(user_id)
+        user_cache.invalidate(user_id)
 
     async def update_user(self, user_id: str, user_data: UserUpdate) -> User:
         """Update a user"""
@@ -65,21 +132,36 @@ class UserService:
             user.username = user_data.username
 
         try:
+            await self._publish(user.id)
             await self.db_session.commit()
             await self.db_session.refresh(user)
-            return user
         except IntegrityError as e:
             await self.db_session.rollback()
             if "duplicate key" in str(e):
                 raise DuplicateEmailError(
                     f"Email {user_data.email} already exists")
             raise
+        self._invalidate(user.id)
+        return user
+
+    async def deactivate_user(self, user_id: str) -> User:
+        """Deactivate a user and invalidate all of their issued tokens"""
+        user = await self.get_user_by_id(user_id)
+        user.is_active = False
+        user.token_version += 1
+        await self._publish(user.id)
+        await self.db_session.commit()
+        await self.db_session.refresh(user)
+        self._invalidate(user.id)
+        return user
 
     async def delete_user(self, user_id: str) -> None:
         """Delete a user"""
         user = await self.get_user_by_id(user_id)
         await self.db_session.delete(user)
+        await self._publish(user.id)
         await self.db_session.commit()
+        self._invalidate(user.id)
 
     async def list_users(self, skip: int = 0, limit: int = 100) -> list[User]:
         """List all users with pagination"""
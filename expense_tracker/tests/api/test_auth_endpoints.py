@@ -0,0 +1,67 @@
+# expense_tracker/tests/api/test_auth_endpoints.py
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def rnd_email() -> str:
+    rnd = str(uuid.uuid4())[:16]
+    return f"test_{rnd}@example.com"
+
+
+def create_user(client: TestClient, password: str = "correct horse") -> str:
+    email = rnd_email()
+    response = client.post("/api/v1/users", json={"email": email, "username": "Auth User", "password": password})
+    assert response.status_code == 201
+    return email
+
+
+@pytest.mark.asyncio
+class TestAuthEndpoints:
+    async def test_login_issues_a_token_pair(self, client: TestClient):
+        # Arrange
+        email = create_user(client)
+
+        # Act
+        response = client.post("/api/v1/auth/login", data={"username": email, "password": "correct horse"})
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["access_token"]
+        assert data["refresh_token"]
+
+    async def test_login_with_wrong_password(self, client: TestClient):
+        # Arrange
+        email = create_user(client)
+
+        # Act
+        response = client.post("/api/v1/auth/login", data={"username": email, "password": "wrong horse"})
+
+        # Assert
+        assert response.status_code == 401
+        assert response.headers["www-authenticate"] == "Bearer"
+
+    async def test_login_with_unknown_email(self, client: TestClient):
+        # Act
+        response = client.post("/api/v1/auth/login", data={"username": rnd_email(), "password": "correct horse"})
+
+        # Assert
+        assert response.status_code == 401
+
+    async def test_refresh_rotates_and_detects_reuse(self, client: TestClient):
+        # Arrange
+        email = create_user(client)
+        tokens = client.post("/api/v1/auth/login", data={"username": email, "password": "correct horse"}).json()
+
+        # Act
+        rotated = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        reused = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        successor = client.post("/api/v1/auth/refresh", json={"refresh_token": rotated.json()["refresh_token"]})
+
+        # Assert
+        assert rotated.status_code == 200
+        assert rotated.json()["refresh_token"] != tokens["refresh_token"]
+        assert reused.status_code == 401
+        assert successor.status_code == 401  # The whole family was revoked
@@ -0,0 +1,55 @@
+# expense_tracker/tests/api/test_expense_endpoints.py
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def auth_headers(client: TestClient) -> dict:
+    email = f"test_{str(uuid.uuid4())[:16]}@example.com"
+    client.post("/api/v1/users", json={"email": email, "username": "Expense User", "password": "correct horse"})
+    tokens = client.post("/api/v1/auth/login", data={"username": email, "password": "correct horse"}).json()
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+@pytest.mark.asyncio
+class TestExpenseEndpoints:
+    async def test_atomic_batch_with_an_invalid_operation_is_422(self, client: TestClient):
+        # Arrange
+        headers = auth_headers(client)
+        category = client.post("/api/v1/categories", json={"name": "Batch"}, headers=headers).json()
+        operations = [
+            {"op": "create", "data": {
+                "amount": "10.00", "description": "Lunch", "date": "2024-01-01", "category_id": category["id"]
+            }},
+            {"op": "delete", "id": str(uuid.uuid4())},
+        ]
+
+        # Act
+        response = client.post("/api/v1/expenses/batch", json={"operations": operations}, headers=headers)
+
+        # Assert
+        assert response.status_code == 422
+        data = response.json()
+        assert data["committed"] is False
+        assert [item["ok"] for item in data["results"]] == [False, False]
+
+    async def test_best_effort_batch_is_200_with_per_item_results(self, client: TestClient):
+        # Arrange
+        headers = auth_headers(client)
+        category = client.post("/api/v1/categories", json={"name": "Batch"}, headers=headers).json()
+        operations = [
+            {"op": "create", "data": {
+                "amount": "10.00", "description": "Lunch", "date": "2024-01-01", "category_id": category["id"]
+            }},
+            {"op": "delete", "id": str(uuid.uuid4())},
+        ]
+
+        # Act
+        response = client.post(
+            "/api/v1/expenses/batch", json={"operations": operations, "atomic": False}, headers=headers
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert [item["ok"] for item in response.json()["results"]] == [True, False]
@@ -0,0 +1,145 @@
+# expense_tracker/tests/core/test_admission.py
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from expense_tracker.core import admission as admission_module
+from expense_tracker.core.admission import AdmissionController, TokenBucket, admit_request
+from expense_tracker.core.exceptions import RateLimitExceededError, ServiceOverloadedError
+from expense_tracker.core.settings import settings
+from expense_tracker.db.session import PoolWaitTracker
+
+
+def make_controller(**overrides) -> AdmissionController:
+    options = dict(
+        exempt_routes=["* /admin/*"],
+        route_concurrency=2,
+        route_limits={},
+        low_priority_routes=["* */analytics"],
+        low_priority_concurrency=1,
+        user_concurrency=10,
+        user_rate=100.0,
+        user_burst=100,
+        max_tracked_clients=100,
+        pool_wait_threshold=0.1,
+        loop_lag_threshold=0.2,
+        retry_after=1.0,
+        pool_wait=PoolWaitTracker(half_life=5.0, weight=1.0),
+        loop_lag=lambda: 0.0,
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+class TestTokenBucket:
+    def test_bursts_are_allowed_then_refilled_at_the_rate(self):
+        # Arrange
+        bucket = TokenBucket(rate=2.0, burst=2, now=0.0)
+
+        # Act
+        waits = [bucket.take(0.0) for _ in range(3)]
+
+        # Assert
+        assert waits == [0.0, 0.0, pytest.approx(0.5)]
+        assert bucket.take(0.5) == 0.0
+
+
+class TestAdmissionController:
+    def test_route_concurrency_is_limited_until_released(self):
+        # Arrange
+        controller = make_controller()
+        tickets = [controller.admit("GET /items", f"client-{i}") for i in range(2)]
+
+        # Act / Assert
+        with pytest.raises(ServiceOverloadedError) as refused:
+            controller.admit("GET /items", "client-3")
+        assert refused.value.headers == {"Retry-After": "1"}
+        controller.release(tickets[0])
+        assert controller.admit("GET /items", "client-3") is not None
+
+    def test_clients_over_their_rate_get_429(self):
+        # Arrange
+        controller = make_controller(user_rate=1.0, user_burst=1)
+        controller.release(controller.admit("GET /items", "user:a"))
+
+        # Act / Assert
+        with pytest.raises(RateLimitExceededError) as refused:
+            controller.admit("GET /items", "user:a")
+        assert refused.value.status_code == 429
+        assert controller.admit("GET /items", "user:b") is not None
+
+    def test_low_priority_routes_are_shed_first(self):
+        # Arrange
+        tracker = PoolWaitTracker(half_life=60.0, weight=1.0)
+        controller = make_controller(pool_wait=tracker)
+
+        # Act
+        tracker.observe(0.15)
+
+        # Assert
+        with pytest.raises(ServiceOverloadedError):
+            controller.admit("GET /reports/analytics", "user:a")
+        assert controller.admit("GET /items", "user:a") is not None
+        tracker.observe(0.25)
+        with pytest.raises(ServiceOverloadedError) as refused:
+            controller.admit("GET /items", "user:a")
+        assert int(refused.value.headers["Retry-After"]) >= 2
+        assert controller.rejected["overloaded"] == 2
+
+    def test_exempt_routes_are_not_tracked(self):
+        controller = make_controller(route_concurrency=0)
+        assert controller.admit("GET /admin/caches", "user:a") is None
+
+    def test_health_probe_is_served_when_overloaded(self):
+        # Arrange
+        tracker = PoolWaitTracker(half_life=60.0, weight=1.0)
+        controller = make_controller(exempt_routes=settings.ADMISSION_EXEMPT_ROUTES, pool_wait=tracker)
+
+        # Act
+        tracker.observe(1.0)
+
+        # Assert
+        assert controller.admit("GET /health", "address:10.0.0.1") is None
+
+
+class TestPoolWaitTracker:
+    def test_average_decays_without_checkouts(self):
+        # Arrange
+        tracker = PoolWaitTracker(half_life=1.0, weight=1.0)
+        tracker.observe(0.4)
+
+        # Act
+        later = tracker.current(time.monotonic() + 2.0)
+
+        # Assert
+        assert later == pytest.approx(0.1, rel=0.01)
+
+
+class TestAdmitRequest:
+    @pytest.mark.asyncio
+    async def test_requests_past_the_route_limit_are_refused(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(admission_module, "admission", make_controller(route_concurrency=1))
+        release = asyncio.Event()
+        app = FastAPI(dependencies=[Depends(admit_request)])
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            await release.wait()
+            return {"id": item_id}
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            # Act
+            first = asyncio.create_task(client.get("/items/1"))
+            await asyncio.sleep(0.05)
+            refused = await client.get("/items/2")
+            release.set()
+            admitted = await first
+
+        # Assert
+        assert refused.status_code == 503
+        assert refused.headers["retry-after"] == "1"
+        assert admitted.status_code == 200
@@ -0,0 +1,77 @@
+# expense_tracker/tests/core/test_auth_cache.py
+import uuid
+
+from expense_tracker.core.auth_cache import AuthUserCache
+from expense_tracker.schemas.user import AuthenticatedUser
+
+
+def make_user(token_version: int = 0) -> AuthenticatedUser:
+    return AuthenticatedUser(
+        id=uuid.uuid4(),
+        email="cached@example.com",
+        username="Cached User",
+        token_version=token_version
+    )
+
+
+class TestAuthUserCache:
+    def test_hit_requires_matching_token_version(self):
+        # Arrange
+        cache = AuthUserCache(ttl_seconds=60, max_size=10)
+        user = make_user(token_version=2)
+
+        # Act
+        cache.set(user)
+
+        # Assert
+        assert cache.get(user.id, 2) == user
+        assert cache.get(user.id, 1) is None
+
+    def test_invalidate_removes_entry(self):
+        # Arrange
+        cache = AuthUserCache(ttl_seconds=60, max_size=10)
+        user = make_user()
+        cache.set(user)
+
+        # Act
+        cache.invalidate(str(user.id))
+
+        # Assert
+        assert cache.get(user.id, 0) is None
+
+    def test_expired_entries_are_not_served(self):
+        # Arrange
+        cache = AuthUserCache(ttl_seconds=60, max_size=10)
+        user = make_user()
+        cache.set(user)
+        cache._entries[user.id].expires_at = 0
+
+        # Act & Assert
+        assert cache.get(user.id, 0) is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        # Arrange
+        cache = AuthUserCache(ttl_seconds=60, max_size=2)
+        first, second, third = make_user(), make_user(), make_user()
+        cache.set(first)
+        cache.set(second)
+        cache.get(first.id, 0)
+
+        # Act
+        cache.set(third)
+
+        # Assert
+        assert cache.get(first.id, 0) == first
+        assert cache.get(second.id, 0) is None
+        assert cache.get(third.id, 0) == third
+
+    def test_disabled_cache_stores_nothing(self):
+        # Arrange
+        cache = AuthUserCache(ttl_seconds=0, max_size=10)
+
+        # Act
+        cache.set(make_user())
+
+        # Assert
+        assert len(cache) == 0
@@ -0,0 +1,63 @@
+# expense_tracker/tests/core/test_bloom.py
+import uuid
+
+import pytest
+
+from expense_tracker.core.bloom import BloomFilter
+
+
+class TestBloomFilter:
+    def test_added_items_are_always_found(self):
+        # Arrange
+        bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+        items = [uuid.uuid4().hex for _ in range(1_000)]
+
+        # Act
+        for item in items:
+            bloom.add(item)
+
+        # Assert
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate_stays_near_target(self):
+        # Arrange
+        bloom = BloomFilter(capacity=5_000, error_rate=0.01)
+        for _ in range(5_000):
+            bloom.add(uuid.uuid4().hex)
+
+        # Act
+        probes = 20_000
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(probes))
+
+        # Assert
+        assert false_positives / probes < 0.03
+
+    def test_repeated_adds_count_once(self):
+        # Arrange
+        bloom = BloomFilter(capacity=10)
+
+        # Act
+        first = bloom.add("jti")
+        second = bloom.add("jti")
+
+        # Assert
+        assert first is True
+        assert second is False
+        assert len(bloom) == 1
+
+    def test_saturation(self):
+        # Arrange
+        bloom = BloomFilter(capacity=2)
+
+        # Act
+        for item in ("a", "b", "c"):
+            bloom.add(item)
+
+        # Assert
+        assert bloom.is_saturated
+
+    def test_rejects_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=10, error_rate=1.5)
@@ -0,0 +1,99 @@
+# expense_tracker/tests/core/test_cache.py
+import uuid
+
+from expense_tracker.core.cache import ReferenceCache
+
+
+def make_cache(**kwargs) -> ReferenceCache:
+    options = {"ttl_seconds": 60.0, "max_size": 10}
+    options.update(kwargs)
+    return ReferenceCache("test", **options)
+
+
+class TestReferenceCache:
+    def test_value_is_served_under_every_key(self):
+        # Arrange
+        cache = make_cache()
+        user_id = uuid.uuid4()
+
+        # Act
+        cache.set(user_id, [("id", user_id), ("email", "a@example.com")], "user", cache.generation)
+
+        # Assert
+        assert cache.get(("id", user_id)) == "user"
+        assert cache.get(("email", "a@example.com")) == "user"
+
+    def test_invalidate_drops_all_keys_of_entity(self):
+        # Arrange
+        cache = make_cache()
+        user_id = uuid.uuid4()
+        cache.set(user_id, [("id", user_id), ("email", "a@example.com")], "user", cache.generation)
+
+        # Act
+        cache.invalidate(user_id)
+
+        # Assert
+        assert cache.get(("id", user_id)) is None
+        assert cache.get(("email", "a@example.com")) is None
+        assert len(cache) == 0
+
+    def test_value_loaded_before_invalidation_is_not_cached(self):
+        # Arrange: a reader starts loading, then a writer invalidates
+        cache = make_cache()
+        user_id = uuid.uuid4()
+        generation = cache.generation
+        cache.invalidate(user_id)
+
+        # Act
+        cache.set(user_id, [("id", user_id)], "stale", generation)
+
+        # Assert
+        assert cache.get(("id", user_id)) is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        # Arrange
+        cache = make_cache(max_size=2)
+        a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        cache.set(a, [a], "a", cache.generation)
+        cache.set(b, [b], "b", cache.generation)
+        cache.get(a)
+
+        # Act
+        cache.set(c, [c], "c", cache.generation)
+
+        # Assert
+        assert cache.get(a) == "a"
+        assert cache.get(b) is None
+        assert cache.stats().evictions == 1
+
+    def test_expired_entry_is_a_miss(self):
+        # Arrange
+        cache = make_cache(ttl_seconds=1e-9)
+        entity_id = uuid.uuid4()
+        cache.set(entity_id, [entity_id], "value", cache.generation)
+
+        # Act / Assert
+        assert cache.get(entity_id) is None
+        assert len(cache) == 0
+
+    def test_stats_report_hit_rate(self):
+        # Arrange
+        cache = make_cache()
+        entity_id = uuid.uuid4()
+        cache.set(entity_id, [entity_id], "value", cache.generation)
+
+        # Act
+        cache.get(entity_id)
+        cache.get(entity_id)
+        cache.get(uuid.uuid4())
+        stats = cache.stats()
+
+        # Assert
+        assert (stats.hits, stats.misses) == (2, 1)
+        assert stats.hit_rate == 2 / 3
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = make_cache(ttl_seconds=0)
+        entity_id = uuid.uuid4()
+        cache.set(entity_id, [entity_id], "value", cache.generation)
+        assert cache.get(entity_id) is None
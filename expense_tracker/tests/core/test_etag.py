@@ -0,0 +1,59 @@
+# expense_tracker/tests/core/test_etag.py
+import uuid
+from datetime import datetime, timezone
+
+from expense_tracker.core.etag import etag_matches, make_etag
+
+
+class TestMakeEtag:
+    def test_same_versions_give_the_same_weak_tag(self):
+        # Arrange
+        user_id = uuid.uuid4()
+        updated_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+        # Act
+        first = make_etag(user_id, updated_at)
+        second = make_etag(user_id, updated_at)
+
+        # Assert
+        assert first == second
+        assert first.startswith('W/"') and first.endswith('"')
+
+    def test_any_changed_version_changes_the_tag(self):
+        # Arrange
+        user_id = uuid.uuid4()
+        updated_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+        # Act
+        original = make_etag(user_id, updated_at, None)
+        changed = make_etag(user_id, updated_at, updated_at)
+
+        # Assert
+        assert original != changed
+
+    def test_strong_tag_has_no_weak_prefix(self):
+        # Act
+        etag = make_etag("a", weak=False)
+
+        # Assert
+        assert etag.startswith('"')
+
+
+class TestEtagMatches:
+    def test_matches_weakly_within_a_list(self):
+        # Arrange
+        etag = make_etag("a")
+        strong = etag.removeprefix("W/")
+
+        # Act / Assert
+        assert etag_matches(f'"other", {strong}', etag)
+        assert etag_matches(etag, etag)
+        assert etag_matches("*", etag)
+
+    def test_missing_or_different_tag_does_not_match(self):
+        # Arrange
+        etag = make_etag("a")
+
+        # Act / Assert
+        assert not etag_matches(None, etag)
+        assert not etag_matches(make_etag("b"), etag)
@@ -0,0 +1,73 @@
+# expense_tracker/tests/core/test_events.py
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from expense_tracker.core.events import EventBroker
+from expense_tracker.core.invalidation import EntityChange
+
+
+def parse(message: str) -> tuple[str, dict]:
+    event_line, data_line = message.strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+class TestEventBroker:
+    @pytest.mark.asyncio
+    async def test_changes_reach_only_the_concerned_user(self):
+        # Arrange
+        broker = EventBroker(buffer_size=10)
+        alice, bob = uuid.uuid4(), uuid.uuid4()
+        alice_client = broker.connect(alice)
+        bob_client = broker.connect(bob)
+        share_id = uuid.uuid4()
+
+        # Act
+        broker.publish([EntityChange("shared_expense", share_id, alice)])
+
+        # Assert
+        event, data = parse(await alice_client.next(timeout=1))
+        assert event == "change"
+        assert data == {"table": "shared_expense", "id": str(share_id)}
+        with pytest.raises(asyncio.TimeoutError):
+            await bob_client.next(timeout=0.01)
+
+    @pytest.mark.asyncio
+    async def test_slow_client_is_evicted_when_buffer_is_full(self):
+        # Arrange
+        broker = EventBroker(buffer_size=2)
+        user_id = uuid.uuid4()
+        slow = broker.connect(user_id)
+
+        # Act
+        for _ in range(3):
+            broker.publish([EntityChange("expense", uuid.uuid4(), user_id)])
+
+        # Assert
+        assert slow.evicted
+        assert broker.client_count == 0
+        assert broker.evictions == 1
+        messages = [await slow.next(timeout=1), await slow.next(timeout=1)]
+        assert parse(messages[0])[0] == "change"
+        assert messages[1] is None
+
+    @pytest.mark.asyncio
+    async def test_resync_is_sent_to_every_client(self):
+        # Arrange
+        broker = EventBroker(buffer_size=10)
+        clients = [broker.connect(uuid.uuid4()) for _ in range(3)]
+
+        # Act
+        broker.resync()
+
+        # Assert
+        for client in clients:
+            assert parse(await client.next(timeout=1))[0] == "resync"
+
+    def test_disconnect_forgets_client(self):
+        broker = EventBroker(buffer_size=10)
+        client = broker.connect(uuid.uuid4())
+        broker.disconnect(client)
+        assert broker.client_count == 0
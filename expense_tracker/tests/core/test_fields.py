@@ -0,0 +1,61 @@
+# expense_tracker/tests/core/test_fields.py
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from expense_tracker.core.exceptions import InvalidFieldsError
+from expense_tracker.core.fields import parse_fields, partial_model
+from expense_tracker.schemas.expense import ExpenseResponse
+
+
+class TestParseFields:
+    def test_selection_follows_schema_order(self):
+        # Act
+        selection = parse_fields("category.name, date,id,amount", ExpenseResponse)
+
+        # Assert
+        assert selection == (("amount", None), ("date", None), ("id", None), ("category", ("name",)))
+
+    def test_nested_model_named_whole_selects_all_its_fields(self):
+        # Act
+        selection = parse_fields("category.name,category", ExpenseResponse)
+
+        # Assert
+        assert dict(selection)["category"] == ("name", "id", "user_id", "created_at", "updated_at")
+
+    def test_no_parameter_selects_everything(self):
+        # Act
+        selection = parse_fields(None, ExpenseResponse)
+
+        # Assert
+        assert [name for name, _ in selection] == list(ExpenseResponse.model_fields)
+
+    @pytest.mark.parametrize("fields", ["id,bogus", "category.bogus", "amount.value", " , "])
+    def test_unknown_or_empty_selection_is_refused(self, fields):
+        # Act & Assert
+        with pytest.raises(InvalidFieldsError):
+            parse_fields(fields, ExpenseResponse)
+
+
+class TestPartialModel:
+    def test_serializes_only_the_selected_fields_like_the_schema(self):
+        # Arrange
+        selection = parse_fields("id,amount,date,category.name", ExpenseResponse)
+        expense_id = uuid.uuid4()
+
+        # Act
+        item = partial_model(ExpenseResponse, selection).model_validate({
+            "id": expense_id, "amount": Decimal("12.50"), "date": date(2024, 1, 1), "category": {"name": "Food"}
+        }).model_dump(mode="json")
+
+        # Assert
+        assert item == {"amount": "12.50", "date": "2024-01-01", "id": str(expense_id), "category": {"name": "Food"}}
+
+    def test_model_is_reused_per_selection(self):
+        # Arrange
+        selection = parse_fields("id", ExpenseResponse)
+
+        # Act / Assert
+        assert partial_model(ExpenseResponse, selection) is partial_model(ExpenseResponse, selection)
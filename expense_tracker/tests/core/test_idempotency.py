@@ -0,0 +1,187 @@
+# expense_tracker/tests/core/test_idempotency.py
+import asyncio
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI, HTTPException, Response
+from httpx import ASGITransport, AsyncClient
+
+from expense_tracker.core.exceptions import IdempotencyKeyInUseError
+from expense_tracker.core.idempotency import IdempotencyMiddleware, IdempotencyStore, StoredResponse
+
+
+class InMemoryBackend:
+    """Stands in for the idempotency_key table"""
+
+    def __init__(self):
+        self.rows: dict[tuple[str, str], Optional[StoredResponse]] = {}
+
+    async def claim(self, owner, key, request_hash, expires_at) -> Optional[StoredResponse]:
+        if (owner, key) not in self.rows:
+            self.rows[(owner, key)] = None
+            return None
+        stored = self.rows[(owner, key)]
+        if stored is None:
+            raise IdempotencyKeyInUseError("A request with this Idempotency-Key is still running")
+        return stored
+
+    async def complete(self, owner, key, response) -> None:
+        self.rows[(owner, key)] = response
+
+    async def release(self, owner, key) -> None:
+        if self.rows.get((owner, key)) is None:
+            self.rows.pop((owner, key), None)
+
+
+@pytest.fixture
+def backend():
+    return InMemoryBackend()
+
+
+@pytest.fixture
+def app(backend):
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.post("/users", status_code=201)
+    async def create_user(user: dict):
+        app.state.calls += 1
+        await asyncio.sleep(0.02)
+        if user.get("fail"):
+            raise HTTPException(status_code=user.get("status", 503), detail="Try again")
+        return {"call": app.state.calls, **user}
+
+    @app.post("/auth/refresh")
+    async def refresh():
+        app.state.calls += 1
+        return {"call": app.state.calls}
+
+    @app.post("/tokens")
+    async def create_token(response: Response):
+        app.state.calls += 1
+        response.headers["Cache-Control"] = "no-store"
+        return {"access_token": f"token-{app.state.calls}"}
+
+    store = IdempotencyStore(backend, capacity=10, ttl=60)
+    app.add_middleware(IdempotencyMiddleware, store=store, max_body_bytes=1024, excluded_paths=["/auth/*"])
+    return app
+
+
+def client_for(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestIdempotencyMiddleware:
+    @pytest.mark.asyncio
+    async def test_retry_gets_the_first_response(self, app):
+        async with client_for(app) as client:
+            # Act
+            first = await client.post("/users", json={"email": "a@b.c"}, headers={"Idempotency-Key": "k1"})
+            retry = await client.post("/users", json={"email": "a@b.c"}, headers={"Idempotency-Key": "k1"})
+
+        # Assert
+        assert app.state.calls == 1
+        assert (retry.status_code, retry.json()) == (201, first.json())
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_run_once(self, app):
+        async with client_for(app) as client:
+            # Act
+            responses = await asyncio.gather(*(
+                client.post("/users", json={"email": "a@b.c"}, headers={"Idempotency-Key": "k1"})
+                for _ in range(3)
+            ))
+
+        # Assert
+        assert app.state.calls == 1
+        assert {response.json()["call"] for response in responses} == {1}
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_another_request_is_refused(self, app):
+        async with client_for(app) as client:
+            # Act
+            await client.post("/users", json={"email": "a@b.c"}, headers={"Idempotency-Key": "k1"})
+            other = await client.post("/users", json={"email": "x@y.z"}, headers={"Idempotency-Key": "k1"})
+
+        # Assert
+        assert other.status_code == 422
+        assert app.state.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_server_errors_are_not_stored(self, app, backend):
+        async with client_for(app) as client:
+            # Act
+            for _ in range(2):
+                response = await client.post("/users", json={"fail": True}, headers={"Idempotency-Key": "k1"})
+
+        # Assert
+        assert response.status_code == 503
+        assert app.state.calls == 2
+        assert backend.rows == {}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code", [401, 429])
+    async def test_retryable_client_errors_are_not_stored(self, app, backend, status_code):
+        async with client_for(app) as client:
+            # Act
+            for _ in range(2):
+                response = await client.post(
+                    "/users", json={"fail": True, "status": status_code}, headers={"Idempotency-Key": "k1"}
+                )
+
+        # Assert
+        assert response.status_code == status_code
+        assert "idempotent-replayed" not in response.headers
+        assert app.state.calls == 2
+        assert backend.rows == {}
+
+    @pytest.mark.asyncio
+    async def test_excluded_paths_ignore_the_key(self, app, backend):
+        async with client_for(app) as client:
+            # Act
+            for _ in range(2):
+                response = await client.post("/auth/refresh", headers={"Idempotency-Key": "k1"})
+
+        # Assert
+        assert response.json() == {"call": 2}
+        assert "idempotent-replayed" not in response.headers
+        assert backend.rows == {}
+
+    @pytest.mark.asyncio
+    async def test_no_store_responses_are_not_stored(self, app, backend):
+        async with client_for(app) as client:
+            # Act
+            for _ in range(2):
+                response = await client.post("/tokens", headers={"Idempotency-Key": "k1"})
+
+        # Assert
+        assert response.json() == {"access_token": "token-2"}
+        assert backend.rows == {}
+
+    @pytest.mark.asyncio
+    async def test_key_in_use_on_another_worker_gets_409(self, app, backend):
+        # Arrange
+        backend.rows[("address:127.0.0.1", "k1")] = None
+
+        async with client_for(app) as client:
+            # Act
+            response = await client.post("/users", json={}, headers={"Idempotency-Key": "k1"})
+
+        # Assert
+        assert response.status_code == 409
+        assert response.headers["retry-after"] == "1"
+        assert app.state.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_requests_without_a_key_are_passed_through(self, app):
+        async with client_for(app) as client:
+            # Act
+            for _ in range(2):
+                await client.post("/users", json={})
+            invalid = await client.post("/users", json={}, headers={"Idempotency-Key": "a b"})
+
+        # Assert
+        assert app.state.calls == 2
+        assert invalid.status_code == 400
@@ -0,0 +1,123 @@
+# expense_tracker/tests/core/test_invalidation.py
+import asyncio
+import uuid
+
+import pytest
+
+from expense_tracker.core.invalidation import EntityChange, InvalidationBus
+
+
+def make_bus(dsn: str = "postgresql://localhost:1/none") -> InvalidationBus:
+    return InvalidationBus(
+        dsn,
+        coalesce_seconds=0.0,
+        reconnect_max_seconds=0.01,
+        healthcheck_seconds=1.0,
+    )
+
+
+class TestEntityChange:
+    def test_payload_round_trip(self):
+        change = EntityChange("user", uuid.uuid4(), uuid.uuid4())
+        assert EntityChange.from_payload(change.to_payload()) == change
+
+    def test_payload_without_user(self):
+        change = EntityChange("category", uuid.uuid4())
+        assert EntityChange.from_payload(change.to_payload()) == change
+
+
+class TestInvalidationBus:
+    def test_burst_is_coalesced_per_entity(self):
+        # Arrange
+        bus = make_bus()
+        received = []
+        bus.subscribe("user", received.append, lambda: None)
+        user_id, other_id = uuid.uuid4(), uuid.uuid4()
+
+        # Act
+        for _ in range(5):
+            bus.receive(EntityChange("user", user_id).to_payload())
+        bus.receive(EntityChange("user", other_id).to_payload())
+        bus.flush()
+
+        # Assert
+        assert len(received) == 1
+        assert {change.entity_id for change in received[0]} == {user_id, other_id}
+
+    def test_changes_are_routed_by_table(self):
+        # Arrange
+        bus = make_bus()
+        users, categories = [], []
+        bus.subscribe("user", users.extend, lambda: None)
+        bus.subscribe("category", categories.extend, lambda: None)
+        category_id = uuid.uuid4()
+
+        # Act
+        bus.receive(EntityChange("category", category_id).to_payload())
+        bus.flush()
+
+        # Assert
+        assert users == []
+        assert [change.entity_id for change in categories] == [category_id]
+
+    def test_failing_subscriber_does_not_stop_the_others(self):
+        # Arrange
+        bus = make_bus()
+        received = []
+
+        def broken(changes):
+            raise RuntimeError("boom")
+
+        bus.subscribe("user", broken, lambda: None)
+        bus.subscribe("user", received.extend, lambda: None)
+        user_id = uuid.uuid4()
+
+        # Act
+        bus.receive(EntityChange("user", user_id).to_payload())
+        bus.flush()
+
+        # Assert
+        assert [change.entity_id for change in received] == [user_id]
+
+    def test_malformed_payload_is_ignored(self):
+        # Arrange
+        bus = make_bus()
+        received = []
+        bus.subscribe("user", received.append, lambda: None)
+
+        # Act
+        bus.receive("not json")
+        bus.receive('{"t": "user", "id": "not-a-uuid"}')
+        bus.flush()
+
+        # Assert
+        assert received == []
+
+    def test_resync_notifies_every_subscriber_and_drops_pending(self):
+        # Arrange
+        bus = make_bus()
+        resyncs, received = [], []
+        bus.subscribe("user", received.append, lambda: resyncs.append("user"))
+        bus.subscribe("category", received.append, lambda: resyncs.append("category"))
+        bus.receive(EntityChange("user", uuid.uuid4()).to_payload())
+
+        # Act
+        bus.resync()
+        bus.flush()
+
+        # Assert
+        assert sorted(resyncs) == ["category", "user"]
+        assert received == []
+
+    @pytest.mark.asyncio
+    async def test_unreachable_database_keeps_retrying_until_stopped(self):
+        # Arrange
+        bus = make_bus()
+
+        # Act
+        await bus.start()
+        await asyncio.sleep(0.05)
+        await bus.stop()
+
+        # Assert
+        assert not bus.connected
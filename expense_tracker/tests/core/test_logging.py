@@ -0,0 +1,116 @@
+# expense_tracker/tests/core/test_logging.py
+import io
+import json
+import logging
+import queue
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from expense_tracker.core.logging import (
+    CorrelationIdMiddleware,
+    JsonFormatter,
+    LoggingPipeline,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    correlation_id,
+)
+
+
+def make_record(level: int = logging.INFO, msg: str = "SELECT %s", args=(1,)) -> logging.LogRecord:
+    return logging.LogRecord("sqlalchemy.engine.Engine", level, __file__, 1, msg, args, None)
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/id")
+    async def get_id():
+        return {"correlation_id": correlation_id.get()}
+
+    app.add_middleware(CorrelationIdMiddleware)
+    return app
+
+
+class TestSamplingFilter:
+    def test_records_of_a_request_are_kept_or_dropped_together(self):
+        # Arrange
+        sampler = SamplingFilter({logging.INFO: 0.5})
+        kept = {}
+
+        # Act
+        for request_id in (f"request-{i}" for i in range(200)):
+            token = correlation_id.set(request_id)
+            kept[request_id] = {sampler.filter(make_record()) for _ in range(5)}
+            correlation_id.reset(token)
+
+        # Assert
+        assert all(len(decisions) == 1 for decisions in kept.values())
+        assert 60 < sum(decisions == {True} for decisions in kept.values()) < 140
+
+    def test_warnings_and_unsampled_levels_are_always_kept(self):
+        # Arrange
+        sampler = SamplingFilter({logging.INFO: 0.0, logging.WARNING: 0.0})
+
+        # Act / Assert
+        assert not sampler.filter(make_record(logging.INFO))
+        assert sampler.filter(make_record(logging.WARNING))
+        assert sampler.filter(make_record(logging.DEBUG))
+
+
+class TestLoggingPipeline:
+    def test_records_are_written_as_json_with_their_correlation_id(self):
+        # Arrange
+        stream = io.StringIO()
+        pipeline = LoggingPipeline(queue_size=10, formatter=JsonFormatter(), stream=stream)
+        logger = logging.getLogger("test_logging.pipeline")
+        logger.addHandler(pipeline.handler)
+        logger.propagate = False
+        pipeline.start()
+        token = correlation_id.set("abc")
+
+        # Act
+        try:
+            logger.warning("Took %.1fs", 1.5, extra={"route": "/items"})
+        finally:
+            correlation_id.reset(token)
+            pipeline.stop()
+            logger.removeHandler(pipeline.handler)
+
+        # Assert
+        entry = json.loads(stream.getvalue())
+        assert entry["message"] == "Took 1.5s"
+        assert entry["correlation_id"] == "abc"
+        assert entry["route"] == "/items"
+        assert entry["level"] == "WARNING"
+
+    def test_full_queue_drops_records_instead_of_blocking(self):
+        # Arrange
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+        # Act
+        for _ in range(3):
+            handler.handle(make_record())
+
+        # Assert
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 2
+        assert handler.queue.get_nowait().msg == "SELECT 1"
+
+
+class TestCorrelationIdMiddleware:
+    def test_incoming_request_id_is_used_and_echoed(self):
+        # Act
+        response = TestClient(make_app()).get("/id", headers={"x-request-id": "req-1"})
+
+        # Assert
+        assert response.json() == {"correlation_id": "req-1"}
+        assert response.headers["x-request-id"] == "req-1"
+
+    def test_malformed_request_id_is_replaced(self):
+        # Act
+        response = TestClient(make_app()).get("/id", headers={"x-request-id": "a b\tc"})
+
+        # Assert
+        assert response.json()["correlation_id"] != "a b\tc"
+        assert response.headers["x-request-id"] == response.json()["correlation_id"]
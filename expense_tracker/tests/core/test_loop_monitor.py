@@ -0,0 +1,60 @@
+# expense_tracker/tests/core/test_loop_monitor.py
+import asyncio
+import time
+
+import pytest
+
+from expense_tracker.core.loop_monitor import LoopMonitor
+
+
+def blocking_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+class TestLoopMonitor:
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_caught_with_its_stack(self):
+        # Arrange
+        monitor = LoopMonitor(interval=0.01, threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.03)
+
+        # Act
+        blocking_call(0.2)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        # Assert
+        assert monitor.blocked_count == 1
+        (detection,) = monitor.stats().detections
+        assert "blocking_call" in detection.stack[-1]
+        assert detection.duration >= 0.1
+        assert monitor.max_lag >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_is_not_reported(self):
+        # Arrange
+        monitor = LoopMonitor(interval=0.01, threshold=0.05)
+
+        # Act
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+        # Assert
+        assert monitor.blocked_count == 0
+        assert monitor.lag.count > 0
+
+    def test_lag_is_exported_as_a_histogram(self):
+        # Arrange
+        monitor = LoopMonitor(interval=0.01, threshold=0.05)
+        monitor.record(0.003)
+        monitor.record(-0.001)  # Timers may fire a hair early
+
+        # Act
+        lines = monitor.render_metrics()
+
+        # Assert
+        assert 'event_loop_lag_seconds_bucket{le="0.001"} 1' in lines
+        assert 'event_loop_lag_seconds_bucket{le="0.005"} 2' in lines
+        assert "event_loop_blocked_total 0" in lines
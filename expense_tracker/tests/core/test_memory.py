@@ -0,0 +1,110 @@
+# expense_tracker/tests/core/test_memory.py
+import gc
+import uuid
+
+import pytest
+from sqlalchemy.orm import make_transient_to_detached
+
+from expense_tracker.core.memory import InstanceCounter, MemoryMonitor
+from expense_tracker.db.session import IdentityMapWatch, WatchedSession
+from expense_tracker.models.base import Base
+from expense_tracker.models.category import Category
+
+
+@pytest.fixture
+def monitor():
+    monitor = MemoryMonitor(
+        interval=0,
+        history_size=10,
+        max_snapshots=2,
+        instances=InstanceCounter(),
+        sessions=IdentityMapWatch(threshold=2),
+    )
+    yield monitor
+    monitor.stop_tracing()
+
+
+def allocate(count: int) -> list:
+    return [bytearray(1000) for _ in range(count)]
+
+
+class TestInstanceCounter:
+    def test_instances_are_uncounted_once_collected(self):
+        # Arrange
+        counter = InstanceCounter()
+        counter.install(Base)
+
+        # Act
+        try:
+            categories = [Category(name=f"c{i}") for i in range(3)]
+            during = counter.counts()
+            del categories
+            gc.collect()
+            after = counter.counts()
+        finally:
+            counter.uninstall(Base)
+
+        # Assert
+        assert during == {"Category": 3}
+        assert after == {}
+
+
+class TestIdentityMapWatch:
+    def test_sessions_closed_holding_too_many_objects_are_flagged(self, caplog):
+        # Arrange
+        watch = IdentityMapWatch(threshold=2)
+        categories = [Category(id=uuid.uuid4(), name=f"c{i}") for i in range(3)]
+        for category in categories:
+            make_transient_to_detached(category)
+
+        # Act
+        for held in (categories[:2], categories):
+            session = WatchedSession()
+            session.add_all(held)
+            watch.check(session)
+            session.close()
+
+        # Assert
+        assert (watch.closed, watch.flagged, watch.largest) == (2, 1, 3)
+        assert "Session closed holding 3 objects: Category=3" in caplog.text
+
+
+class TestMemoryMonitor:
+    def test_snapshot_requires_tracing(self, monitor):
+        assert monitor.take_snapshot() is None
+
+    def test_diff_shows_where_memory_grew(self, monitor):
+        # Arrange
+        monitor.start_tracing(frames=1)
+        base = monitor.take_snapshot()
+        retained = allocate(1000)
+
+        # Act
+        snapshot = monitor.take_snapshot()
+        diff = monitor.diff(snapshot.id, base.id, "lineno", limit=1)
+
+        # Assert
+        (site,) = diff
+        assert site.traceback[-1].endswith(f"test_memory.py:{allocate.__code__.co_firstlineno + 1}")
+        assert site.size_diff >= 1000 * len(retained)
+        assert monitor.top(snapshot.id, "filename", limit=5)
+
+    def test_only_the_newest_snapshots_are_kept(self, monitor):
+        # Arrange
+        monitor.start_tracing(frames=1)
+
+        # Act
+        ids = [monitor.take_snapshot().id for _ in range(3)]
+
+        # Assert
+        assert [info.id for info in monitor.stats().snapshots] == [ids[2], ids[1]]
+        assert not monitor.has_snapshot(ids[0])
+
+    def test_gauges_are_exported(self, monitor):
+        # Act
+        lines = monitor.render_metrics()
+
+        # Assert
+        assert any(line.startswith("process_resident_memory_bytes ") for line in lines)
+        assert "db_sessions_flagged_total 0" in lines
+        assert not any(line.startswith("tracemalloc_traced_bytes ") for line in lines)
@@ -0,0 +1,106 @@
+# expense_tracker/tests/core/test_metrics.py
+import asyncio
+import threading
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from expense_tracker.core.metrics import (
+    UNMATCHED_ROUTE,
+    Histogram,
+    MetricsMiddleware,
+    MetricsRegistry,
+    RequestTiming,
+    current_timing,
+    render_request_metrics,
+)
+from expense_tracker.core.security import PasswordHashExecutor
+
+
+def make_app(registry: MetricsRegistry) -> FastAPI:
+    router = APIRouter()
+
+    @router.get("/{item_id}")
+    async def get_item(item_id: str):
+        timing = current_timing.get()
+        timing.db_time += 0.02
+        timing.db_statements += 2
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/items")
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    return app
+
+
+class TestHistogram:
+    def test_values_fall_into_upper_bound_buckets(self):
+        # Arrange
+        histogram = Histogram((0.1, 1.0))
+
+        # Act
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        # Assert
+        assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(3.65)
+
+
+class TestMetricsMiddleware:
+    def test_requests_are_labelled_with_the_route_template(self):
+        # Arrange
+        registry = MetricsRegistry()
+        client = TestClient(make_app(registry))
+
+        # Act
+        client.get("/items/a")
+        client.get("/items/b")
+        client.get("/missing")
+
+        # Assert
+        metrics = registry.routes[("GET", "/items/{item_id}")]
+        assert metrics.latency.count == 2
+        assert metrics.statuses == {200: 2}
+        assert metrics.db_statements == 4
+        assert metrics.db_time.sum == pytest.approx(0.04)
+        assert registry.routes[("GET", UNMATCHED_ROUTE)].statuses == {404: 1}
+        assert registry.in_flight == 0
+
+    def test_timing_is_only_set_during_a_request(self):
+        assert current_timing.get() is None
+
+    def test_exposition_format(self):
+        # Arrange
+        registry = MetricsRegistry()
+        registry.record("GET", '/a"b', 200, 0.003, RequestTiming())
+
+        # Act
+        lines = render_request_metrics(registry)
+
+        # Assert
+        assert "# TYPE http_request_duration_seconds histogram" in lines
+        assert 'http_requests_total{method="GET",route="/a\\"b",status="200"} 1' in lines
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/a\\"b",le="0.005"} 1' in lines
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/a\\"b",le="+Inf"} 1' in lines
+
+
+class TestPasswordHashExecutor:
+    @pytest.mark.asyncio
+    async def test_queue_depth_counts_calls_waiting_for_a_thread(self):
+        # Arrange
+        executor = PasswordHashExecutor(max_workers=1)
+        release = threading.Event()
+        calls = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        # Act
+        in_flight, queue_depth = executor.in_flight, executor.queue_depth
+        release.set()
+        await asyncio.gather(*calls)
+
+        # Assert
+        assert (in_flight, queue_depth) == (3, 2)
+        assert (executor.in_flight, executor.queue_depth, executor.completed) == (0, 0, 3)
@@ -0,0 +1,27 @@
+# expense_tracker/tests/core/test_pagination.py
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from expense_tracker.core.exceptions import InvalidCursorError
+from expense_tracker.core.pagination import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    def test_round_trip(self):
+        # Arrange
+        created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        row_id = uuid.uuid4()
+
+        # Act
+        cursor = encode_cursor(created_at, row_id)
+
+        # Assert
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (created_at, row_id)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bm90LWEtY3Vyc29y", "!!!"])
+    def test_malformed_cursor_is_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
@@ -0,0 +1,91 @@
+# expense_tracker/tests/core/test_profiling.py
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from expense_tracker.core import profiling
+from expense_tracker.core.profiling import (
+    WAITING_FRAME,
+    ProfilingMiddleware,
+    SamplingProfiler,
+    profile_request,
+)
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    sampler = SamplingProfiler(directory=str(tmp_path), interval=0.001, max_seconds=5, max_files=2)
+    monkeypatch.setattr(profiling, "profiler", sampler)
+    monkeypatch.setattr(profiling.settings, "ADMIN_TOKEN", "secret")
+    return sampler
+
+
+def make_app(profiler: SamplingProfiler) -> FastAPI:
+    app = FastAPI(dependencies=[Depends(profile_request)])
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        await asyncio.sleep(0.02)
+        return {"id": item_id}
+
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    return app
+
+
+class TestSamplingProfiler:
+    def test_every_nth_request_of_a_route_is_sampled(self, profiler):
+        # Arrange
+        profiler.rules[("GET", "/items/{item_id}")] = 3
+
+        # Act
+        decisions = [profiler.should_sample("GET", "/items/{item_id}") for _ in range(6)]
+
+        # Assert
+        assert decisions == [False, False, True, False, False, True]
+        assert not profiler.should_sample("POST", "/items/{item_id}")
+
+    @pytest.mark.parametrize("name", ["../secret.folded", "a/b.folded", "profile.txt", "missing.folded"])
+    def test_unknown_or_malformed_names_have_no_path(self, profiler, name):
+        assert profiler.profile_path(name) is None
+
+
+class TestProfilingMiddleware:
+    def test_profile_header_requires_the_admin_token(self, profiler):
+        # Arrange
+        client = TestClient(make_app(profiler))
+
+        # Act
+        response = client.get("/items/1", headers={"x-profile": "wrong"})
+
+        # Assert
+        assert "x-profile-name" not in response.headers
+        assert profiler.list_profiles() == []
+
+    def test_profiled_request_is_stored_as_collapsed_stacks(self, profiler):
+        # Arrange
+        client = TestClient(make_app(profiler))
+
+        # Act
+        response = client.get("/items/1", headers={"x-profile": "secret"})
+
+        # Assert
+        name = response.headers["x-profile-name"]
+        assert [profile.name for profile in profiler.list_profiles()] == [name]
+        lines = profiler.profile_path(name).read_text().splitlines()
+        assert lines
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        # The request spends most of its time suspended in asyncio.sleep
+        assert any("get_item" in line and WAITING_FRAME in line for line in lines)
+
+    def test_only_the_newest_profiles_are_kept(self, profiler):
+        # Arrange
+        client = TestClient(make_app(profiler))
+
+        # Act
+        names = [client.get("/items/1", headers={"x-profile": "secret"}).headers["x-profile-name"]
+                 for _ in range(3)]
+
+        # Assert
+        assert {profile.name for profile in profiler.list_profiles()} == set(names[1:])
@@ -0,0 +1,107 @@
+# expense_tracker/tests/core/test_singleflight.py
+import asyncio
+
+import pytest
+
+from expense_tracker.core.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        # Arrange
+        flight = SingleFlight("test")
+        executions = 0
+
+        async def load():
+            nonlocal executions
+            executions += 1
+            await asyncio.sleep(0.01)
+            return {"rows": 3}
+
+        # Act
+        results = await asyncio.gather(*(flight.do("key", load) for _ in range(10)))
+
+        # Assert
+        assert executions == 1
+        assert all(result is results[0] for result in results)
+        assert (flight.stats().executions, flight.stats().coalesced) == (1, 9)
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        flight = SingleFlight("test")
+
+        async def load(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(flight.do("a", lambda: load(1)), flight.do("b", lambda: load(2)))
+        assert results == [1, 2]
+        assert flight.stats().executions == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared_and_key_is_released(self):
+        # Arrange
+        flight = SingleFlight("test")
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        # Act
+        results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+
+        # Assert
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_work(self):
+        # Arrange
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", load))
+        follower = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+
+        # Act
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        # Assert
+        assert await follower == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert flight.stats().cancellations == 1
+
+    @pytest.mark.asyncio
+    async def test_work_is_cancelled_when_last_caller_times_out(self):
+        # Arrange
+        flight = SingleFlight("test")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def load():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        # Act
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do("key", load, timeout=0.01)
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        # Assert
+        assert started.is_set()
+        assert flight.stats().timeouts == 1
+        assert flight.in_flight == 0
@@ -0,0 +1,119 @@
+# expense_tracker/tests/core/test_tracing.py
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from expense_tracker.core.tracing import (
+    MemoryExporter,
+    Trace,
+    TracingMiddleware,
+    current_span,
+    server_timing,
+    span,
+    traced,
+)
+
+
+@traced
+class ItemService:
+    async def get_item(self, item_id: str) -> dict:
+        with span("db SELECT", kind="db"):
+            await asyncio.sleep(0)
+        return await self.enrich({"id": item_id})
+
+    async def enrich(self, item: dict) -> dict:
+        return {**item, "enriched": True}
+
+
+def make_app(exporter: MemoryExporter) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return await ItemService().get_item(item_id)
+
+    app.add_middleware(TracingMiddleware, exporter=exporter)
+    return app
+
+
+class TestSpans:
+    @pytest.mark.asyncio
+    async def test_spans_are_noops_outside_a_trace(self):
+        # Act
+        with span("anything") as opened:
+            result = await ItemService().get_item("a")
+
+        # Assert
+        assert opened is None
+        assert result == {"id": "a", "enriched": True}
+
+    @pytest.mark.asyncio
+    async def test_context_propagates_into_tasks(self):
+        # Arrange
+        trace = Trace(trace_id="t", started_at=0.0)
+        root = trace.open("root", "http", None)
+        token = current_span.set(root)
+
+        # Act
+        try:
+            await asyncio.gather(ItemService().enrich({}), ItemService().enrich({}))
+        finally:
+            current_span.reset(token)
+
+        # Assert
+        assert [s.name for s in trace.spans] == ["root", "ItemService.enrich", "ItemService.enrich"]
+        assert all(s.parent_id == root.span_id for s in trace.spans[1:])
+
+    def test_server_timing_counts_outermost_service_calls(self):
+        # Arrange
+        trace = Trace(trace_id="t", started_at=0.0)
+        root = trace.open("root", "http", None)
+        outer = trace.open("outer", "service", root)
+        inner = trace.open("inner", "service", outer)
+        query = trace.open("db SELECT", "db", inner)
+        root.start, root.end = 0.0, 0.010
+        outer.start, outer.end = 0.001, 0.008
+        inner.start, inner.end = 0.002, 0.007
+        query.start, query.end = 0.003, 0.005
+
+        # Act
+        header = server_timing(trace)
+
+        # Assert
+        assert header == 'total;dur=10.0, service;dur=7.0, db;dur=2.0;desc="1 queries"'
+
+
+class TestTracingMiddleware:
+    def test_request_is_traced_and_summarised(self):
+        # Arrange
+        exporter = MemoryExporter(max_traces=10)
+        client = TestClient(make_app(exporter))
+        traceparent = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+
+        # Act
+        response = client.get("/items/1", headers={"traceparent": traceparent})
+
+        # Assert
+        assert response.json() == {"id": "1", "enriched": True}
+        assert response.headers["server-timing"].startswith("total;dur=")
+        (record,) = exporter.recent(10)
+        assert record["trace_id"] == "a" * 32
+        names = [s["name"] for s in record["spans"]]
+        assert names == ["GET /items/{item_id}", "ItemService.get_item", "db SELECT", "ItemService.enrich"]
+        assert record["spans"][0]["parent_id"] == "b" * 16
+        assert current_span.get() is None
+
+    def test_exporter_keeps_most_recent_traces_first(self):
+        # Arrange
+        exporter = MemoryExporter(max_traces=2)
+        client = TestClient(make_app(exporter))
+
+        # Act
+        for item_id in ("1", "2", "3"):
+            client.get(f"/items/{item_id}")
+
+        # Assert
+        assert len(exporter.recent(10)) == 2
+        assert exporter.recent(1)[0]["started_at"] >= exporter.recent(2)[1]["started_at"]
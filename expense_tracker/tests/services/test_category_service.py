@@ -0,0 +1,91 @@
+# expense_tracker/tests/services/test_category_service.py
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.exceptions import (
+    CategoryInUseError,
+    CategoryNotFoundError,
+    DuplicateCategoryError,
+    PermissionDeniedError,
+)
+from expense_tracker.models.tombstone import Tombstone
+from expense_tracker.schemas.category import CategoryCreate, CategoryUpdate
+from expense_tracker.services.category import CategoryService
+from expense_tracker.tests.utils import add_category, add_expense, add_user
+
+
+@pytest.mark.asyncio
+class TestCategoryService:
+    async def test_list_shows_system_and_own_categories(self, db_session: AsyncSession):
+        # Arrange
+        user, other = await add_user(db_session), await add_user(db_session)
+        system = await add_category(db_session, name="System")
+        own = await add_category(db_session, user, name="Own")
+        await add_category(db_session, other, name="Foreign")
+
+        # Act
+        categories = await CategoryService(db_session).list_categories(user.id)
+
+        # Assert
+        ids = {category.id for category in categories}
+        assert {system.id, own.id} <= ids
+        assert all(category.user_id in (None, user.id) for category in categories)
+
+    async def test_name_of_a_visible_category_can_not_be_reused(self, db_session: AsyncSession):
+        # Arrange
+        user = await add_user(db_session)
+        await add_category(db_session, name="Rent")
+        service = CategoryService(db_session)
+
+        # Act & Assert
+        with pytest.raises(DuplicateCategoryError):
+            await service.create_category(user.id, CategoryCreate(name="Rent"))
+
+    async def test_rename_is_seen_through_the_cache(self, db_session: AsyncSession):
+        # Arrange
+        user = await add_user(db_session)
+        service = CategoryService(db_session)
+        category = await service.create_category(user.id, CategoryCreate(name="Snacks"))
+        await service.get_visible_category(user.id, category.id)  # Cached
+
+        # Act
+        await service.update_category(user.id, category.id, CategoryUpdate(name="Treats"))
+
+        # Assert
+        assert (await service.get_visible_category(user.id, category.id)).name == "Treats"
+        assert await service.get_category_by_name(user.id, "Snacks") is None
+
+    async def test_system_category_can_not_be_changed(self, db_session: AsyncSession):
+        # Arrange
+        user = await add_user(db_session)
+        system = await add_category(db_session, name="Utilities")
+
+        # Act & Assert
+        with pytest.raises(PermissionDeniedError):
+            await CategoryService(db_session).update_category(user.id, system.id, CategoryUpdate(name="Mine"))
+
+    async def test_delete_leaves_a_tombstone(self, db_session: AsyncSession):
+        # Arrange
+        user = await add_user(db_session)
+        service = CategoryService(db_session)
+        category = await service.create_category(user.id, CategoryCreate(name="Hobbies"))
+
+        # Act
+        await service.delete_category(user.id, category.id)
+
+        # Assert
+        with pytest.raises(CategoryNotFoundError):
+            await service.get_visible_category(user.id, category.id)
+        tombstone = await db_session.scalar(select(Tombstone).where(Tombstone.entity_id == category.id))
+        assert tombstone.table_name == "category"
+
+    async def test_category_with_expenses_can_not_be_deleted(self, db_session: AsyncSession):
+        # Arrange
+        user = await add_user(db_session)
+        category = await add_category(db_session, user, name="Travel")
+        await add_expense(db_session, user, category)
+
+        # Act & Assert
+        with pytest.raises(CategoryInUseError):
+            await CategoryService(db_session).delete_category(user.id, category.id)
@@ -0,0 +1,141 @@
+# expense_tracker/tests/services/test_expense_batch.py
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from expense_tracker.schemas.expense import (
+    ExpenseBatchCreate,
+    ExpenseBatchDelete,
+    ExpenseBatchRequest,
+    ExpenseBatchUpdate,
+    ExpenseBulkUpdate,
+    ExpenseResponse,
+)
+from expense_tracker.core.fields import parse_fields
+from expense_tracker.models.expense import Expense
+from expense_tracker.schemas.queries import ExpenseFilter
+from expense_tracker.services.expense import filter_conditions, row_limit, select_fields, update_values
+
+
+class TestExpenseBatchRequest:
+    def test_operations_are_parsed_by_op(self):
+        # Arrange
+        expense_id = uuid.uuid4()
+        payload = {
+            "operations": [
+                {"op": "create", "data": {
+                    "amount": "12.50", "description": "Lunch", "date": "2024-01-01",
+                    "category_id": str(uuid.uuid4())
+                }},
+                {"op": "update", "id": str(expense_id), "data": {"amount": "3.00"}},
+                {"op": "delete", "id": str(expense_id)},
+            ]
+        }
+
+        # Act
+        batch = ExpenseBatchRequest.model_validate(payload)
+
+        # Assert
+        assert [type(op) for op in batch.operations] == [
+            ExpenseBatchCreate, ExpenseBatchUpdate, ExpenseBatchDelete
+        ]
+        assert batch.atomic is True
+        assert batch.operations[0].id is None
+
+    @pytest.mark.parametrize("operation", [
+        {"op": "upsert", "id": str(uuid.uuid4())},
+        {"op": "update", "data": {"amount": "1.00"}},
+        {"op": "delete"},
+    ])
+    def test_malformed_operation_is_rejected(self, operation):
+        with pytest.raises(ValidationError):
+            ExpenseBatchRequest.model_validate({"operations": [operation]})
+
+    def test_empty_batch_is_rejected(self):
+        with pytest.raises(ValidationError):
+            ExpenseBatchRequest.model_validate({"operations": []})
+
+
+class TestUpdateValues:
+    def test_only_set_fields_are_written(self):
+        # Arrange
+        operation = ExpenseBatchUpdate.model_validate({
+            "op": "update", "id": str(uuid.uuid4()), "data": {"amount": "3.00", "description": None}
+        })
+
+        # Act
+        values = update_values(operation)
+
+        # Assert
+        assert values == {"amount": Decimal("3.00")}
+
+
+class TestBulkFilter:
+    def test_conditions_are_scoped_to_the_user(self):
+        # Arrange
+        user_id = uuid.uuid4()
+        expense_filter = ExpenseFilter(
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            category_id=[uuid.uuid4()],
+            description_contains="50%_off",
+            shared_only=True,
+        )
+
+        # Act
+        query = select(Expense.id).where(*filter_conditions(user_id, expense_filter))
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        # Assert
+        assert "expense.user_id = " in sql
+        assert "expense.date >= " in sql and "expense.date <= " in sql
+        assert "expense.category_id IN" in sql
+        assert "ILIKE" in sql and "ESCAPE" in sql
+        assert "EXISTS" in sql
+
+    def test_empty_filter_still_scopes_to_the_user(self):
+        conditions = filter_conditions(uuid.uuid4(), ExpenseFilter())
+        assert len(conditions) == 1
+
+    def test_row_limit_never_exceeds_the_server_limit(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr("expense_tracker.services.expense.settings.EXPENSE_BULK_MAX_ROWS", 100)
+
+        # Act / Assert
+        assert row_limit(None) == 100
+        assert row_limit(10) == 10
+        assert row_limit(1_000) == 100
+
+    def test_empty_patch_is_rejected(self):
+        with pytest.raises(ValidationError):
+            ExpenseBulkUpdate.model_validate({"filter": {}, "patch": {"description": None}})
+
+
+class TestSelectFields:
+    def test_only_selected_columns_are_read(self):
+        # Arrange
+        selection = parse_fields("id,amount", ExpenseResponse)
+
+        # Act
+        sql = str(select_fields(selection).compile(dialect=postgresql.dialect()))
+
+        # Assert
+        assert "expense.description" not in sql
+        assert "JOIN" not in sql
+
+    def test_relation_is_joined_only_for_its_fields(self):
+        # Arrange
+        selection = parse_fields("id,category.name", ExpenseResponse)
+
+        # Act
+        sql = str(select_fields(selection).compile(dialect=postgresql.dialect()))
+
+        # Assert
+        assert "JOIN category" in sql
+        assert "category.name AS category__name" in sql
+        assert "user" not in sql
@@ -0,0 +1,179 @@
+# expense_tracker/tests/services/test_expense_service.py
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.exceptions import BulkLimitExceededError
+from expense_tracker.models.expense import Expense
+from expense_tracker.models.shared_expense import SharedExpense
+from expense_tracker.models.tombstone import Tombstone
+from expense_tracker.schemas.expense import ExpenseBatchRequest, ExpenseBulkDelete, ExpenseBulkUpdate
+from expense_tracker.schemas.shared_expense import SharedExpenseCreate, SharedExpenseStatus, SharedExpenseUpdate
+from expense_tracker.services.expense import NOT_APPLIED, ExpenseService
+from expense_tracker.services.ledger import LedgerService
+from expense_tracker.services.shared_expense import SharedExpenseService
+from expense_tracker.tests.utils import add_category, add_expense, add_user
+
+
+async def share_accepted(db_session: AsyncSession, owner, debtor, expense: Expense, percentage: int) -> None:
+    service = SharedExpenseService(db_session)
+    share = await service.create_shared_expense(owner.id, SharedExpenseCreate(
+        expense_id=expense.id, shared_with_user_id=debtor.id, split_percentage=Decimal(percentage)
+    ))
+    await service.update_shared_expense(debtor.id, share.id, SharedExpenseUpdate(status=SharedExpenseStatus.ACCEPTED))
+
+
+async def count(db_session: AsyncSession, model, *conditions) -> int:
+    return await db_session.scalar(select(func.count()).select_from(model).where(*conditions))
+
+
+def create_op(category_id: uuid.UUID, amount: str = "10.00") -> dict:
+    return {"op": "create", "data": {
+        "amount": amount, "description": "Batch", "date": "2024-01-01", "category_id": str(category_id)
+    }}
+
+
+@pytest.mark.asyncio
+class TestApplyBatch:
+    async def test_atomic_batch_with_an_invalid_operation_applies_nothing(self, db_session: AsyncSession):
+        # Arrange
+        user = await add_user(db_session)
+        category = await add_category(db_session, user)
+        expense = await add_expense(db_session, user, category)
+        await db_session.commit()
+        user_id = user.id  # The rollback expires loaded objects
+        batch = ExpenseBatchRequest.model_validate({"operations": [
+            create_op(category.id),
+            {"op": "delete", "id": str(expense.id)},
+            {"op": "delete", "id": str(uuid.uuid4())},
+        ]})
+
+        # Act
+        result = await ExpenseService(db_session).apply_batch(user_id, batch)
+
+        # Assert
+        assert result.committed is False
+        assert [item.detail for item in result.results[:2]] == [NOT_APPLIED, NOT_APPLIED]
+        assert "not found" in result.results[2].detail
+        assert await count(db_session, Expense, Expense.user_id == user_id) == 1
+
+    async def test_best_effort_batch_skips_invalid_operations(self, db_session: AsyncSession):
+        # Arrange
+        user = await add_user(db_session)
+        category = await add_category(db_session, user)
+        await db_session.commit()
+        batch = ExpenseBatchRequest.model_validate({"atomic": False, "operations": [
+            create_op(category.id),
+            create_op(uuid.uuid4()),
+        ]})
+
+        # Act
+        result = await ExpenseService(db_session).apply_batch(user.id, batch)
+
+        # Assert
+        assert result.committed is True
+        assert [item.ok for item in result.results] == [True, False]
+        assert "Category" in result.results[1].detail
+        assert await count(db_session, Expense, Expense.user_id == user.id) == 1
+
+    async def test_amount_change_moves_the_ledger_with_the_shares(self, db_session: AsyncSession):
+        # Arrange
+        owner, debtor = await add_user(db_session), await add_user(db_session)
+        expense = await add_expense(db_session, owner, await add_category(db_session, owner), amount="100.00")
+        await share_accepted(db_session, owner, debtor, expense, 50)
+        batch = ExpenseBatchRequest.model_validate({"operations": [
+            {"op": "update", "id": str(expense.id), "data": {"amount": "200.00"}},
+        ]})
+
+        # Act
+        result = await ExpenseService(db_session).apply_batch(owner.id, batch)
+
+        # Assert
+        assert result.committed is True
+        balance = await LedgerService(db_session).get_balance(owner.id, debtor.id)
+        assert balance.amount == Decimal("100.00")
+
+    async def test_delete_reverses_shares_and_leaves_a_tombstone(self, db_session: AsyncSession):
+        # Arrange
+        owner, debtor = await add_user(db_session), await add_user(db_session)
+        expense = await add_expense(db_session, owner, await add_category(db_session, owner), amount="100.00")
+        await share_accepted(db_session, owner, debtor, expense, 50)
+        batch = ExpenseBatchRequest.model_validate({"operations": [{"op": "delete", "id": str(expense.id)}]})
+
+        # Act
+        await ExpenseService(db_session).apply_batch(owner.id, batch)
+
+        # Assert
+        assert (await LedgerService(db_session).get_balance(owner.id, debtor.id)).amount == Decimal("0.00")
+        assert await count(db_session, SharedExpense, SharedExpense.expense_id == expense.id) == 0
+        assert await count(db_session, Tombstone, Tombstone.entity_id == expense.id) == 1
+
+
+@pytest.mark.asyncio
+class TestBulkChanges:
+    async def test_dry_run_only_counts(self, db_session: AsyncSession):
+        # Arrange
+        user = await add_user(db_session)
+        category = await add_category(db_session, user)
+        for _ in range(3):
+            await add_expense(db_session, user, category)
+        await db_session.commit()
+
+        # Act
+        result = await ExpenseService(db_session).bulk_delete(
+            user.id, ExpenseBulkDelete(filter={}, dry_run=True)
+        )
+
+        # Assert
+        assert (result.matched, result.affected, result.dry_run) == (3, 0, True)
+        assert await count(db_session, Expense, Expense.user_id == user.id) == 3
+
+    async def test_more_matches_than_max_rows_are_refused(self, db_session: AsyncSession):
+        # Arrange
+        user = await add_user(db_session)
+        category = await add_category(db_session, user)
+        for _ in range(3):
+            await add_expense(db_session, user, category)
+        await db_session.commit()
+        user_id = user.id  # The rollback expires loaded objects
+
+        # Act & Assert
+        with pytest.raises(BulkLimitExceededError):
+            await ExpenseService(db_session).bulk_update(user_id, ExpenseBulkUpdate(
+                filter={}, patch={"description": "Changed"}, max_rows=2
+            ))
+        assert await count(db_session, Expense, Expense.user_id == user_id, Expense.description == "Changed") == 0
+
+    async def test_bulk_update_moves_the_ledger_with_the_shares(self, db_session: AsyncSession):
+        # Arrange
+        owner, debtor = await add_user(db_session), await add_user(db_session)
+        expense = await add_expense(db_session, owner, await add_category(db_session, owner), amount="100.00")
+        await share_accepted(db_session, owner, debtor, expense, 25)
+
+        # Act
+        result = await ExpenseService(db_session).bulk_update(owner.id, ExpenseBulkUpdate(
+            filter={}, patch={"amount": "40.00"}
+        ))
+
+        # Assert
+        assert (result.matched, result.affected) == (1, 1)
+        assert (await LedgerService(db_session).get_balance(owner.id, debtor.id)).amount == Decimal("10.00")
+
+    async def test_bulk_delete_reverses_shares_and_leaves_tombstones(self, db_session: AsyncSession):
+        # Arrange
+        owner, debtor = await add_user(db_session), await add_user(db_session)
+        category = await add_category(db_session, owner)
+        shared = await add_expense(db_session, owner, category, amount="100.00")
+        other = await add_expense(db_session, owner, category)
+        await share_accepted(db_session, owner, debtor, shared, 50)
+
+        # Act
+        result = await ExpenseService(db_session).bulk_delete(owner.id, ExpenseBulkDelete(filter={}))
+
+        # Assert
+        assert result.affected == 2
+        assert (await LedgerService(db_session).get_balance(owner.id, debtor.id)).amount == Decimal("0.00")
+        assert await count(db_session, Tombstone, Tombstone.entity_id.in_([shared.id, other.id])) == 2
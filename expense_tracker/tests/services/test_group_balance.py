@@ -0,0 +1,59 @@
+# expense_tracker/tests/services/test_group_balance.py
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from expense_tracker.services.group_balance import GroupBalanceService
+
+
+class RecordingSession:
+    """Stands in for AsyncSession, recording executed statements"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+
+
+class TestGroupBalanceDeltas:
+    @pytest.mark.asyncio
+    async def test_deltas_move_balance_from_debtor_to_creditor(self):
+        # Arrange
+        session = RecordingSession()
+        group_id = uuid.uuid4()
+        owner, debtor_a, debtor_b = sorted(uuid.uuid4() for _ in range(3))
+
+        # Act
+        await GroupBalanceService(session).apply_deltas([
+            (group_id, owner, debtor_a, Decimal("10.00")),
+            (group_id, owner, debtor_b, Decimal("5.50")),
+        ])
+
+        # Assert
+        (_, params), = session.calls
+        balances = {param["b_user_id"]: param["delta"] for param in params}
+        assert balances == {
+            owner: Decimal("15.50"),
+            debtor_a: Decimal("-10.00"),
+            debtor_b: Decimal("-5.50"),
+        }
+        assert [param["b_user_id"] for param in params] == [owner, debtor_a, debtor_b]
+
+    @pytest.mark.asyncio
+    async def test_ungrouped_and_cancelling_deltas_are_skipped(self):
+        # Arrange
+        session = RecordingSession()
+        group_id = uuid.uuid4()
+        owner, debtor = uuid.uuid4(), uuid.uuid4()
+
+        # Act
+        await GroupBalanceService(session).apply_deltas([
+            (None, owner, debtor, Decimal("10.00")),
+            (group_id, owner, debtor, Decimal("3.00")),
+            (group_id, owner, debtor, Decimal("-3.00")),
+        ])
+
+        # Assert
+        assert session.calls == []
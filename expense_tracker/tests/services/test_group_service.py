@@ -0,0 +1,43 @@
+# expense_tracker/tests/services/test_group_service.py
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.models.group import Group, GroupMember
+from expense_tracker.schemas.group import GroupExpenseCreate
+from expense_tracker.services.group import GroupService
+from expense_tracker.tests.utils import add_category, add_user
+
+
+@pytest.mark.asyncio
+class TestGroupExpenses:
+    async def test_concurrent_group_expenses_both_apply(self, test_engine):
+        # Arrange
+        async with AsyncSession(test_engine, expire_on_commit=False) as setup:
+            first, second, third = await add_user(setup), await add_user(setup), await add_user(setup)
+            category = await add_category(setup)
+            group = Group(name="Flat", created_by_id=first.id)
+            setup.add(group)
+            await setup.flush()
+            setup.add_all([GroupMember(group_id=group.id, user_id=user.id) for user in (first, second, third)])
+            await setup.commit()
+
+        async def record(payer_id):
+            async with AsyncSession(test_engine, expire_on_commit=False) as session:
+                expense_data = GroupExpenseCreate(
+                    amount=Decimal("30.00"), description="Dinner", date=date(2024, 1, 1), category_id=category.id
+                )
+                return await GroupService(session).create_group_expense(payer_id, group.id, expense_data)
+
+        # Act
+        await asyncio.gather(record(first.id), record(second.id))
+
+        # Assert
+        async with AsyncSession(test_engine) as session:
+            query = select(GroupMember.user_id, GroupMember.balance).where(GroupMember.group_id == group.id)
+            balances = dict((await session.execute(query)).all())
+        assert balances == {first.id: Decimal("10.00"), second.id: Decimal("10.00"), third.id: Decimal("-20.00")}
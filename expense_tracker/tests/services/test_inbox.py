@@ -0,0 +1,38 @@
+# expense_tracker/tests/services/test_inbox.py
+import uuid
+
+from expense_tracker.models.shared_expense import SharedExpenseStatus
+from expense_tracker.services.shared_expense import ShareChange
+
+
+def make_change(old_status, new_status) -> ShareChange:
+    return ShareChange(
+        owner_id=uuid.uuid4(),
+        shared_with_user_id=uuid.uuid4(),
+        old_status=old_status,
+        new_status=new_status
+    )
+
+
+class TestStatusDeltas:
+    def test_creation_counts_new_status(self):
+        change = make_change(None, SharedExpenseStatus.PENDING)
+        assert change.status_deltas == [(SharedExpenseStatus.PENDING, 1)]
+
+    def test_transition_moves_count(self):
+        change = make_change(SharedExpenseStatus.ACCEPTED, SharedExpenseStatus.SETTLED)
+        assert change.status_deltas == [
+            (SharedExpenseStatus.ACCEPTED, -1),
+            (SharedExpenseStatus.SETTLED, 1),
+        ]
+
+    def test_deletion_uncounts_old_status(self):
+        change = make_change(SharedExpenseStatus.REJECTED, None)
+        assert change.status_deltas == [(SharedExpenseStatus.REJECTED, -1)]
+
+    def test_unchanged_status_has_no_deltas(self):
+        # Arrange: e.g. only the split percentage changed
+        change = make_change(SharedExpenseStatus.PENDING, SharedExpenseStatus.PENDING)
+
+        # Act / Assert
+        assert change.status_deltas == []
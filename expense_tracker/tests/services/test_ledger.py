@@ -0,0 +1,62 @@
+# expense_tracker/tests/services/test_ledger.py
+import uuid
+from decimal import Decimal
+
+from expense_tracker.core.money import share_amount
+from expense_tracker.models.shared_expense import SharedExpenseStatus
+from expense_tracker.services.ledger import ordered_pair
+from expense_tracker.services.shared_expense import ShareChange
+
+
+class TestLedgerHelpers:
+    def test_ordered_pair_keeps_sign_relative_to_lower_user(self):
+        # Arrange
+        low, high = sorted([uuid.uuid4(), uuid.uuid4()])
+
+        # Act
+        pair_a, amount_a = ordered_pair(low, high, Decimal("10.00"))
+        pair_b, amount_b = ordered_pair(high, low, Decimal("10.00"))
+
+        # Assert
+        assert pair_a == pair_b == (low, high)
+        assert amount_a == Decimal("10.00")
+        assert amount_b == Decimal("-10.00")
+
+    def test_share_amount_rounds_half_up(self):
+        assert share_amount(Decimal("10.01"), Decimal("50.00")) == Decimal("5.01")
+        assert share_amount(Decimal("100.00"), Decimal("33.33")) == Decimal("33.33")
+
+
+class TestShareChange:
+    def make_change(self, old_status, new_status, old_amount="0", new_amount="0") -> ShareChange:
+        return ShareChange(
+            owner_id=uuid.uuid4(),
+            shared_with_user_id=uuid.uuid4(),
+            old_status=old_status,
+            new_status=new_status,
+            old_amount=Decimal(old_amount),
+            new_amount=Decimal(new_amount)
+        )
+
+    def test_pending_share_owes_nothing(self):
+        change = self.make_change(None, SharedExpenseStatus.PENDING, new_amount="25.00")
+        assert change.balance_delta == 0
+
+    def test_accepting_adds_share(self):
+        change = self.make_change(
+            SharedExpenseStatus.PENDING, SharedExpenseStatus.ACCEPTED, "25.00", "25.00")
+        assert change.balance_delta == Decimal("25.00")
+
+    def test_settling_removes_share(self):
+        change = self.make_change(
+            SharedExpenseStatus.ACCEPTED, SharedExpenseStatus.SETTLED, "25.00", "25.00")
+        assert change.balance_delta == Decimal("-25.00")
+
+    def test_resplitting_accepted_share_applies_difference(self):
+        change = self.make_change(
+            SharedExpenseStatus.ACCEPTED, SharedExpenseStatus.ACCEPTED, "25.00", "40.00")
+        assert change.balance_delta == Decimal("15.00")
+
+    def test_deleting_accepted_share_removes_it(self):
+        change = self.make_change(SharedExpenseStatus.ACCEPTED, None, old_amount="25.00")
+        assert change.balance_delta == Decimal("-25.00")
@@ -0,0 +1,103 @@
+# expense_tracker/tests/services/test_settlement.py
+import random
+from collections import defaultdict
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.exceptions import PermissionDeniedError
+from expense_tracker.models.group import Group, GroupMember
+from expense_tracker.services.ledger import LedgerService
+from expense_tracker.services.settlement import SettlementService, net_positions, plan_transfers
+from expense_tracker.tests.utils import add_user
+
+
+def apply_transfers(positions: dict, transfers) -> dict:
+    remaining = defaultdict(int, positions)
+    for transfer in transfers:
+        remaining[transfer.debtor] += transfer.amount
+        remaining[transfer.creditor] -= transfer.amount
+    return remaining
+
+
+class TestSettlementPlanner:
+    def test_chain_of_debts_collapses_to_one_transfer(self):
+        # Arrange: b owes a 10.00, c owes b 10.00
+        positions = net_positions([("a", "b", 1000), ("b", "c", 1000)])
+
+        # Act
+        transfers = plan_transfers(positions)
+
+        # Assert
+        assert len(transfers) == 1
+        assert (transfers[0].debtor, transfers[0].creditor, transfers[0].amount) == ("c", "a", 1000)
+
+    def test_plan_clears_all_positions_within_n_minus_one_transfers(self):
+        # Arrange
+        rng = random.Random(7)
+        members = list(range(200))
+        debts = [
+            (rng.choice(members), rng.choice(members), rng.randint(1, 10_000))
+            for _ in range(2_000)
+        ]
+        positions = net_positions(debts)
+
+        # Act
+        transfers = plan_transfers(positions)
+
+        # Assert
+        assert all(amount == 0 for amount in apply_transfers(positions, transfers).values())
+        assert len(transfers) <= len([p for p in positions.values() if p]) - 1
+        assert all(transfer.amount > 0 for transfer in transfers)
+
+    def test_settled_group_needs_no_transfers(self):
+        assert plan_transfers({"a": 0, "b": 0}) == []
+
+    def test_rejects_unbalanced_positions(self):
+        with pytest.raises(ValueError):
+            plan_transfers({"a": 100, "b": -99})
+
+
+@pytest.mark.asyncio
+class TestSettlementCounterparties:
+    async def test_users_with_a_balance_or_a_shared_group_can_be_planned(self, db_session: AsyncSession):
+        # Arrange
+        me, debtor, member = await add_user(db_session), await add_user(db_session), await add_user(db_session)
+        await LedgerService(db_session).apply_deltas([(me.id, debtor.id, Decimal("10.00"))])
+        group = Group(name="Flat", created_by_id=me.id)
+        db_session.add(group)
+        await db_session.flush()
+        db_session.add_all([GroupMember(group_id=group.id, user_id=me.id), GroupMember(group_id=group.id, user_id=member.id)])
+        await db_session.flush()
+
+        # Act & Assert
+        await SettlementService(db_session).check_counterparties(me.id, [me.id, debtor.id, member.id])
+
+    async def test_unrelated_users_are_refused(self, db_session: AsyncSession):
+        # Arrange
+        me, debtor = await add_user(db_session), await add_user(db_session)
+        first, second = await add_user(db_session), await add_user(db_session)
+        ledger = LedgerService(db_session)
+        await ledger.apply_deltas([(me.id, debtor.id, Decimal("10.00")), (first.id, second.id, Decimal("5.00"))])
+
+        # Act & Assert
+        with pytest.raises(PermissionDeniedError):
+            await SettlementService(db_session).check_counterparties(me.id, [me.id, debtor.id, first.id, second.id])
+
+    async def test_balances_between_other_users_do_not_change_the_plan(self, db_session: AsyncSession):
+        # Arrange
+        me, first, second = await add_user(db_session), await add_user(db_session), await add_user(db_session)
+        await LedgerService(db_session).apply_deltas([
+            (me.id, first.id, Decimal("10.00")),
+            (first.id, second.id, Decimal("50.00"))
+        ])
+
+        # Act
+        plan = await SettlementService(db_session).plan_for_users(me.id, [me.id, first.id, second.id])
+
+        # Assert
+        assert plan.pairwise_balances == 1
+        assert [(t.from_user_id, t.to_user_id, t.amount) for t in plan.transfers] == [
+            (first.id, me.id, Decimal("10.00"))
+        ]
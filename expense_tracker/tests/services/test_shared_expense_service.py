@@ -0,0 +1,62 @@
+# expense_tracker/tests/services/test_shared_expense_service.py
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.core.exceptions import InvalidShareError, UserNotFoundError
+from expense_tracker.schemas.shared_expense import SharedExpenseCreate, SharedExpenseUpdate
+from expense_tracker.services.shared_expense import SharedExpenseService
+from expense_tracker.tests.utils import add_category, add_expense, add_user
+
+
+@pytest.mark.asyncio
+class TestSharedExpenseService:
+    async def test_share_with_unknown_user_is_not_found(self, db_session: AsyncSession):
+        # Arrange
+        owner = await add_user(db_session)
+        expense = await add_expense(db_session, owner, await add_category(db_session, owner))
+        service = SharedExpenseService(db_session)
+
+        # Act & Assert
+        with pytest.raises(UserNotFoundError):
+            await service.create_shared_expense(owner.id, SharedExpenseCreate(
+                expense_id=expense.id, shared_with_user_id=uuid.uuid4(), split_percentage=Decimal(50)
+            ))
+
+    async def test_split_change_can_not_exceed_the_expense(self, db_session: AsyncSession):
+        # Arrange
+        owner, first, second = await add_user(db_session), await add_user(db_session), await add_user(db_session)
+        expense = await add_expense(db_session, owner, await add_category(db_session, owner))
+        service = SharedExpenseService(db_session)
+        await service.create_shared_expense(owner.id, SharedExpenseCreate(
+            expense_id=expense.id, shared_with_user_id=first.id, split_percentage=Decimal(50)
+        ))
+        share = await service.create_shared_expense(owner.id, SharedExpenseCreate(
+            expense_id=expense.id, shared_with_user_id=second.id, split_percentage=Decimal(50)
+        ))
+
+        # Act & Assert
+        with pytest.raises(InvalidShareError):
+            await service.update_shared_expense(owner.id, share.id, SharedExpenseUpdate(split_percentage=Decimal(90)))
+
+    async def test_split_change_within_the_expense_is_applied(self, db_session: AsyncSession):
+        # Arrange
+        owner, first, second = await add_user(db_session), await add_user(db_session), await add_user(db_session)
+        expense = await add_expense(db_session, owner, await add_category(db_session, owner))
+        service = SharedExpenseService(db_session)
+        await service.create_shared_expense(owner.id, SharedExpenseCreate(
+            expense_id=expense.id, shared_with_user_id=first.id, split_percentage=Decimal(30)
+        ))
+        share = await service.create_shared_expense(owner.id, SharedExpenseCreate(
+            expense_id=expense.id, shared_with_user_id=second.id, split_percentage=Decimal(50)
+        ))
+
+        # Act
+        updated = await service.update_shared_expense(
+            owner.id, share.id, SharedExpenseUpdate(split_percentage=Decimal(70))
+        )
+
+        # Assert
+        assert updated.split_percentage == Decimal(70)
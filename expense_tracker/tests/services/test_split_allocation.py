@@ -0,0 +1,67 @@
+# expense_tracker/tests/services/test_split_allocation.py
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from expense_tracker.core.money import allocate_largest_remainder
+from expense_tracker.schemas.shared_expense import SharedExpenseBatchItem
+from expense_tracker.services.shared_expense import split_percentages
+
+
+class TestLargestRemainder:
+    def test_parts_always_add_up_to_total(self):
+        assert allocate_largest_remainder(10_000, [1, 1, 1]) == [3334, 3333, 3333]
+        assert sum(allocate_largest_remainder(9_999, [3, 5, 7, 11])) == 9_999
+
+    def test_remainder_goes_to_largest_fraction(self):
+        # Exact shares: 1.5, 2.25, 6.25
+        assert allocate_largest_remainder(10, [6, 9, 25]) == [2, 2, 6]
+
+    def test_rejects_invalid_weights(self):
+        with pytest.raises(ValueError):
+            allocate_largest_remainder(100, [0, 0])
+
+
+class TestSplitPercentages:
+    def test_equal_split_including_owner(self):
+        # Arrange
+        item = SharedExpenseBatchItem(
+            expense_id=uuid.uuid4(),
+            owner_weight=1,
+            splits=[
+                {"shared_with_user_id": uuid.uuid4(), "weight": 1},
+                {"shared_with_user_id": uuid.uuid4(), "weight": 1},
+            ]
+        )
+
+        # Act
+        percentages = split_percentages(item)
+
+        # Assert: owner keeps the rounded-up 33.34%
+        assert percentages == [Decimal("33.33"), Decimal("33.33")]
+
+    def test_explicit_and_weighted_splits_keep_order(self):
+        # Arrange
+        item = SharedExpenseBatchItem(
+            expense_id=uuid.uuid4(),
+            weighted_percentage=Decimal("50"),
+            splits=[
+                {"shared_with_user_id": uuid.uuid4(), "weight": 1},
+                {"shared_with_user_id": uuid.uuid4(), "split_percentage": Decimal("25")},
+                {"shared_with_user_id": uuid.uuid4(), "weight": 2},
+            ]
+        )
+
+        # Act
+        percentages = split_percentages(item)
+
+        # Assert
+        assert percentages == [Decimal("16.67"), Decimal("25"), Decimal("33.33")]
+
+    def test_split_needs_percentage_or_weight(self):
+        with pytest.raises(ValueError):
+            SharedExpenseBatchItem(
+                expense_id=uuid.uuid4(),
+                splits=[{"shared_with_user_id": uuid.uuid4()}]
+            )
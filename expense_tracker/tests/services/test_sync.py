@@ -0,0 +1,54 @@
+# expense_tracker/tests/services/test_sync.py
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from expense_tracker.core.exceptions import InvalidCursorError
+from expense_tracker.services.sync import PHASES, SyncCursor, SyncService
+
+
+class TestSyncCursor:
+    def test_round_trip_mid_sync(self):
+        # Arrange
+        cursor = SyncCursor(
+            since=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            until=datetime(2024, 2, 1, 8, 30, tzinfo=timezone.utc),
+            phase=2,
+            after=(datetime(2024, 1, 15, tzinfo=timezone.utc), uuid.uuid4()),
+        )
+
+        # Act / Assert
+        assert SyncCursor.decode(cursor.encode()) == cursor
+
+    def test_round_trip_initial_sync(self):
+        cursor = SyncCursor(since=None, until=datetime(2024, 2, 1, tzinfo=timezone.utc))
+        assert SyncCursor.decode(cursor.encode()) == cursor
+
+    @pytest.mark.parametrize("cursor", ["garbage", "e30", "eyJzIjogbnVsbCwgInUiOiBudWxsLCAicCI6IDk5LCAiYSI6IG51bGx9"])
+    def test_malformed_cursor_is_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            SyncCursor.decode(cursor)
+
+
+class TestSyncQueries:
+    @pytest.mark.parametrize("phase", PHASES)
+    def test_phase_query_is_bounded_and_keyset_ordered(self, phase):
+        # Arrange
+        state = SyncCursor(
+            since=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            until=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            after=(datetime(2024, 1, 15, tzinfo=timezone.utc), uuid.uuid4()),
+        )
+
+        # Act
+        query = SyncService(db_session=None)._phase_query(phase, uuid.uuid4(), state)
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        # Assert
+        assert "updated_at <=" in sql
+        assert "updated_at >" in sql
+        order_by = sql.split("ORDER BY ")[1].split(", ")
+        assert order_by[0].endswith(".updated_at")
+        assert order_by[1].strip().endswith(".id")
@@ -5,6 +5,7 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from expense_tracker.core.exceptions import DuplicateEmailError, UserNotFoundError
+from expense_tracker.core.security import password_executor, verify_password
 from expense_tracker.schemas.user import UserCreate, UserUpdate
 from expense_tracker.services.user import UserService
 
@@ -46,6 +47,23 @@ class TestUserService:
         with pytest.raises(DuplicateEmailError):
             await service.create_user(user_data)
 
+    async def test_create_user_hashes_password_in_the_pool(self, db_session: AsyncSession):
+        # Arrange
+        service = UserService(db_session)
+        completed = password_executor.completed
+
+        # Act
+        user = await service.create_user(UserCreate(
+            email=rnd_email(),
+            username="Password User",
+            password="correct horse"
+        ))
+
+        # Assert
+        assert password_executor.completed == completed + 1
+        assert user.hashed_password != "correct horse"
+        assert verify_password("correct horse", user.hashed_password)
+
     async def test_get_user_by_id(self, db_session: AsyncSession):
         # Arrange
         service = UserService(db_session)
@@ -1,8 +1,16 @@
 # expense_tracker/tests/utils.py
 import logging
-from typing import Any, Type, TypeVar
+import uuid
+from datetime import date
+from decimal import Decimal
+from typing import Any, Optional, Type, TypeVar
 
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from expense_tracker.models.category import Category
+from expense_tracker.models.expense import Expense
+from expense_tracker.models.user import User
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -25,3 +33,39 @@ def setup_test_logging():
         level=logging.DEBUG,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+
+
+async def add_user(db_session: AsyncSession, username: str = "Test User") -> User:
+    """Insert a user with a unique email"""
+    user = User(email=f"test_{uuid.uuid4().hex[:16]}@example.com", username=username)
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+async def add_category(db_session: AsyncSession, user: Optional[User] = None, name: str = "Groceries") -> Category:
+    """Insert a category of user, or a system category"""
+    category = Category(name=name, user_id=user.id if user is not None else None)
+    db_session.add(category)
+    await db_session.flush()
+    return category
+
+
+async def add_expense(
+    db_session: AsyncSession,
+    user: User,
+    category: Category,
+    amount: str = "100.00",
+    description: str = "Test expense"
+) -> Expense:
+    """Insert an expense of user"""
+    expense = Expense(
+        user_id=user.id,
+        category_id=category.id,
+        amount=Decimal(amount),
+        description=description,
+        date=date(2024, 1, 1)
+    )
+    db_session.add(expense)
+    await db_session.flush()
+    return expense
@@ -0,0 +1,42 @@
+# scripts/benchmark_settlement.py
+import argparse
+import random
+import time
+
+from expense_tracker.services.settlement import net_positions, plan_transfers
+
+GROUP_SIZES = [10, 100, 1_000, 10_000]
+
+
+def random_debts(members: int, counterparties: int, rng: random.Random) -> list[tuple[int, int, int]]:
+    """Random (creditor, debtor, cents) debts, each member owing a few others"""
+    debts = []
+    for debtor in range(members):
+        for creditor in rng.sample(range(members), min(counterparties, members)):
+            if creditor != debtor:
+                debts.append((creditor, debtor, rng.randint(1, 50_000)))
+    return debts
+
+
+def main(counterparties: int, seed: int):
+    """Benchmark the greedy settlement planner for growing group sizes"""
+    rng = random.Random(seed)
+    print(f"{'members':>8} {'debts':>8} {'transfers':>10} {'ms':>10}")
+    for members in GROUP_SIZES:
+        debts = random_debts(members, counterparties, rng)
+
+        start = time.perf_counter()
+        positions = net_positions(debts)
+        transfers = plan_transfers(positions)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert sum(t.amount for t in transfers) == sum(p for p in positions.values() if p > 0)
+        print(f"{members:>8} {len(debts):>8} {len(transfers):>10} {elapsed_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--counterparties", type=int, default=5, help="debts per member")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    main(args.counterparties, args.seed)
@@ -0,0 +1,21 @@
+# scripts/purge_expired.py
+import asyncio
+
+from expense_tracker.core.idempotency import DatabaseBackend
+from expense_tracker.db.session import AsyncSessionLocal
+from expense_tracker.services.sync import SyncService
+from expense_tracker.services.token import TokenService
+
+
+async def main():
+    """Delete expired token records, idempotency keys and tombstones past their retention"""
+    async with AsyncSessionLocal() as session:
+        tokens = await TokenService(session).purge_expired()
+        tombstones = await SyncService(session).purge_tombstones()
+        keys = await DatabaseBackend.purge_expired(session)
+
+    print(f"Purged {tokens} token records, {keys} idempotency keys and {tombstones} tombstones ✅")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
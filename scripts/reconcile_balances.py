@@ -0,0 +1,37 @@
+# scripts/reconcile_balances.py
+import argparse
+import asyncio
+
+from expense_tracker.db.session import AsyncSessionLocal
+from expense_tracker.services.inbox import InboxService
+from expense_tracker.services.ledger import LedgerService
+
+
+async def main(fix: bool):
+    """Rebuild the balance ledger from shared expenses and report drift"""
+    async with AsyncSessionLocal() as session:
+        report = await LedgerService(session).reconcile(fix=fix)
+
+    print(f"Pairs checked: {report.pairs_checked}")
+    for drift in report.drift:
+        print(
+            f"{drift.user_a_id} / {drift.user_b_id}: "
+            f"ledger {drift.ledger_amount}, expected {drift.expected_amount}"
+        )
+    if not report.drift:
+        print("Ledger is consistent ✅")
+    elif report.fixed:
+        print(f"Fixed {len(report.drift)} drifted pairs ✅")
+    else:
+        print(f"Found {len(report.drift)} drifted pairs ❌ (rerun with --fix to repair)")
+
+    if fix:
+        async with AsyncSessionLocal() as session:
+            users = await InboxService(session).rebuild()
+        print(f"Recounted inboxes of {users} users ✅")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--fix", action="store_true", help="overwrite drifted pairs")
+    asyncio.run(main(parser.parse_args().fix))